@@ -0,0 +1,69 @@
+"""查询方法单次调用开销基准测试
+
+用法: python packages/db/benchmarks/bench_query.py [调用次数]
+
+对比逐次构建查询 (旧版 `Query` 写法) 与语句模板缓存 (`get_by_pk` / `filter`) 的单次调用耗时
+"""
+
+import sys
+import time
+from typing import Callable
+
+from miose_toolkit_db import Mapped, MappedColumn, MioModel, MioOrm, asc
+from sqlalchemy import Integer, String
+
+
+def bench(name: str, func: Callable[[int], object], n: int) -> None:
+    for i in range(min(n, 100)):
+        func(i)
+    start = time.perf_counter()
+    for i in range(n):
+        func(i)
+    cost = (time.perf_counter() - start) / n * 1e6
+    print(f"{name:<32}{cost:>10.1f} us/call")
+
+
+def main(n: int = 20000) -> None:
+    db = MioOrm("sqlite://")
+
+    @db.reg_predefine_data_model(table_name="bench", primary_key="id")
+    class Bench(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=64))
+        age: Mapped[int] = MappedColumn(Integer)
+
+    db.create_all()
+    Bench.batch_add([{"id": i, "name": f"n{i}", "age": i % 100} for i in range(1000)])
+    session = db.get_sqa_db()
+
+    bench(
+        "get_by_pk (Query)",
+        lambda i: session.query(Bench).filter(Bench.id == i % 1000).first(),
+        n,
+    )
+    bench("get_by_pk (template)", lambda i: Bench.get_by_pk(i % 1000), n)
+    bench(
+        "filter (Query)",
+        lambda i: session.query(Bench)
+        .filter(Bench.age >= i % 100, Bench.name != "")
+        .order_by(asc(Bench.id))
+        .limit(10)
+        .all(),
+        n,
+    )
+    bench(
+        "filter (template)",
+        lambda i: Bench.filter(
+            age__gte=i % 100,
+            name__ne="",
+            order_by=[asc(Bench.id)],
+            limit=10,
+        ),
+        n,
+    )
+
+    db.close_db_connection()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
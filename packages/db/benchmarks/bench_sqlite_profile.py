@@ -0,0 +1,57 @@
+"""SQLite 连接参数预设吞吐基准测试
+
+用法: python packages/db/benchmarks/bench_sqlite_profile.py [行数]
+
+对比默认 (回滚日志) / safe / fast 预设下逐行提交写入, 批量写入与主键读取的吞吐
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from miose_toolkit_db import Mapped, MappedColumn, MioModel, MioOrm, gen_sqlite_db_url
+from sqlalchemy import Integer, String
+
+
+def run(profile: Optional[str], n: int, db_path: Path) -> None:
+    db = MioOrm(gen_sqlite_db_url(str(db_path)), sqlite_profile=profile)
+
+    @db.reg_predefine_data_model(table_name="bench", primary_key="id")
+    class Bench(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=64))
+
+    db.create_all()
+
+    start = time.perf_counter()
+    for i in range(n):
+        Bench.add(id=i, name=f"n{i}")
+    add_rate = n / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    Bench.batch_add([{"id": n + i, "name": f"n{i}"} for i in range(n * 10)])
+    batch_rate = n * 10 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(n):
+        Bench.get_by_pk(i)
+    read_rate = n / (time.perf_counter() - start)
+
+    print(
+        f"{profile or 'default':<10}"
+        f"{add_rate:>14.0f}{batch_rate:>14.0f}{read_rate:>14.0f}",
+    )
+    db.close_db_connection()
+
+
+def main(n: int = 2000) -> None:
+    print(f"{'profile':<10}{'add/s':>14}{'batch_add/s':>14}{'get_by_pk/s':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in (None, "safe", "fast"):
+            run(profile, n, Path(tmp) / f"bench_{profile}.db")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
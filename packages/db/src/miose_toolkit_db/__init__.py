@@ -1,5 +1,13 @@
 from sqlalchemy import Column, asc, desc
 from sqlalchemy.orm import Mapped, MappedColumn
 
+from .advisor import IndexAdvisor
+from .buffer import WriteBuffer
+from .cache import BaseCache, LRUCache
+from .columns import MioJSON
+from .conditions import any_of
 from .db_url import gen_mysql_db_url, gen_postgresql_db_url, gen_sqlite_db_url
+from .metrics import OrmMetrics
 from .orm import MioModel, MioOrm
+from .profiler import QueryProfiler
+from .sharding import ShardedMioOrm, ShardedModel
@@ -0,0 +1,215 @@
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import Index, Select, Table
+from sqlalchemy.engine import Engine
+
+from .conditions import OR_KEY, compile_condition_shape
+
+# 可使用索引等值匹配的操作符 (其余操作符只能使用索引的一个范围列)
+_EQ_OPERATORS = ("eq", "in", "is_null")
+
+# 查询结构: (数据模型类, 条件键, 排序字段)
+QueryShape = Tuple[Type[Any], Tuple[str, ...], Tuple[str, ...]]
+
+
+class IndexAdvisor:
+    """索引建议器
+
+    记录运行时查询使用的条件与排序字段组合, 通过 EXPLAIN 识别全表扫描的查询并给出索引建议
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counts: Dict[QueryShape, int] = {}
+        # 每种查询结构最近一次的语句与绑定参数 (用于 EXPLAIN)
+        self._samples: Dict[QueryShape, Tuple[Select, Dict[str, Any]]] = {}
+
+    def record(
+        self,
+        model_class: Type[Any],
+        conditions: Dict[str, Any],
+        order_keys: Optional[Tuple[Tuple[str, Optional[bool]], ...]],
+        stmt: Select,
+        params: Dict[str, Any],
+    ) -> None:
+        """记录一次查询
+
+        Args:
+        :param model_class: 数据模型类
+        :param conditions: 筛选条件 (已合并的字段名字典, OR 条件组不参与索引建议)
+        :param order_keys: 排序字段的 (属性名, 是否降序) 元组 (自定义排序表达式为 None)
+        :param stmt: 查询语句
+        :param params: 绑定参数
+        """
+        shape = (
+            model_class,
+            tuple(key for key in conditions if not key.startswith(OR_KEY)),
+            tuple(key for key, _ in order_keys or ()),
+        )
+        with self._lock:
+            self._counts[shape] = self._counts.get(shape, 0) + 1
+            self._samples[shape] = (stmt, params)
+
+    def report(self, engine: Engine, min_count: int = 1) -> List[Dict[str, Any]]:
+        """生成索引建议报告
+
+        Args:
+        :param engine: 执行 EXPLAIN 的同步引擎
+        :param min_count: 查询次数下限, 低于该次数的查询结构不参与分析
+
+        Returns:
+        :return: 报告列表 (按查询次数降序), 每项包含
+            - model / table: 模型类名与表名
+            - where / order_by: 条件字段与排序字段
+            - count: 查询次数
+            - full_scan: 是否全表扫描 (EXPLAIN 失败时为 None)
+            - plan: EXPLAIN 结果
+            - recommended_index: 建议创建的索引字段 (已有可用索引或无需索引时为 None)
+        """
+        return [item for _, item in self._analyze(engine, min_count)]
+
+    def _analyze(self, engine: Engine, min_count: int) -> List[Tuple[Table, Dict[str, Any]]]:
+        """分析已记录的查询结构, 返回 (表对象, 报告项) 列表"""
+        with self._lock:
+            shapes = sorted(
+                ((shape, count) for shape, count in self._counts.items() if count >= min_count),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            samples = dict(self._samples)
+
+        report = []
+        for (model_class, keys, order_keys), count in shapes:
+            table: Table = model_class.__table__
+            eq_columns: List[str] = []
+            range_columns: List[str] = []
+            for _, attr, op in compile_condition_shape(model_class, keys):
+                column = attr.property.columns[0].name
+                target = eq_columns if op in _EQ_OPERATORS else range_columns
+                if column not in eq_columns and column not in target:
+                    target.append(column)
+            order_columns = [
+                getattr(model_class, key).property.columns[0].name for key in order_keys
+            ]
+            plan, full_scan = _explain(engine, *samples[(model_class, keys, order_keys)])
+            recommended = None
+            if full_scan is not False:
+                recommended = _recommend(table, eq_columns, range_columns, order_columns)
+            report.append(
+                (
+                    table,
+                    {
+                        "model": model_class.__name__,
+                        "table": table.name,
+                        "where": eq_columns + range_columns,
+                        "order_by": order_columns,
+                        "count": count,
+                        "full_scan": full_scan,
+                        "plan": plan,
+                        "recommended_index": recommended,
+                    },
+                ),
+            )
+        return report
+
+    def create_recommended_indexes(self, engine: Engine, min_count: int = 1) -> List[str]:
+        """创建报告中建议的索引
+
+        Args:
+        :param engine: 数据库引擎
+        :param min_count: 查询次数下限
+
+        Returns:
+        :return: 创建的索引名列表
+        """
+        created: List[str] = []
+        seen = set()
+        for table, item in self._analyze(engine, min_count):
+            columns = item["recommended_index"]
+            if not columns or (table.name, columns) in seen:
+                continue
+            seen.add((table.name, columns))
+            name = f"ix_mio_{table.name}_{'_'.join(columns)}"[:63]
+            index = Index(name, *[table.c[column] for column in columns])
+            index.create(engine, checkfirst=True)
+            created.append(name)
+        return created
+
+    def reset(self) -> None:
+        """清空已记录的查询"""
+        with self._lock:
+            self._counts.clear()
+            self._samples.clear()
+
+
+def _explain(
+    engine: Engine,
+    stmt: Select,
+    params: Dict[str, Any],
+) -> Tuple[List[Tuple[Any, ...]], Optional[bool]]:
+    """执行 EXPLAIN 并判断是否全表扫描"""
+
+    dialect = engine.dialect.name
+    try:
+        sql = str(
+            stmt.params(params).compile(
+                dialect=engine.dialect,
+                compile_kwargs={"literal_binds": True},
+            ),
+        )
+        prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+        with engine.connect() as conn:
+            result = conn.exec_driver_sql(prefix + sql)
+            keys = list(result.keys())
+            rows = [tuple(row) for row in result]
+    except Exception:
+        return [], None
+
+    if dialect == "sqlite":
+        details = [str(row[-1]) for row in rows]
+        full_scan = any(
+            detail.startswith("SCAN ") and " USING " not in detail for detail in details
+        )
+    elif dialect == "postgresql":
+        full_scan = any("Seq Scan" in str(row[0]) for row in rows)
+    elif dialect == "mysql":
+        if "type" not in keys:
+            return rows, None
+        full_scan = any(row[keys.index("type")] == "ALL" for row in rows)
+    else:
+        return rows, None
+    return rows, full_scan
+
+
+def _recommend(
+    table: Table,
+    eq_columns: List[str],
+    range_columns: List[str],
+    order_columns: List[str],
+) -> Optional[Tuple[str, ...]]:
+    """根据条件与排序字段推荐索引字段 (等值字段在前, 其后为一个范围字段或排序字段)"""
+
+    columns = list(eq_columns)
+    if range_columns:
+        columns.append(range_columns[0])
+    else:
+        columns.extend(c for c in order_columns if c not in columns)
+    if not columns:
+        return None
+
+    # 已有索引 (包括主键与唯一约束) 的前缀与建议字段一致时不再建议
+    existing = [tuple(c.name for c in index.columns) for index in table.indexes]
+    existing.append(tuple(c.name for c in table.primary_key.columns))
+    existing.extend(
+        tuple(c.name for c in constraint.columns)  # type: ignore
+        for constraint in table.constraints
+        if hasattr(constraint, "columns")
+    )
+    for column in table.columns:
+        if column.index or column.unique:
+            existing.append((column.name,))
+    if any(index[: len(columns)] == tuple(columns) for index in existing):
+        return None
+    return tuple(columns)
+
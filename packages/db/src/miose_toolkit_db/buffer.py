@@ -0,0 +1,214 @@
+import asyncio
+from functools import partial
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional
+
+
+class WriteBuffer:
+    """写入缓冲队列
+
+    接收任意线程 / 协程写入的行数据, 由后台线程在达到批次大小或时间间隔时批量写入,
+    缓冲区已满时阻塞写入方 (背压), 关闭时写入剩余数据
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[Dict[str, Any]]], Any],
+        prepare: Optional[Callable[[Optional[Dict[Any, Any]], Dict[str, Any]], Dict[str, Any]]] = None,
+        max_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+        put_timeout: Optional[float] = None,
+        on_error: Optional[Callable[[BaseException, List[Dict[str, Any]]], Any]] = None,
+    ) -> None:
+        """初始化写入缓冲队列
+
+        Args:
+        :param writer: 批量写入函数 (在后台线程或调用 `flush()` 的线程中执行)
+        :param prepare: 行数据预处理函数, 在写入方线程中以 `put()` 的参数调用 (可用于校验字段)
+        :param max_size: 触发写入的缓冲行数
+        :param flush_interval: 触发写入的时间间隔 (秒)
+        :param max_pending: 缓冲区最大行数, 超过时写入方阻塞等待
+        :param put_timeout: 缓冲区已满时的最长等待时间 (秒), 超时抛出 TimeoutError, 为 None 时一直等待
+        :param on_error: 后台写入失败回调, 以异常与写入失败的行数据调用;
+            未设置时异常在下一次调用 `flush()` / `close()` 时抛出
+        """
+        if max_size < 1:
+            raise ValueError(f"Invalid buffer size: {max_size}")
+        if max_pending < max_size:
+            raise ValueError("max_pending must not be less than max_size")
+        if flush_interval <= 0:
+            raise ValueError(f"Invalid flush interval: {flush_interval}")
+        self._writer = writer
+        self._prepare = prepare
+        self._max_size = max_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._put_timeout = put_timeout
+        self._on_error = on_error
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)
+        self._not_full = Condition(self._lock)
+        # 后台线程是否正在写入: `flush()` 等待其完成, 保证返回时此前缓冲的数据均已写入
+        self._writing = False
+        self._idle = Condition(self._lock)
+        self._rows: List[Dict[str, Any]] = []
+        self._thread: Optional[Thread] = None
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self.flushed = 0
+        self.failed = 0
+
+    @property
+    def pending(self) -> int:
+        """缓冲中尚未写入的行数"""
+        return len(self._rows)
+
+    def put(self, data: Optional[Dict[Any, Any]] = None, **kwarg) -> None:
+        """写入一行数据 (缓冲区已满时阻塞)
+
+        Args:
+        :param data: 行数据
+        :param kwarg: 行数据 (与 data 合并)
+        """
+        self._put_row(self._make_row(data, kwarg), block=True)
+
+    async def aput(self, data: Optional[Dict[Any, Any]] = None, **kwarg) -> None:
+        """写入一行数据 (异步, 缓冲区已满时在线程池中等待, 不阻塞事件循环)
+
+        Args:
+        :param data: 行数据
+        :param kwarg: 行数据 (与 data 合并)
+        """
+        row = self._make_row(data, kwarg)
+        if self._put_row(row, block=False):
+            return
+        await asyncio.get_running_loop().run_in_executor(
+            None,
+            partial(self._put_row, row, True),
+        )
+
+    def _make_row(
+        self,
+        data: Optional[Dict[Any, Any]],
+        kwarg: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """预处理行数据"""
+        if self._prepare is not None:
+            return self._prepare(data, kwarg)
+        return {**(data or {}), **kwarg}
+
+    def _put_row(self, row: Dict[str, Any], block: bool) -> bool:
+        """将预处理后的行数据加入缓冲区 (是否已满在持有锁时判断, 写入由后台线程执行)
+
+        Args:
+        :param row: 行数据
+        :param block: 缓冲区已满时是否阻塞等待
+
+        Returns:
+        :return: 是否已加入缓冲区 (不阻塞且缓冲区已满时返回 False)
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write buffer is closed")
+            if len(self._rows) >= self._max_pending:
+                if not block:
+                    return False
+                deadline = (
+                    None if self._put_timeout is None else monotonic() + self._put_timeout
+                )
+                while len(self._rows) >= self._max_pending:
+                    remaining = None if deadline is None else deadline - monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Write buffer is full")
+                    self._not_full.wait(remaining)
+                    if self._closed:
+                        raise RuntimeError("Write buffer is closed")
+            self._rows.append(row)
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run,
+                    name="mio-write-buffer",
+                    daemon=True,
+                )
+                self._thread.start()
+            if len(self._rows) >= self._max_size:
+                self._not_empty.notify()
+            return True
+
+    def _take(self) -> List[Dict[str, Any]]:
+        """取出缓冲的全部行数据 (需持有锁)"""
+        rows, self._rows = self._rows, []
+        self._not_full.notify_all()
+        return rows
+
+    def _write(self, rows: List[Dict[str, Any]], raise_error: bool) -> None:
+        """写入行数据"""
+        try:
+            self._writer(rows)
+        except Exception as e:
+            with self._lock:
+                self.failed += len(rows)
+                if not raise_error and self._on_error is None:
+                    self._error = e
+            if raise_error:
+                raise
+            if self._on_error is not None:
+                self._on_error(e, rows)
+        else:
+            with self._lock:
+                self.flushed += len(rows)
+
+    def _run(self) -> None:
+        """后台写入线程"""
+        while True:
+            with self._lock:
+                deadline = monotonic() + self._flush_interval
+                while not self._closed and len(self._rows) < self._max_size:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self._not_empty.wait(remaining)
+                closed = self._closed
+                rows = self._take()
+                self._writing = bool(rows)
+            if rows:
+                try:
+                    self._write(rows, raise_error=False)
+                finally:
+                    with self._lock:
+                        self._writing = False
+                        self._idle.notify_all()
+            if closed:
+                return
+
+    def flush(self) -> int:
+        """立即写入缓冲的数据, 并等待后台线程正在进行的写入完成
+
+        Returns:
+        :return: 本次写入的行数
+        """
+        with self._lock:
+            while self._writing:
+                self._idle.wait()
+            rows = self._take()
+            error, self._error = self._error, None
+        if rows:
+            self._write(rows, raise_error=True)
+        if error is not None:
+            raise error
+        return len(rows)
+
+    def close(self) -> None:
+        """关闭缓冲队列: 停止后台线程并写入剩余数据"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
@@ -0,0 +1,157 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class BaseCache(ABC):
+    """模型缓存后端基类
+
+    自定义缓存后端 (例如 Redis) 需实现以下方法, 缓存值为行数据字典
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """读取缓存 (不存在或已过期则返回 None)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """写入缓存"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """删除缓存"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清空缓存"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return 0
+
+
+class LRUCache(BaseCache):
+    """进程内 LRU 缓存 (线程安全)"""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 60) -> None:
+        """初始化 LRU 缓存
+
+        Args:
+        :param max_size: 最大缓存条目数, 超出时淘汰最久未使用的条目
+        :param ttl: 缓存有效期 (秒), 为 None 则永不过期
+        """
+        if max_size < 1:
+            raise ValueError(f"Invalid max size: {max_size}")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expire_at, value = item
+            if expire_at and expire_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expire_at = time.monotonic() + self._ttl if self._ttl else 0
+        with self._lock:
+            self._data[key] = (expire_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ModelCache:
+    """数据模型行缓存 (包装缓存后端并统计命中率)
+
+    以 (命名空间, "pk", 主键值) 缓存行数据字典, 以 (命名空间, "field", 字段名, 字段值) 缓存主键索引
+    """
+
+    def __init__(self, backend: BaseCache, namespace: str = "") -> None:
+        """初始化数据模型行缓存
+
+        Args:
+        :param backend: 缓存后端
+        :param namespace: 缓存键命名空间 (模型表名), 避免共用同一后端的模型读取到彼此的行数据
+        """
+        self.backend = backend
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def get_row(self, pk_value: Any) -> Optional[Dict[str, Any]]:
+        """根据主键读取行数据缓存"""
+        row = self.backend.get((self.namespace, "pk", pk_value))
+        if row is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return row
+
+    def get_row_by_field(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """根据字段读取行数据缓存 (行数据已变更或失效时视为未命中)"""
+        pk_value = self.backend.get((self.namespace, "field", field, value))
+        row = None if pk_value is None else self.backend.get((self.namespace, "pk", pk_value))
+        if row is None or row.get(field) != value:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row
+
+    def set_row(
+        self,
+        pk_value: Any,
+        row: Dict[str, Any],
+        field: Optional[str] = None,
+    ) -> None:
+        """写入行数据缓存 (指定字段时同时写入字段索引)"""
+        self.backend.set((self.namespace, "pk", pk_value), row)
+        if field is not None:
+            self.backend.set((self.namespace, "field", field, row.get(field)), pk_value)
+
+    def invalidate(self, pk_value: Any) -> None:
+        """使指定主键的行数据缓存失效"""
+        self.backend.delete((self.namespace, "pk", pk_value))
+
+    def invalidate_all(self) -> None:
+        """使所有缓存失效 (保留统计)"""
+        self.backend.clear()
+
+    def clear(self) -> None:
+        """清空缓存并重置统计"""
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self.backend),
+        }
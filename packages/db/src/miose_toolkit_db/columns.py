@@ -0,0 +1,234 @@
+import base64
+from datetime import date, time
+from decimal import Decimal
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from sqlalchemy import JSON, Text
+from sqlalchemy import inspect as sqa_inspect
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm.attributes import InstrumentedAttribute, set_committed_value
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+try:
+    import ujson as json  # type: ignore
+except ImportError:
+    import json
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+
+def json_dumps(value: Any) -> str:
+    """序列化为 JSON 字符串 (优先使用 ujson)"""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def json_loads(value: str) -> Any:
+    """解析 JSON 字符串 (优先使用 ujson)"""
+    return json.loads(value)
+
+
+def _json_default(value: Any) -> Any:
+    """序列化 JSON 不支持的常见类型"""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_dumps_bytes(value: Any) -> bytes:
+    """序列化为 UTF-8 JSON 字节串 (优先使用 orjson, 其次 ujson)
+
+    日期时间序列化为 ISO 格式字符串, Decimal 序列化为字符串, 字节串序列化为 base64 字符串
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default)
+    return json.dumps(value, ensure_ascii=False, default=_json_default).encode()
+
+
+class RawJSON(str):
+    """尚未解码的 JSON 文本 (SQLite 下 MioJSON 列的读取结果, 首次访问模型属性时解码)"""
+
+    __slots__ = ()
+
+
+class MioJSON(TypeDecorator):
+    """JSON 列类型
+
+    PostgreSQL 使用 JSONB, MySQL 等使用原生 JSON 类型 (可使用数据库 JSON 操作符),
+    SQLite 回退为 TEXT 存储, 读取时保留原始文本并在首次访问模型属性时解码
+
+    Examples:
+    >>> extra_info: Mapped[dict] = MappedColumn(MioJSON, nullable=True)
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine:
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(Text())
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(JSON())
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Any:
+        if value is None or dialect.name != "sqlite":
+            return value
+        return json_dumps(value)
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Any:
+        if value is None or dialect.name != "sqlite":
+            return value
+        return RawJSON(value)
+
+
+def decode_json(value: Any) -> Any:
+    """解码尚未解码的 JSON 文本 (其它值原样返回)"""
+    return json.loads(value) if value.__class__ is RawJSON else value
+
+
+class LazyJSONAttribute(InstrumentedAttribute):
+    """JSON 列的模型属性: 首次访问时解码尚未解码的 JSON 文本并回写 (不标记为已修改)"""
+
+    __slots__ = ()
+
+    def __get__(self, instance: Any, owner: Any) -> Any:
+        value = super().__get__(instance, owner)
+        if value.__class__ is RawJSON:
+            value = json.loads(value)
+            set_committed_value(instance, self.key, value)
+        return value
+
+
+def install_lazy_json(model_class: Type[Any], json_columns: Collection[str]) -> None:
+    """将 JSON 列的模型属性替换为首次访问时解码的属性 (其它属性的访问不受影响)
+
+    Args:
+    :param model_class: 已映射的数据模型类
+    :param json_columns: JSON 类型列的属性名
+    """
+    for key in json_columns:
+        attr = model_class.__dict__.get(key)
+        if type(attr) is InstrumentedAttribute:
+            # 原地替换属性类型, 保持字段对象不变 (字段对象用作条件 / 排序及元数据的键)
+            attr.__class__ = LazyJSONAttribute
+
+
+_MISSING = object()
+
+
+def build_serializer(
+    model_columns: "ModelColumns",
+    fields: Optional[Tuple[str, ...]] = None,
+    decode: bool = True,
+) -> Callable[[Any], Dict[str, Any]]:
+    """构建行对象序列化函数 (按预计算的列属性名读取, 未加载的列通过属性访问加载)
+
+    Args:
+    :param model_columns: 数据模型字段元数据
+    :param fields: 序列化的字段 (默认全部列)
+    :param decode: 是否解码尚未解码的 JSON 文本
+
+    Returns:
+    :return: 序列化函数 (行对象 -> 字典)
+    """
+
+    keys = model_columns.columns if fields is None else fields
+    unknown = set(keys) - model_columns.names
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    json_keys = model_columns.json_columns.intersection(keys) if decode else frozenset()
+
+    def serialize(obj: Any) -> Dict[str, Any]:
+        values = obj.__dict__
+        row = {}
+        for key in keys:
+            value = values.get(key, _MISSING)
+            if value is _MISSING:
+                value = getattr(obj, key)
+            elif key in json_keys and value.__class__ is RawJSON:
+                value = json.loads(value)
+            row[key] = value
+        return row
+
+    return serialize
+
+
+class ModelColumns(NamedTuple):
+    """数据模型字段元数据 (注册时预计算, 只读)"""
+
+    # 列属性名 (按定义顺序)
+    columns: Tuple[str, ...]
+    # 列属性名集合
+    names: FrozenSet[str]
+    # 字段对象 -> 列属性名
+    attrs: Mapping[InstrumentedAttribute, str]
+    # JSON 类型列 (JSON / MioJSON, 值由列类型负责序列化)
+    json_columns: FrozenSet[str]
+    # 允许为空的列
+    nullable: FrozenSet[str]
+    # 列属性名 -> 标量默认值
+    defaults: Mapping[str, Any]
+    # 列属性名 -> 数据表列键 (仅包含与属性名不同的列, 用于 Core insert 语句)
+    column_keys: Mapping[str, str]
+
+
+def build_model_columns(model_class: Type[Any]) -> ModelColumns:
+    """根据已映射的数据模型类构建字段元数据
+
+    Args:
+    :param model_class: 数据模型类
+
+    Returns:
+    :return: 字段元数据
+    """
+
+    columns = []
+    attrs = {}
+    json_columns = set()
+    nullable = set()
+    defaults = {}
+    column_keys = {}
+    for prop in sqa_inspect(model_class).column_attrs:
+        column = prop.columns[0]
+        columns.append(prop.key)
+        if column.key != prop.key:
+            column_keys[prop.key] = column.key
+        attrs[getattr(model_class, prop.key)] = prop.key
+        if isinstance(column.type, (JSON, MioJSON)):
+            json_columns.add(prop.key)
+        if column.nullable:
+            nullable.add(prop.key)
+        if column.default is not None and column.default.is_scalar:
+            defaults[prop.key] = column.default.arg  # type: ignore
+
+    return ModelColumns(
+        columns=tuple(columns),
+        names=frozenset(columns),
+        attrs=MappingProxyType(attrs),
+        json_columns=frozenset(json_columns),
+        nullable=frozenset(nullable),
+        defaults=MappingProxyType(defaults),
+        column_keys=MappingProxyType(column_keys),
+    )
@@ -0,0 +1,251 @@
+from functools import lru_cache
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from sqlalchemy import JSON, ColumnElement, and_, bindparam, or_
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+from .columns import MioJSON, json_dumps
+
+# OR 条件组键前缀, 例如 {"__or__": [{"name": "a"}, {"age__gte": 18}]}
+OR_KEY = "__or__"
+
+# any_of 生成的 OR 条件组键序号 (多个条件组合并到同一字典时互不覆盖)
+_or_key_counter = count()
+
+# 字段名与操作符之间的分隔符, 例如 "age__gte"
+OPERATOR_SEP = "__"
+
+# 操作符后缀 -> 谓词构造函数
+OPERATORS: Dict[str, Callable[[Any, Any], ColumnElement]] = {
+    "eq": lambda col, v: col == v,
+    "ne": lambda col, v: col != v,
+    "gt": lambda col, v: col > v,
+    "gte": lambda col, v: col >= v,
+    "lt": lambda col, v: col < v,
+    "lte": lambda col, v: col <= v,
+    "in": lambda col, v: col.in_(v),
+    "not_in": lambda col, v: col.not_in(v),
+    "like": lambda col, v: col.like(v),
+    "ilike": lambda col, v: col.ilike(v),
+    "startswith": lambda col, v: col.startswith(v, autoescape=True),
+    "endswith": lambda col, v: col.endswith(v, autoescape=True),
+    "contains": lambda col, v: col.contains(v, autoescape=True),
+    "between": lambda col, v: col.between(*v),
+    "is_null": lambda col, v: col.is_(None) if v else col.is_not(None),
+}
+
+# 值为 Python 对象时需要序列化为 JSON 字符串的操作符
+_JSON_OPERATORS = ("eq", "ne")
+
+# 可预编译为绑定参数模板的操作符 (startswith 等需在构建时转义字面值, 不参与模板缓存)
+_TEMPLATE_OPERATORS = (
+    "eq",
+    "ne",
+    "gt",
+    "gte",
+    "lt",
+    "lte",
+    "in",
+    "not_in",
+    "like",
+    "ilike",
+    "between",
+    "is_null",
+)
+
+# 条件结构: ((条件键, 结构标记), ...), 结构标记决定生成的 SQL 形态 (例如 IS NULL)
+ConditionShape = Tuple[Tuple[str, Optional[bool]], ...]
+
+
+def any_of(*conditions: Dict[Union[str, InstrumentedAttribute], Any]) -> Dict[str, Any]:
+    """构建 OR 条件组 (每次调用生成唯一的条件组键, 多个条件组之间为 AND 关系)
+
+    Examples:
+    >>> Model.filter(conditions={"age__gte": 18, **any_of({"name": "a"}, {"name": "b"})})
+    >>> Model.filter(**any_of({"name": "a"}, {"name": "b"}), **any_of({"age": 1}, {"age": 2}))
+    """
+    return {f"{OR_KEY}{next(_or_key_counter)}": list(conditions)}
+
+
+def merge_conditions(
+    base_dict: Optional[Dict[Union[str, InstrumentedAttribute], Any]],
+    new_dict: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """合并筛选条件 (字段对象键转换为字段名)
+
+    Args:
+    :param base_dict: 基础条件
+    :param new_dict: 新条件
+
+    Returns:
+    :return: 合并后的条件
+    """
+
+    merged: Dict[str, Any] = {}
+    for d in (base_dict, new_dict):
+        for key, value in (d or {}).items():
+            merged[key.key if isinstance(key, InstrumentedAttribute) else key] = value
+    return merged
+
+
+@lru_cache(maxsize=1024)
+def compile_condition_shape(
+    model_class: Type[Any],
+    keys: Tuple[str, ...],
+) -> Tuple[Tuple[str, Any, str], ...]:
+    """解析条件结构 (字段与操作符), 相同结构的条件复用解析结果
+
+    Args:
+    :param model_class: 数据模型类
+    :param keys: 条件键
+
+    Returns:
+    :return: (条件键, 字段对象, 操作符) 元组
+    """
+
+    compiled: List[Tuple[str, Any, str]] = []
+    for key in keys:
+        field, op = key, "eq"
+        if not hasattr(model_class, key) and OPERATOR_SEP in key:
+            field, op = key.rsplit(OPERATOR_SEP, 1)
+            if op not in OPERATORS:
+                raise ValueError(f"Invalid operator: {op}")
+        if not hasattr(model_class, field):
+            raise ValueError(f"Invalid field: {field}")
+        attr = getattr(model_class, field)
+        if callable(attr):
+            raise TypeError(f"Invalid field: {field} is a function")
+        compiled.append((key, attr, op))
+    return tuple(compiled)
+
+
+def compile_conditions(
+    model_class: Type[Any],
+    conditions: Dict[str, Any],
+    convert_json: bool = True,
+) -> List[ColumnElement]:
+    """将筛选条件编译为 WHERE 子句列表
+
+    支持操作符后缀 (例如 `age__gte`, `id__in`, `name__like`) 与 OR 条件组 (`__or__`)
+
+    Args:
+    :param model_class: 数据模型类
+    :param conditions: 筛选条件 (已合并的字段名字典)
+    :param convert_json: 是否将等值条件中的字典 / 列表值序列化为 JSON 字符串
+
+    Returns:
+    :return: WHERE 子句列表
+    """
+
+    keys = tuple(k for k in conditions if not k.startswith(OR_KEY))
+    clauses: List[ColumnElement] = []
+    for key, attr, op in compile_condition_shape(model_class, keys):
+        value = _condition_value(attr, op, conditions[key], convert_json)
+        clauses.append(OPERATORS[op](attr, value))
+
+    for key in conditions:
+        if key.startswith(OR_KEY):
+            clauses.append(
+                or_(
+                    *[
+                        and_(
+                            *compile_conditions(
+                                model_class,
+                                merge_conditions(group, None),
+                                convert_json,
+                            ),
+                        )
+                        for group in conditions[key]
+                    ],
+                ),
+            )
+    return clauses
+
+
+def condition_params(
+    model_class: Type[Any],
+    conditions: Dict[str, Any],
+    convert_json: bool = True,
+) -> Optional[Tuple[ConditionShape, Dict[str, Any]]]:
+    """提取条件结构与绑定参数, 相同结构的条件可复用同一语句模板
+
+    Args:
+    :param model_class: 数据模型类
+    :param conditions: 筛选条件 (已合并的字段名字典)
+    :param convert_json: 是否将等值条件中的字典 / 列表值序列化为 JSON 字符串
+
+    Returns:
+    :return: (条件结构, 绑定参数), 包含 OR 条件组或不支持模板的操作符时返回 None
+    """
+
+    if any(key.startswith(OR_KEY) for key in conditions):
+        return None
+
+    shape: List[Tuple[str, Optional[bool]]] = []
+    params: Dict[str, Any] = {}
+    compiled = compile_condition_shape(model_class, tuple(conditions))
+    for i, (key, attr, op) in enumerate(compiled):
+        if op not in _TEMPLATE_OPERATORS:
+            return None
+        value = _condition_value(attr, op, conditions[key], convert_json)
+        name = f"_p{i}"
+        if op == "is_null":
+            shape.append((key, bool(value)))
+            continue
+        if op in _JSON_OPERATORS:
+            shape.append((key, value is None))
+            if value is not None:
+                params[name] = value
+            continue
+        if op == "between":
+            params[f"{name}_0"], params[f"{name}_1"] = value
+        else:
+            params[name] = list(value) if op in ("in", "not_in") else value
+        shape.append((key, None))
+    return tuple(shape), params
+
+
+def compile_condition_template(
+    model_class: Type[Any],
+    shape: ConditionShape,
+) -> List[ColumnElement]:
+    """将条件结构编译为带绑定参数的 WHERE 子句列表 (参数名与 `condition_params` 一致)
+
+    Args:
+    :param model_class: 数据模型类
+    :param shape: 条件结构
+
+    Returns:
+    :return: WHERE 子句列表
+    """
+
+    keys = tuple(key for key, _ in shape)
+    clauses: List[ColumnElement] = []
+    for i, ((_key, attr, op), (_, marker)) in enumerate(
+        zip(compile_condition_shape(model_class, keys), shape),
+    ):
+        name = f"_p{i}"
+        if op == "is_null" or (op in _JSON_OPERATORS and marker):
+            clauses.append(OPERATORS[op](attr, marker if op == "is_null" else None))
+        elif op == "between":
+            clauses.append(
+                attr.between(bindparam(f"{name}_0"), bindparam(f"{name}_1")),
+            )
+        elif op in ("in", "not_in"):
+            clauses.append(OPERATORS[op](attr, bindparam(name, expanding=True)))
+        else:
+            clauses.append(OPERATORS[op](attr, bindparam(name)))
+    return clauses
+
+
+def _condition_value(attr: Any, op: str, value: Any, convert_json: bool) -> Any:
+    """按操作符转换条件值 (等值条件中的字典 / 列表值序列化为 JSON 字符串, JSON 类型列除外)"""
+
+    if op in _JSON_OPERATORS and isinstance(value, (dict, list)):
+        if isinstance(getattr(attr, "type", None), (JSON, MioJSON)):
+            return value
+        if not convert_json:
+            raise ValueError(f"Invalid value type: {type(value)}")
+        return json_dumps(value)
+    return value
@@ -0,0 +1,421 @@
+import inspect
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# 统计的模型方法 (不包含缓存统计等辅助方法)
+INSTRUMENTED_METHODS = (
+    "add",
+    "batch_add",
+    "batch_upsert",
+    "get_by_pk",
+    "get_many_by_pk",
+    "get_by_field",
+    "filter",
+    "filter_to_dict",
+    "filter_to_tuple",
+    "get_all",
+    "iter_filter",
+    "paginate_after",
+    "update",
+    "delete",
+    "update_where",
+    "delete_where",
+    "auto_insert",
+    "auto_insert_by_field",
+    "count",
+    "exists",
+    "aggregate",
+    "aadd",
+    "abatch_add",
+    "abatch_upsert",
+    "aget_by_pk",
+    "aget_many_by_pk",
+    "aget_by_field",
+    "afilter",
+    "afilter_to_dict",
+    "aget_all",
+    "aiter_filter",
+    "apaginate_after",
+    "aupdate",
+    "adelete",
+    "aupdate_where",
+    "adelete_where",
+    "aauto_insert",
+    "aauto_insert_by_field",
+    "acount",
+    "aexists",
+    "aaggregate",
+)
+
+# 连接获取等待时间直方图分桶上限 (秒)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# 当前正在执行的模型方法 (用于按方法归集语句)
+_current_method: ContextVar[Optional[str]] = ContextVar(
+    "mio_current_method",
+    default=None,
+)
+
+
+def current_method() -> Optional[str]:
+    """获取当前正在执行的模型方法名 (例如 "User.get_by_pk")"""
+    return _current_method.get()
+
+
+class _Stat:
+    """耗时统计 (次数 / 总耗时 / 最大耗时)"""
+
+    __slots__ = ("count", "max", "total")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, cost: float) -> None:
+        self.count += 1
+        self.total += cost
+        if cost > self.max:
+            self.max = cost
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class _PoolStat:
+    """单个连接池的统计"""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.checked_out = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.wait = _Stat()
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+        self.lifetime = _Stat()
+
+
+class OrmMetrics:
+    """连接池与查询指标
+
+    通过 SQLAlchemy 连接池 / 引擎事件统计连接获取等待时间, 签出连接数, 溢出连接数, 连接生命周期,
+    以及按模型方法统计调用次数, 耗时与执行的语句数
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        interval: float = 60,
+    ) -> None:
+        """初始化指标收集器
+
+        Args:
+        :param callback: 指标推送回调, 以 `snapshot()` 结果调用
+        :param interval: 推送间隔 (秒), 在模型方法调用结束时检查, 不创建后台线程
+        """
+        self._callback = callback
+        self._interval = interval
+        self._last_push = monotonic()
+        self._lock = Lock()
+        self._pools: Dict[str, _PoolStat] = {}
+        self._methods: Dict[str, _Stat] = {}
+        self._method_errors: Dict[str, int] = {}
+        self._method_queries: Dict[Optional[str], int] = {}
+        self._queries = _Stat()
+
+    def attach_engine(self, engine: Union[Engine, AsyncEngine], name: str) -> None:
+        """注册引擎的连接池与语句执行事件
+
+        Args:
+        :param engine: 数据库引擎
+        :param name: 连接池名称 (例如 primary / replica0)
+        """
+
+        engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        stat = _PoolStat(engine)
+        self._pools[name] = stat
+        pool = engine.pool
+        self._wrap_pool_get(pool, stat)
+
+        def on_engine_disposed(disposed_engine: Engine) -> None:
+            # dispose() 以新连接池替换原连接池 (事件监听器随之转移, 实例上的包装不会), 需重新包装
+            self._wrap_pool_get(disposed_engine.pool, stat)
+
+        def on_connect(_dbapi_connection: Any, connection_record: Any) -> None:
+            connection_record.info["mio_connected_at"] = monotonic()
+            with self._lock:
+                stat.connects += 1
+
+        def on_close(_dbapi_connection: Any, connection_record: Any) -> None:
+            connected_at = connection_record.info.pop("mio_connected_at", None)
+            with self._lock:
+                stat.closes += 1
+                if connected_at is not None:
+                    stat.lifetime.observe(monotonic() - connected_at)
+
+        def on_checkout(_dbapi_connection: Any, _connection_record: Any, _proxy: Any) -> None:
+            with self._lock:
+                stat.checked_out += 1
+                stat.checkouts += 1
+
+        def on_checkin(_dbapi_connection: Any, _connection_record: Any) -> None:
+            with self._lock:
+                stat.checked_out -= 1
+
+        def before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+            conn.info["mio_query_start"] = perf_counter()
+
+        def after_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+            start = conn.info.pop("mio_query_start", None)
+            if start is None:
+                return
+            method = _current_method.get()
+            with self._lock:
+                self._queries.observe(perf_counter() - start)
+                self._method_queries[method] = self._method_queries.get(method, 0) + 1
+
+        event.listen(pool, "connect", on_connect)
+        event.listen(pool, "close", on_close)
+        event.listen(pool, "checkout", on_checkout)
+        event.listen(pool, "checkin", on_checkin)
+        event.listen(engine, "engine_disposed", on_engine_disposed)
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+    def _wrap_pool_get(self, pool: Any, stat: _PoolStat) -> None:
+        """包装连接池获取连接的方法以统计等待时间
+
+        连接池事件没有签出前钩子, 只能包装连接池获取连接的内部方法
+        (不存在该方法的连接池跳过等待统计, 已包装的连接池不重复包装)
+        """
+        do_get = getattr(pool, "_do_get", None)
+        if do_get is None or getattr(do_get, "__mio_wait__", False):
+            return
+
+        def _do_get() -> Any:
+            start = perf_counter()
+            try:
+                return do_get()
+            finally:
+                self._observe_wait(stat, perf_counter() - start)
+
+        _do_get.__mio_wait__ = True  # type: ignore
+        pool._do_get = _do_get  # noqa: SLF001
+
+    def _observe_wait(self, stat: _PoolStat, cost: float) -> None:
+        """记录一次连接获取等待时间"""
+        index = len(WAIT_BUCKETS)
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if cost <= bound:
+                index = i
+                break
+        with self._lock:
+            stat.wait.observe(cost)
+            stat.wait_buckets[index] += 1
+
+    def observe_method(self, name: str, cost: float, error: bool = False) -> None:
+        """记录一次模型方法调用
+
+        Args:
+        :param name: 方法名 (例如 "User.get_by_pk")
+        :param cost: 耗时 (秒)
+        :param error: 是否抛出异常
+        """
+        with self._lock:
+            stat = self._methods.get(name)
+            if stat is None:
+                stat = self._methods[name] = _Stat()
+            stat.observe(cost)
+            if error:
+                self._method_errors[name] = self._method_errors.get(name, 0) + 1
+        if self._callback is not None and monotonic() - self._last_push >= self._interval:
+            self.push()
+
+    def push(self) -> None:
+        """立即以当前指标调用推送回调"""
+        self._last_push = monotonic()
+        if self._callback is not None:
+            self._callback(self.snapshot())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """获取当前指标
+
+        Returns:
+        :return: 指标字典
+            - pools: 各连接池的签出 / 溢出连接数, 连接获取等待时间与直方图, 连接生命周期
+            - methods: 各模型方法的调用次数, 耗时, 异常次数与执行的语句数
+            - queries: 所有语句的执行次数与耗时
+        """
+        with self._lock:
+            pools: Dict[str, Any] = {}
+            for name, stat in self._pools.items():
+                pool = stat.engine.pool
+                buckets: List[Tuple[str, int]] = [
+                    (f"<={bound}", count)
+                    for bound, count in zip(WAIT_BUCKETS, stat.wait_buckets)
+                ]
+                buckets.append((f">{WAIT_BUCKETS[-1]}", stat.wait_buckets[-1]))
+                pools[name] = {
+                    "pool": pool.status(),
+                    "size": _pool_value(pool, "size"),
+                    "checked_out": stat.checked_out,
+                    "overflow": _pool_value(pool, "overflow"),
+                    "checkouts": stat.checkouts,
+                    "connects": stat.connects,
+                    "closes": stat.closes,
+                    "checkout_wait": {**stat.wait.to_dict(), "buckets": dict(buckets)},
+                    "connection_lifetime": stat.lifetime.to_dict(),
+                }
+            methods = {
+                name: {
+                    **stat.to_dict(),
+                    "errors": self._method_errors.get(name, 0),
+                    "queries": self._method_queries.get(name, 0),
+                }
+                for name, stat in self._methods.items()
+            }
+            return {
+                "pools": pools,
+                "methods": methods,
+                "queries": self._queries.to_dict(),
+            }
+
+    def reset(self) -> None:
+        """重置累计指标 (保留当前签出连接数)"""
+        with self._lock:
+            for stat in self._pools.values():
+                stat.checkouts = stat.connects = stat.closes = 0
+                stat.wait = _Stat()
+                stat.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+                stat.lifetime = _Stat()
+            self._methods.clear()
+            self._method_errors.clear()
+            self._method_queries.clear()
+            self._queries = _Stat()
+
+
+def instrument_method(
+    func: Callable,
+    name: str,
+    metrics: Optional[OrmMetrics] = None,
+) -> Callable:
+    """包装模型方法: 在执行期间标记当前方法以归集语句, 并记录调用耗时
+
+    Args:
+    :param func: 模型方法
+    :param name: 方法名 (例如 "User.get_by_pk")
+    :param metrics: 指标收集器 (为 None 时仅标记当前方法)
+
+    Returns:
+    :return: 包装后的方法
+    """
+
+    # 生成器方法仅在每次迭代步骤内标记当前方法, 避免标记泄漏到调用方的其它语句
+    if inspect.isasyncgenfunction(func):
+
+        @wraps(func)
+        async def async_gen_wrapper(*args, **kwargs):
+            gen = func(*args, **kwargs)
+            start, error = perf_counter(), False
+            try:
+                while True:
+                    token = _current_method.set(name)
+                    try:
+                        item = await gen.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    finally:
+                        _current_method.reset(token)
+                    yield item
+            except GeneratorExit:
+                raise
+            except BaseException:
+                error = True
+                raise
+            finally:
+                await gen.aclose()
+                if metrics is not None:
+                    metrics.observe_method(name, perf_counter() - start, error)
+
+        return async_gen_wrapper
+
+    if inspect.isgeneratorfunction(func):
+
+        @wraps(func)
+        def gen_wrapper(*args, **kwargs):
+            gen = func(*args, **kwargs)
+            start, error = perf_counter(), False
+            try:
+                while True:
+                    token = _current_method.set(name)
+                    try:
+                        item = next(gen)
+                    except StopIteration:
+                        return
+                    finally:
+                        _current_method.reset(token)
+                    yield item
+            except GeneratorExit:
+                raise
+            except BaseException:
+                error = True
+                raise
+            finally:
+                gen.close()
+                if metrics is not None:
+                    metrics.observe_method(name, perf_counter() - start, error)
+
+        return gen_wrapper
+
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = _current_method.set(name)
+            start, error = perf_counter(), False
+            try:
+                return await func(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                _current_method.reset(token)
+                if metrics is not None:
+                    metrics.observe_method(name, perf_counter() - start, error)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current_method.set(name)
+        start, error = perf_counter(), False
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            _current_method.reset(token)
+            if metrics is not None:
+                metrics.observe_method(name, perf_counter() - start, error)
+
+    return wrapper
+
+
+def _pool_value(pool: Any, name: str) -> Optional[int]:
+    """读取连接池状态值 (连接池类型不支持时返回 None)"""
+    method = getattr(pool, name, None)
+    return method() if callable(method) else None
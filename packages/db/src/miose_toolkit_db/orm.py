@@ -1,13 +1,104 @@
+import asyncio
+import atexit
+import base64
+import binascii
+import sqlite3
+import sys
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import date, datetime, time
+from functools import lru_cache
 from importlib import import_module
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union
-
-from sqlalchemy import UnaryExpression, create_engine
+from threading import RLock, get_ident
+from time import monotonic
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Collection,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from sqlalchemy import (
+    ColumnElement,
+    Delete,
+    Insert,
+    Integer,
+    Select,
+    Table,
+    UnaryExpression,
+    Update,
+    and_,
+    bindparam,
+    create_engine,
+    delete,
+    event,
+    false,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy import inspect as sqa_inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import (
+    Session,
+    make_transient_to_detached,
+    object_session,
+    scoped_session,
+    sessionmaker,
+)
 from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.orm.exc import UnmappedColumnError
 from sqlalchemy.orm.query import Query
-from sqlalchemy.orm.state import InstanceState
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+from sqlalchemy.sql import operators
+
+from .advisor import IndexAdvisor
+from .buffer import WriteBuffer
+from .cache import BaseCache, ModelCache
+from .columns import (
+    ModelColumns,
+    build_model_columns,
+    build_serializer,
+    decode_json,
+    install_lazy_json,
+    json_dumps,
+    json_dumps_bytes,
+    json_loads,
+)
+from .conditions import (
+    ConditionShape,
+    compile_condition_template,
+    compile_conditions,
+    condition_params,
+    merge_conditions,
+)
+from .metrics import INSTRUMENTED_METHODS, OrmMetrics, instrument_method
+from .profiler import QueryProfiler
+from .replica import REPLICA_STRATEGIES, ReplicaSet
+from .transaction import GroupCommitter
 
 try:
     import ujson as json  # type: ignore
@@ -17,10 +108,56 @@ except ImportError:
 
 T = TypeVar("T", bound="MioModel")
 
+# 各数据库类型默认使用的异步驱动
+_ASYNC_DRIVERS: Dict[str, str] = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+# 可选的会话作用域模式
+_SESSION_MODES = ("shared", "thread", "context")
+
+# SQLite 连接参数预设 (每个新连接建立时执行的 PRAGMA)
+_SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # 高吞吐: WAL + NORMAL 同步 (断电可能丢失最近提交, 不会损坏数据库), 启用内存映射与大页缓存
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # 安全: WAL + FULL 同步 (每次提交落盘)
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16384,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+# 各数据库类型单条语句允许的最大绑定参数数量
+_MAX_BIND_PARAMS: Dict[str, int] = {
+    "sqlite": 32766,
+    "postgresql": 65535,
+    "mysql": 65535,
+}
+
+# 升序排序时 NULL 排在最后的数据库 (SQLite / MySQL 中 NULL 视为最小值, 升序排在最前)
+_NULLS_LAST_DATABASES = ("postgresql",)
+
 
 class MioModel:
     """数据模型基类"""
 
+    # 字段元数据 (注册时预计算)
+    __mio_columns__: ModelColumns
+    # 索引建议器 (未启用时为 None)
+    __mio_advisor__: Optional[IndexAdvisor] = None
+
     @classmethod
     def add(
         cls: Type[T],
@@ -31,10 +168,27 @@ class MioModel:
         raise NotImplementedError
 
     @classmethod
-    def batch_add(cls, data_list: List[Dict[str, Any]]) -> None:
+    def batch_add(
+        cls,
+        data_list: Iterable[Dict[str, Any]],
+        batch_size: int = 5000,
+        commit_per_batch: bool = False,
+        on_progress: Optional[Callable[[int], Any]] = None,
+    ) -> int:
         """批量新增行 (暂不支持更新)"""
         raise NotImplementedError
 
+    @classmethod
+    def batch_upsert(
+        cls,
+        data_list: List[Dict[str, Any]],
+        conflict_keys: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        update_fields: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """批量插入或更新行"""
+        raise NotImplementedError
+
     @classmethod
     def get_by_pk(
         cls: Type[T],
@@ -44,6 +198,16 @@ class MioModel:
         """根据主键查询行"""
         raise NotImplementedError
 
+    @classmethod
+    def get_many_by_pk(
+        cls: Type[T],
+        pk_values: Iterable[Any],
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Dict[Any, T]:
+        """根据主键批量查询行"""
+        raise NotImplementedError
+
     @classmethod
     def get_by_field(
         cls: Type[T],
@@ -80,7 +244,21 @@ class MioModel:
         convert_json: bool = True,
         **kwarg,
     ) -> List[Dict[str, Any]]:
-        """筛选数据行"""
+        """筛选数据行 (返回字典)"""
+        raise NotImplementedError
+
+    @classmethod
+    def filter_to_tuple(
+        cls: Type[T],
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        order_by: Optional[List[UnaryExpression]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> List[Tuple[Any, ...]]:
+        """筛选数据行 (返回元组)"""
         raise NotImplementedError
 
     @classmethod
@@ -91,6 +269,43 @@ class MioModel:
         """查询所有行"""
         raise NotImplementedError
 
+    @classmethod
+    def iter_filter(
+        cls: Type[T],
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        order_by: Optional[List[UnaryExpression]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        convert_json: bool = True,
+        batch_size: int = 1000,
+        **kwarg,
+    ) -> Iterator[T]:
+        """流式筛选数据行"""
+        raise NotImplementedError
+
+    @classmethod
+    def iter_all(
+        cls: Type[T],
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[T]:
+        """流式查询所有行"""
+        raise NotImplementedError
+
+    @classmethod
+    def paginate_after(
+        cls: Type[T],
+        cursor: Optional[str] = None,
+        order_by: Optional[List[Union[InstrumentedAttribute, UnaryExpression]]] = None,
+        page_size: int = 20,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> Tuple[List[T], Optional[str]]:
+        """游标 (Keyset) 分页查询"""
+        raise NotImplementedError
+
     def update(
         self: T,
         data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
@@ -103,10 +318,89 @@ class MioModel:
         """删除行"""
         raise NotImplementedError
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(
+        self,
+        fields: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        decode_json: bool = True,
+    ) -> Dict[str, Any]:
         """转换为字典"""
         raise NotImplementedError
 
+    @classmethod
+    def to_dicts(
+        cls: Type[T],
+        rows: Iterable[T],
+        fields: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        decode_json: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """批量转换为字典"""
+        raise NotImplementedError
+
+    @classmethod
+    def to_json(
+        cls: Type[T],
+        rows: Iterable[T],
+        fields: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+    ) -> bytes:
+        """批量序列化为 JSON 字节串"""
+        raise NotImplementedError
+
+    @classmethod
+    def update_where(
+        cls,
+        conditions: Dict[Union[str, InstrumentedAttribute], Any],
+        values: Dict[Union[str, InstrumentedAttribute], Any],
+        convert_json: bool = True,
+    ) -> int:
+        """按条件批量更新行"""
+        raise NotImplementedError
+
+    @classmethod
+    def delete_where(
+        cls,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> int:
+        """按条件批量删除行"""
+        raise NotImplementedError
+
+    @classmethod
+    def count(
+        cls,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> int:
+        """统计满足条件的行数"""
+        raise NotImplementedError
+
+    @classmethod
+    def exists(
+        cls,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> bool:
+        """判断是否存在满足条件的行"""
+        raise NotImplementedError
+
+    @classmethod
+    def aggregate(
+        cls,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        group_by: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        sum: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+        avg: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        min: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+        max: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+        count: bool = False,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> List[Dict[str, Any]]:
+        """按条件分组聚合"""
+        raise NotImplementedError
+
     @classmethod
     def auto_insert(
         cls: Type[T],
@@ -132,12 +426,296 @@ class MioModel:
         """获取 SQLAlchemy 查询对象"""
         raise NotImplementedError
 
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        """获取行缓存统计信息"""
+        raise NotImplementedError
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """清空行缓存"""
+        raise NotImplementedError
+
+    @classmethod
+    def buffered(
+        cls,
+        max_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+        put_timeout: Optional[float] = None,
+        on_error: Optional[Callable[[BaseException, List[Dict[str, Any]]], Any]] = None,
+    ) -> WriteBuffer:
+        """获取模型的写入缓冲队列"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aadd(
+        cls: Type[T],
+        data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        **kwarg,
+    ) -> T:
+        """新增行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def abatch_add(
+        cls,
+        data_list: Iterable[Dict[str, Any]],
+        batch_size: int = 5000,
+        commit_per_batch: bool = False,
+        on_progress: Optional[Callable[[int], Any]] = None,
+    ) -> int:
+        """批量新增行 (异步, 暂不支持更新)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def abatch_upsert(
+        cls,
+        data_list: List[Dict[str, Any]],
+        conflict_keys: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        update_fields: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """批量插入或更新行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aget_by_pk(
+        cls: Type[T],
+        pk_value: Any,
+        fields: Optional[List[InstrumentedAttribute]] = None,
+    ) -> Optional[T]:
+        """根据主键查询行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aget_many_by_pk(
+        cls: Type[T],
+        pk_values: Iterable[Any],
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Dict[Any, T]:
+        """根据主键批量查询行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aget_by_field(
+        cls: Type[T],
+        field: InstrumentedAttribute,
+        value: str,
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        allow_multiple=False,
+    ) -> Optional[T]:
+        """根据字段查询行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def afilter(
+        cls: Type[T],
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        order_by: Optional[List[UnaryExpression]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> List[T]:
+        """筛选数据行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def afilter_to_dict(
+        cls: Type[T],
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        order_by: Optional[List[UnaryExpression]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> List[Dict[str, Any]]:
+        """筛选数据行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aget_all(
+        cls: Type[T],
+        fields: Optional[List[InstrumentedAttribute]] = None,
+    ) -> List[T]:
+        """查询所有行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    def aiter_filter(
+        cls: Type[T],
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        order_by: Optional[List[UnaryExpression]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        convert_json: bool = True,
+        batch_size: int = 1000,
+        **kwarg,
+    ) -> AsyncIterator[T]:
+        """流式筛选数据行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    def aiter_all(
+        cls: Type[T],
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[T]:
+        """流式查询所有行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def apaginate_after(
+        cls: Type[T],
+        cursor: Optional[str] = None,
+        order_by: Optional[List[Union[InstrumentedAttribute, UnaryExpression]]] = None,
+        page_size: int = 20,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> Tuple[List[T], Optional[str]]:
+        """游标 (Keyset) 分页查询 (异步)"""
+        raise NotImplementedError
+
+    async def aupdate(
+        self: T,
+        data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        **kwarg,
+    ) -> T:
+        """更新行 (异步)"""
+        raise NotImplementedError
+
+    async def adelete(self) -> None:
+        """删除行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aupdate_where(
+        cls,
+        conditions: Dict[Union[str, InstrumentedAttribute], Any],
+        values: Dict[Union[str, InstrumentedAttribute], Any],
+        convert_json: bool = True,
+    ) -> int:
+        """按条件批量更新行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def adelete_where(
+        cls,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> int:
+        """按条件批量删除行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def acount(
+        cls,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> int:
+        """统计满足条件的行数 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aexists(
+        cls,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> bool:
+        """判断是否存在满足条件的行 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aaggregate(
+        cls,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        group_by: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        sum: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+        avg: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+        min: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+        max: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+        count: bool = False,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> List[Dict[str, Any]]:
+        """按条件分组聚合 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aauto_insert(
+        cls: Type[T],
+        data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        **kwarg,
+    ) -> T:
+        """自动插入数据 (异步)"""
+        raise NotImplementedError
+
+    @classmethod
+    async def aauto_insert_by_field(
+        cls: Type[T],
+        field: InstrumentedAttribute,
+        value: str,
+        data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        **kwarg,
+    ) -> T:
+        """根据字段自动插入数据 (异步)"""
+        raise NotImplementedError
+
 
 class MioOrm:
-    def __init__(self, db_url: str, **kwarg) -> None:
+    def __init__(
+        self,
+        db_url: str,
+        async_mode: bool = False,
+        async_db_url: str = "",
+        session_mode: str = "shared",
+        group_commit_window: Optional[float] = None,
+        sqlite_profile: Optional[str] = None,
+        replicas: Optional[List[str]] = None,
+        replica_strategy: str = "round_robin",
+        read_your_writes: float = 0,
+        metrics: bool = False,
+        metrics_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        metrics_interval: float = 60,
+        profile: bool = False,
+        slow_query_threshold: Optional[float] = None,
+        index_advisor: bool = False,
+        **kwarg,
+    ) -> None:
         """初始化数据库连接
 
         :param db_url: 数据库连接 URL
+        :param async_mode: 是否启用异步模式 (启用后模型类提供 aadd / afilter 等异步方法)
+        :param async_db_url: 异步数据库连接 URL (默认根据 db_url 自动推导异步驱动)
+        :param session_mode: 会话作用域模式
+            - shared: 所有调用共享同一个会话 (默认)
+            - thread: 每个线程独立会话 (线程本地)
+            - context: 每个 asyncio 任务 (不在任务中时为每个线程) 独立会话, 子任务不继承父任务的会话
+        :param group_commit_window: 组提交时间窗口 (秒), 设置后共享会话中的写入方法在窗口内合并为一次提交
+            (仅 shared 会话模式可用)
+        :param sqlite_profile: SQLite 连接参数预设 (非 SQLite 数据库忽略)
+            - fast: WAL, synchronous=NORMAL, mmap, 64MB 页缓存, 内存临时表, busy_timeout
+            - safe: WAL, synchronous=FULL, 16MB 页缓存, 内存临时表, busy_timeout
+        :param replicas: 只读副本连接 URL 列表, 配置后模型读取方法路由到副本, 写入方法使用主库
+        :param replica_strategy: 副本选择策略
+            - round_robin: 轮询 (默认)
+            - least_latency: 最低语句执行延迟
+        :param read_your_writes: 写后读窗口 (秒), 当前线程 / 上下文写入后窗口内的读取使用主库
+        :param metrics: 是否收集连接池与模型方法指标 (通过 `metrics()` 获取)
+        :param metrics_callback: 指标推送回调 (设置后自动启用指标收集)
+        :param metrics_interval: 指标推送间隔 (秒)
+        :param profile: 是否启用语句级性能分析 (通过 `profile_report()` / `explain_slow_queries()` 获取)
+        :param slow_query_threshold: 慢查询阈值 (秒), 设置后自动启用性能分析并记录超过阈值的语句日志
+        :param index_advisor: 是否记录查询的条件与排序字段组合 (通过 `index_report()` 获取索引建议)
         :param kwarg: 数据库连接参数
             例如:
                 - pool_pre_ping: False  # 每次连接前检查连接是否有效
@@ -150,7 +728,66 @@ class MioOrm:
             Path(root).mkdir(parents=True, exist_ok=True)
         self._db_url = db_url
         self._db_args = kwarg
-        self._create_db_connection(db_url)
+        self._async_mode = async_mode
+        self._async_db_url = async_db_url or _to_async_db_url(db_url)
+        if session_mode not in _SESSION_MODES:
+            raise ValueError(f"Invalid session mode: {session_mode}")
+        self._session_mode = session_mode
+        if sqlite_profile is not None and sqlite_profile not in _SQLITE_PROFILES:
+            raise ValueError(f"Invalid sqlite profile: {sqlite_profile}")
+        self._sqlite_profile = sqlite_profile
+        if replica_strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Invalid replica strategy: {replica_strategy}")
+        self._replica_urls = list(replicas or [])
+        self._replica_strategy = replica_strategy
+        self._read_your_writes = read_your_writes
+        if group_commit_window is not None and session_mode != "shared":
+            raise ValueError("Group commit is only available in shared session mode")
+        self._group_committer = (
+            GroupCommitter(group_commit_window) if group_commit_window else None
+        )
+        # 共享会话保护锁: 共享会话的读写与事务块互斥 (组提交模式下与组提交器共用)
+        self._shared_lock = (
+            self._group_committer.lock if self._group_committer is not None else RLock()
+        )
+        self._model_caches: List[ModelCache] = []
+        self._write_buffers: Dict[type, WriteBuffer] = {}
+        self._metrics = (
+            OrmMetrics(metrics_callback, metrics_interval)
+            if metrics or metrics_callback is not None
+            else None
+        )
+        self._profiler = (
+            QueryProfiler(slow_query_threshold)
+            if profile or slow_query_threshold is not None
+            else None
+        )
+        self._advisor = IndexAdvisor() if index_advisor else None
+        self._session_ctx: ContextVar[Optional[Session]] = ContextVar(
+            f"mio_orm_session_{id(self)}",
+            default=None,
+        )
+        self._async_session_ctx: ContextVar[Optional[AsyncSession]] = ContextVar(
+            f"mio_orm_async_session_{id(self)}",
+            default=None,
+        )
+        # context 模式下的 (所属任务 / 线程, 会话): 子任务复制父上下文时不继承父任务的会话
+        self._context_session_ctx: ContextVar[Optional[Tuple[Any, Session]]] = ContextVar(
+            f"mio_orm_context_session_{id(self)}",
+            default=None,
+        )
+        self._tx_ctx: ContextVar[Optional[Session]] = ContextVar(
+            f"mio_orm_transaction_{id(self)}",
+            default=None,
+        )
+        self._async_tx_ctx: ContextVar[Optional[AsyncSession]] = ContextVar(
+            f"mio_orm_async_transaction_{id(self)}",
+            default=None,
+        )
+        self._last_write_ctx: ContextVar[float] = ContextVar(
+            f"mio_orm_last_write_{id(self)}",
+            default=0.0,
+        )
 
         database_type = db_url.split("://")[0]
 
@@ -162,8 +799,10 @@ class MioOrm:
             database_type = "postgresql"
 
         # 根据数据库类型动态导入不同的插入方法
+        self._database_type = database_type
         self._insert = import_module(f"sqlalchemy.dialects.{database_type}").insert
-        # print("type:", type(self._insert))
+
+        self._create_db_connection(db_url)
 
     def _create_db_connection(self, db_url: str) -> None:
         """创建数据库连接
@@ -175,40 +814,561 @@ class MioOrm:
             # 创建对象的基类:
             self._Base = declarative_base()
 
-            # 初始化数据库连接:
-            self._engine = create_engine(db_url, **self._db_args)
-            self._connection = self._engine.connect()
+            # 初始化数据库引擎 (不建立连接, 连接在首次使用时由连接池创建, 可通过 warmup 预先建立):
+            self._engine = create_engine(db_url, **self._engine_args())
+            self._install_sqlite_profile(self._engine)
+            self._instrument_engine(self._engine, "primary")
 
             # 创建DBSession类型:
-            self._db: Session = sessionmaker(bind=self._engine)()
+            self._session_maker = sessionmaker(bind=self._engine)
+            # 组提交模式下提交由其它调用方触发, 提交后不使行对象过期 (避免在保护锁外触发刷新查询)
+            self._db: Session = self._session_maker(
+                expire_on_commit=self._group_committer is None,
+            )
+            self._scoped_db: Optional[scoped_session[Session]] = (
+                scoped_session(self._session_maker)
+                if self._session_mode == "thread"
+                else None
+            )
+
+            # 异步模式下创建异步引擎与会话工厂:
+            self._async_engine: Optional[AsyncEngine] = None
+            self._async_session_maker: Optional[async_sessionmaker[AsyncSession]] = None
+            if self._async_mode:
+                self._async_engine = create_async_engine(
+                    self._async_db_url,
+                    **self._engine_args(),
+                )
+                self._install_sqlite_profile(self._async_engine.sync_engine)
+                self._instrument_engine(self._async_engine, "async")
+                self._async_session_maker = async_sessionmaker(
+                    bind=self._async_engine,
+                    expire_on_commit=False,
+                )
+
+            # 只读副本:
+            self._replicas: Optional[ReplicaSet[Session]] = None
+            self._async_replicas: Optional[ReplicaSet[AsyncSession]] = None
+            if self._replica_urls:
+                engines = [
+                    create_engine(url, **self._engine_args())
+                    for url in self._replica_urls
+                ]
+                for i, engine in enumerate(engines):
+                    self._install_sqlite_profile(engine)
+                    self._instrument_engine(engine, f"replica{i}")
+                self._replicas = ReplicaSet(
+                    engines,  # type: ignore
+                    [sessionmaker(bind=engine, autoflush=False) for engine in engines],
+                    self._replica_strategy,
+                )
+            if self._replica_urls and self._async_mode:
+                async_engines = [
+                    create_async_engine(_to_async_db_url(url), **self._engine_args())
+                    for url in self._replica_urls
+                ]
+                for i, async_engine in enumerate(async_engines):
+                    self._install_sqlite_profile(async_engine.sync_engine)
+                    self._instrument_engine(async_engine, f"async_replica{i}")
+                self._async_replicas = ReplicaSet(
+                    async_engines,  # type: ignore
+                    [
+                        async_sessionmaker(
+                            bind=async_engine,
+                            autoflush=False,
+                            expire_on_commit=False,
+                        )
+                        for async_engine in async_engines
+                    ],
+                    self._replica_strategy,
+                )
         except Exception:
             print("Failed to create database connection")
             raise
 
-    def reconnect(self) -> None:
-        """重新连接数据库"""
-        self.close_db_connection()
-        self._create_db_connection(self._db_url, **self._db_args)
+    def _engine_args(self) -> Dict[str, Any]:
+        """获取创建引擎的参数 (JSON 列默认使用 ujson 序列化, 可由传入参数覆盖)"""
 
-    def close_db_connection(self) -> None:
-        """关闭数据库连接"""
-        self._db.close()
-        self._connection.close()
-        self._engine.dispose()
+        if self._database_type not in _MAX_BIND_PARAMS:
+            return self._db_args
+        return {
+            "json_serializer": json_dumps,
+            "json_deserializer": json_loads,
+            **self._db_args,
+        }
 
-    def get_sqa_db(self) -> Session:
-        """获取数据库连接
+    def _install_sqlite_profile(self, engine: Engine) -> None:
+        """为 SQLite 引擎注册连接事件, 在每个新连接上执行预设 PRAGMA"""
 
-        Returns:
-        :return: 数据库连接
-        """
-        return self._db
+        if self._sqlite_profile is None or self._database_type != "sqlite":
+            return
+        pragmas = _SQLITE_PROFILES[self._sqlite_profile]
 
-    def get_sqa_Base(self) -> Any:
-        """获取 SQLAlchemy 的 Base 类
+        def on_connect(dbapi_connection: Any, _connection_record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
+
+        event.listen(engine, "connect", on_connect)
+
+    def _instrument_engine(self, engine: Union[Engine, AsyncEngine], name: str) -> None:
+        """为引擎注册指标收集与性能分析事件 (均未启用时不注册)"""
+
+        if self._metrics is not None:
+            self._metrics.attach_engine(engine, name)
+        if self._profiler is not None:
+            self._profiler.attach_engine(engine)
+
+    def metrics(self) -> Dict[str, Any]:
+        """获取连接池与模型方法指标
 
         Returns:
-        :return: SQLAlchemy 的 Base 类
+        :return: 指标字典 (详见 `OrmMetrics.snapshot`)
+        """
+        if self._metrics is None:
+            raise RuntimeError("Metrics are not enabled, pass `metrics=True` to MioOrm")
+        return self._metrics.snapshot()
+
+    def profile_report(self, limit: int = 10) -> Dict[str, Any]:
+        """获取语句级性能分析报告
+
+        Args:
+        :param limit: 返回的语句数量 (按总耗时降序)
+
+        Returns:
+        :return: 报告字典 (详见 `QueryProfiler.report`)
+        """
+        if self._profiler is None:
+            raise RuntimeError("Profiler is not enabled, pass `profile=True` to MioOrm")
+        return self._profiler.report(limit)
+
+    def explain_slow_queries(self, limit: int = 3) -> List[Dict[str, Any]]:
+        """在主库上对总耗时最高的语句执行 EXPLAIN
+
+        Args:
+        :param limit: 分析的语句数量
+
+        Returns:
+        :return: 分析结果列表 (statement / total / plan)
+        """
+        if self._profiler is None:
+            raise RuntimeError("Profiler is not enabled, pass `profile=True` to MioOrm")
+        return self._profiler.explain(self._engine, limit)
+
+    def warmup(self, n: int = 1) -> int:
+        """预先建立连接池连接 (主库与各只读副本)
+
+        同时签出 n 个连接后归还连接池, 数量不超过连接池可保留的连接数 (溢出连接归还时会被关闭)
+
+        Args:
+        :param n: 每个引擎预先建立的连接数
+
+        Returns:
+        :return: 主库连接池中预先建立的连接数
+        """
+        engines: List[Engine] = [self._engine]
+        if self._replicas is not None:
+            engines.extend(self._replicas.engines)  # type: ignore
+        warmed = 0
+        for engine in engines:
+            connections = [
+                engine.connect() for _ in range(_warmup_count(engine.pool, n))
+            ]
+            for connection in connections:
+                connection.close()
+            if engine is self._engine:
+                warmed = len(connections)
+        return warmed
+
+    async def awarmup(self, n: int = 1) -> int:
+        """预先建立异步连接池连接 (异步主库与各异步只读副本)
+
+        Args:
+        :param n: 每个引擎预先建立的连接数
+
+        Returns:
+        :return: 异步主库连接池中预先建立的连接数
+        """
+        if self._async_engine is None:
+            raise RuntimeError(
+                "Async mode is not enabled, use MioOrm(..., async_mode=True)",
+            )
+        engines: List[AsyncEngine] = [self._async_engine]
+        if self._async_replicas is not None:
+            engines.extend(self._async_replicas.engines)  # type: ignore
+        warmed = 0
+        for engine in engines:
+            connections = [
+                await engine.connect().start()
+                for _ in range(_warmup_count(engine.pool, n))
+            ]
+            for connection in connections:
+                await connection.close()
+            if engine is self._async_engine:
+                warmed = len(connections)
+        return warmed
+
+    def index_report(self, min_count: int = 1) -> List[Dict[str, Any]]:
+        """获取索引建议报告 (在主库上对记录的查询执行 EXPLAIN 识别全表扫描)
+
+        Args:
+        :param min_count: 查询次数下限, 低于该次数的查询结构不参与分析
+
+        Returns:
+        :return: 报告列表 (详见 `IndexAdvisor.report`)
+        """
+        if self._advisor is None:
+            raise RuntimeError(
+                "Index advisor is not enabled, pass `index_advisor=True` to MioOrm",
+            )
+        return self._advisor.report(self._engine, min_count)
+
+    def create_recommended_indexes(self, min_count: int = 1) -> List[str]:
+        """创建索引建议报告中建议的索引
+
+        Args:
+        :param min_count: 查询次数下限
+
+        Returns:
+        :return: 创建的索引名列表
+        """
+        if self._advisor is None:
+            raise RuntimeError(
+                "Index advisor is not enabled, pass `index_advisor=True` to MioOrm",
+            )
+        return self._advisor.create_recommended_indexes(self._engine, min_count)
+
+    def reconnect(self) -> None:
+        """重新连接数据库"""
+        self.close_db_connection()
+        self._create_db_connection(self._db_url)
+
+    def close_db_connection(self) -> None:
+        """关闭数据库连接 (写入缓冲队列中的剩余数据先行写入)"""
+        for buffer in list(self._write_buffers.values()):
+            atexit.unregister(buffer.close)
+            buffer.close()
+        self._write_buffers.clear()
+        self._db.close()
+        if self._scoped_db is not None:
+            self._scoped_db.remove()
+        self.remove_session()
+        self._engine.dispose()
+        if self._replicas is not None:
+            for engine in self._replicas.engines:
+                engine.dispose()  # type: ignore
+
+    async def aclose_db_connection(self) -> None:
+        """关闭数据库连接 (异步模式下同时释放异步引擎)"""
+        self.close_db_connection()
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+        if self._async_replicas is not None:
+            for async_engine in self._async_replicas.engines:
+                await async_engine.dispose()  # type: ignore
+
+    def get_async_session(self) -> AsyncSession:
+        """创建一个新的异步数据库会话
+
+        Returns:
+        :return: 异步数据库会话 (需由调用方关闭, 推荐 `async with` 使用)
+        """
+        if self._async_session_maker is None:
+            raise RuntimeError(
+                "Async mode is not enabled, use MioOrm(..., async_mode=True)",
+            )
+        return self._async_session_maker()
+
+    @asynccontextmanager
+    async def use_async_session(self) -> AsyncIterator[AsyncSession]:
+        """获取当前可用的异步数据库会话
+
+        处于 `orm.asession()` 工作单元中时复用该会话, 否则创建一个独立会话并在退出时关闭
+
+        Returns:
+        :return: 异步数据库会话
+        """
+        session = self._async_session_ctx.get()
+        if session is not None:
+            yield session
+            return
+        async with self.get_async_session() as session:
+            yield session
+
+    @asynccontextmanager
+    async def use_async_read_session(self) -> AsyncIterator[AsyncSession]:
+        """获取读取使用的异步数据库会话
+
+        配置只读副本时, 工作单元 / 事务之外且不在写后读窗口内的读取路由到副本, 否则同 `use_async_session`
+
+        Returns:
+        :return: 异步数据库会话
+        """
+        if (
+            self._async_replicas is None
+            or self._async_session_ctx.get() is not None
+            or self._in_write_window()
+        ):
+            async with self.use_async_session() as session:
+                yield session
+            return
+        async with self._async_replicas.session() as session:
+            yield session
+
+    @asynccontextmanager
+    async def asession(self) -> AsyncIterator[AsyncSession]:
+        """异步工作单元: 块内所有异步模型方法共享同一个会话
+
+        正常退出时提交, 发生异常时回滚, 最终关闭会话
+
+        Examples:
+        >>> async with orm.asession():
+        ...     item = await Model.aget_by_pk("1")
+        ...     await item.aupdate(name="new_name")
+        """
+        async with self.get_async_session() as session:
+            token = self._async_session_ctx.set(session)
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                self._async_session_ctx.reset(token)
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """工作单元: 块内所有模型方法共享同一个独立会话
+
+        正常退出时提交, 发生异常时回滚, 最终关闭会话并释放其标识映射
+
+        Examples:
+        >>> with orm.session():
+        ...     item = Model.get_by_pk("1")
+        ...     item.update(name="new_name")
+        """
+        session = self._session_maker()
+        session.info["mio_unit_of_work"] = True
+        token = self._session_ctx.set(session)
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self._session_ctx.reset(token)
+            session.close()
+
+    @contextmanager
+    def detached_session(self) -> Iterator[Session]:
+        """独立读取会话: 块内模型方法使用一个独立会话, 退出时关闭且不提交
+
+        读取的行对象在退出后为游离态 (已加载的属性保留), 可直接调用 update / delete 写回;
+        可在任意线程中使用, 不与共享会话交错
+        """
+        session = self._session_maker()
+        token = self._session_ctx.set(session)
+        try:
+            yield session
+        finally:
+            self._session_ctx.reset(token)
+            session.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Session]:
+        """事务: 块内模型写入方法只刷新 (flush) 不提交, 退出时统一提交一次
+
+        正常退出时提交, 发生异常时回滚 (同时使行缓存失效), 嵌套使用时由最外层事务提交.
+        共享会话模式下事务块持有共享会话保护锁, 其它线程对共享会话的读写等待事务块结束
+        (块内不能等待其它线程使用同一 MioOrm 的共享会话, 否则会死锁)
+
+        Examples:
+        >>> with orm.transaction():
+        ...     Model.add(id="1", name="name1")
+        ...     Model.get_by_pk("2").update(name="name2")
+        """
+        db = self.get_sqa_db()
+        if self._tx_ctx.get() is db:
+            yield db
+            return
+        with self._session_guard(db):
+            token = self._tx_ctx.set(db)
+            try:
+                yield db
+                self._commit_now(db)
+            except Exception:
+                self._rollback_now(db)
+                self._invalidate_caches()
+                raise
+            finally:
+                self._tx_ctx.reset(token)
+
+    @asynccontextmanager
+    async def atransaction(self) -> AsyncIterator[AsyncSession]:
+        """异步事务: 块内异步模型写入方法只刷新 (flush) 不提交, 退出时统一提交一次
+
+        处于 `orm.asession()` 工作单元中时复用该会话, 否则创建一个独立会话并在退出时关闭
+
+        Examples:
+        >>> async with orm.atransaction():
+        ...     await Model.aadd(id="1", name="name1")
+        ...     await Model.aupdate_where({"id": "2"}, {"name": "name2"})
+        """
+        async with self.use_async_session() as session:
+            if self._async_tx_ctx.get() is session:
+                yield session
+                return
+            session_token = self._async_session_ctx.set(session)
+            token = self._async_tx_ctx.set(session)
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                self._invalidate_caches()
+                raise
+            finally:
+                self._async_tx_ctx.reset(token)
+                self._async_session_ctx.reset(session_token)
+
+    def _commit(self, db: Session) -> None:
+        """提交模型写入 (事务中只刷新, 由事务退出时统一提交)"""
+        self._mark_write()
+        if self._tx_ctx.get() is db:
+            db.flush()
+        else:
+            self._commit_now(db)
+
+    def _commit_now(self, db: Session) -> None:
+        """立即提交 (启用组提交时共享会话的提交在时间窗口内合并)"""
+        if self._group_committer is not None and db is self._db:
+            self._group_committer.commit(db)
+        else:
+            db.commit()
+
+    def _rollback(self, db: Session) -> None:
+        """回滚模型写入 (事务中交由事务统一回滚)"""
+        if self._tx_ctx.get() is not db:
+            self._rollback_now(db)
+
+    def _rollback_now(self, db: Session) -> None:
+        """立即回滚 (需在处理写入异常的 except 块中调用)
+
+        启用组提交时共享会话的回滚会丢弃同一窗口内其它调用方已刷新的写入, 由组提交器通知这些调用方提交失败
+        """
+        if self._group_committer is not None and db is self._db:
+            self._group_committer.rollback(db, sys.exc_info()[1])
+        else:
+            db.rollback()
+
+    def _session_guard(self, db: Session) -> ContextManager[Any]:
+        """获取共享会话保护锁 (共享会话的读写操作与其它线程的事务块及刷新 / 提交互斥)"""
+        if db is self._db:
+            return self._shared_lock
+        return nullcontext()
+
+    async def _acommit(self, adb: AsyncSession) -> None:
+        """提交异步模型写入 (事务中只刷新, 由事务退出时统一提交)"""
+        self._mark_write()
+        if self._async_tx_ctx.get() is adb:
+            await adb.flush()
+        else:
+            await adb.commit()
+
+    async def _arollback(self, adb: AsyncSession) -> None:
+        """回滚异步模型写入 (事务中交由事务统一回滚)"""
+        if self._async_tx_ctx.get() is not adb:
+            await adb.rollback()
+
+    def _invalidate_caches(self) -> None:
+        """使所有模型行缓存失效 (事务回滚后缓存可能包含未提交的数据)"""
+        for model_cache in self._model_caches:
+            model_cache.invalidate_all()
+
+    @contextmanager
+    def use_read_session(self) -> Iterator[Session]:
+        """获取读取使用的数据库会话
+
+        配置只读副本时, 工作单元 / 事务之外且不在写后读窗口内的读取路由到副本
+        (退出时关闭副本会话, 读取的行对象为游离态, 可直接调用 update / delete), 否则返回当前会话
+
+        Returns:
+        :return: 数据库会话
+        """
+        if self._replicas is None or not self._can_read_replica():
+            db = self.get_sqa_db()
+            with self._session_guard(db):
+                yield db
+            return
+        session = self._replicas.session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def in_transaction(self) -> bool:
+        """当前线程 / 上下文是否处于 `orm.transaction()` 事务或 `orm.session()` 工作单元中"""
+        if self._tx_ctx.get() is not None:
+            return True
+        session = self._session_ctx.get()
+        return session is not None and bool(session.info.get("mio_unit_of_work"))
+
+    def _can_read_replica(self) -> bool:
+        """当前线程 / 上下文的读取是否可以路由到只读副本"""
+        return not self.in_transaction() and not self._in_write_window()
+
+    def _in_write_window(self) -> bool:
+        """当前线程 / 上下文是否处于写后读窗口内"""
+        last_write = self._last_write_ctx.get()
+        return bool(last_write) and monotonic() - last_write < self._read_your_writes
+
+    def _mark_write(self) -> None:
+        """记录当前线程 / 上下文的写入时间 (用于写后读窗口)"""
+        if self._read_your_writes:
+            self._last_write_ctx.set(monotonic())
+
+    def remove_session(self) -> None:
+        """关闭并移除当前线程 / 上下文的会话 (thread / context 模式下使用)"""
+        if self._scoped_db is not None:
+            self._scoped_db.remove()
+        owned = self._context_session_ctx.get()
+        if owned is not None and owned[0] == _context_owner():
+            owned[1].close()
+            self._context_session_ctx.set(None)
+
+    def get_sqa_db(self) -> Session:
+        """获取数据库连接
+
+        优先返回 `orm.session()` 工作单元中的会话, 其次按会话作用域模式返回对应会话
+
+        Returns:
+        :return: 数据库连接
+        """
+        session = self._session_ctx.get()
+        if session is not None:
+            return session
+        if self._scoped_db is not None:
+            return self._scoped_db()
+        if self._session_mode == "context":
+            owner = _context_owner()
+            owned = self._context_session_ctx.get()
+            if owned is not None and owned[0] == owner:
+                return owned[1]
+            session = self._session_maker()
+            self._context_session_ctx.set((owner, session))
+            return session
+        return self._db
+
+    def get_sqa_Base(self) -> Any:
+        """获取 SQLAlchemy 的 Base 类
+
+        Returns:
+        :return: SQLAlchemy 的 Base 类
         """
         return self._Base
 
@@ -216,23 +1376,143 @@ class MioOrm:
         """创建所有数据表"""
         self._Base.metadata.create_all(self._engine)
 
-    def reg_predefine_data_model(self, table_name="", primary_key: str = "id"):
+    async def acreate_all(self) -> None:
+        """创建所有数据表 (异步)"""
+        if self._async_engine is None:
+            raise RuntimeError(
+                "Async mode is not enabled, use MioOrm(..., async_mode=True)",
+            )
+        async with self._async_engine.begin() as conn:
+            await conn.run_sync(self._Base.metadata.create_all)
+
+    def _max_bind_params(self) -> int:
+        """获取当前数据库单条语句允许的最大绑定参数数量"""
+        if self._database_type == "sqlite" and sqlite3.sqlite_version_info < (
+            3,
+            32,
+            0,
+        ):
+            # SQLite 3.32.0 之前的版本上限为 999
+            return 999
+        return _MAX_BIND_PARAMS.get(self._database_type, 999)
+
+    def _build_upsert(
+        self,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        conflict_keys: List[str],
+        update_fields: List[str],
+    ) -> Insert:
+        """构建多行 INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE 语句
+
+        Args:
+        :param table: 数据表
+        :param rows: 行数据列表 (各行字段需一致)
+        :param conflict_keys: 冲突判定字段
+        :param update_fields: 冲突时更新的字段 (为空则忽略冲突行)
+
+        Returns:
+        :return: 插入语句
+        """
+
+        stmt = self._insert(table).values(rows)
+        if self._database_type == "mysql":
+            # MySQL 根据表上的主键 / 唯一索引判定冲突
+            fields = update_fields or conflict_keys[:1]
+            return stmt.on_duplicate_key_update(
+                {f: stmt.inserted[f] for f in fields},
+            )
+        if not update_fields:
+            return stmt.on_conflict_do_nothing(index_elements=conflict_keys)
+        return stmt.on_conflict_do_update(
+            index_elements=conflict_keys,
+            set_={f: stmt.excluded[f] for f in update_fields},
+        )
+
+    def _iter_upsert_statements(
+        self,
+        table: Table,
+        data_list: List[Dict[str, Any]],
+        conflict_keys: List[Union[str, InstrumentedAttribute]],
+        update_fields: Optional[List[Union[str, InstrumentedAttribute]]],
+        batch_size: int,
+        json_columns: Collection[str] = (),
+        column_keys: Optional[Mapping[str, str]] = None,
+    ) -> Iterator[Insert]:
+        """按批次生成批量插入或更新语句
+
+        Args:
+        :param table: 数据表
+        :param data_list: 行数据列表
+        :param conflict_keys: 冲突判定字段
+        :param update_fields: 冲突时更新的字段 (默认更新除冲突字段外的所有传入字段)
+        :param batch_size: 每条语句最多包含的行数
+        :param json_columns: JSON 类型列 (值由列类型负责序列化)
+        :param column_keys: 列属性名 -> 数据表列键 (与属性名不同的列)
+
+        Returns:
+        :return: 插入语句迭代器
+        """
+
+        if not data_list:
+            return
+        column_keys = column_keys or {}
+        rows = [
+            {
+                column_keys.get(k, k): v
+                for k, v in _convert_json_values(data, json_columns).items()
+            }
+            for data in data_list
+        ]
+        keys = [column_keys.get(_field_name(k), _field_name(k)) for k in conflict_keys]
+        if update_fields is None:
+            fields = [k for k in rows[0] if k not in keys]
+        else:
+            fields = [
+                column_keys.get(_field_name(k), _field_name(k)) for k in update_fields
+            ]
+        for k in (*keys, *fields):
+            if k not in table.c:
+                raise ValueError(f"Invalid field: {k}")
+
+        # 避免超出数据库单条语句的绑定参数上限
+        max_params = self._max_bind_params()
+        batch_size = max(1, min(batch_size, max_params // max(len(rows[0]), 1)))
+        for chunk in _chunked(rows, batch_size):
+            yield self._build_upsert(table, chunk, keys, fields)
+
+    def reg_predefine_data_model(
+        self,
+        table_name="",
+        primary_key: str = "id",
+        cache: Optional[BaseCache] = None,
+    ):
         """注册预定义的数据模型装饰器构建器
 
         Args:
         :param cls: 数据模型类
+        :param cache: 行缓存后端 (例如 LRUCache), 启用后 get_by_pk / get_by_field 优先读取缓存,
+            并由 add / batch_add / update / delete / auto_insert 等写入方法自动失效
         """
 
-        db = self._db
+        orm = self
 
         def modal_class_wrapper(cls: Type[T]) -> Type[T]:
             """数据模型装饰器"""
 
+            model_table_name = table_name or cls.__name__.lower()
+            # 缓存键以表名区分, 多个模型可共用同一缓存后端
+            model_cache = (
+                ModelCache(cache, model_table_name) if cache is not None else None
+            )
+            if model_cache is not None:
+                orm._model_caches.append(model_cache)
+
             class ModelClass(cls, self.get_sqa_Base()):
                 """预定义数据模型基类"""
 
                 __allow_unmapped__ = True
-                __tablename__ = table_name or cls.__name__.lower()
+                __tablename__ = model_table_name
 
                 @classmethod
                 def add(
@@ -258,34 +1538,108 @@ class MioOrm:
                             convert_json=convert_json,
                         ),
                     )
-                    try:
-                        db.add(model_data)
-                        db.commit()
-                    except Exception:
-                        db.rollback()
-                        raise
+                    db = orm.get_sqa_db()
+                    with orm._session_guard(db):
+                        try:
+                            db.add(model_data)
+                            orm._commit(db)
+                        except Exception:
+                            orm._rollback(db)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate(getattr(model_data, primary_key))
 
                     return model_data
 
                 @classmethod
-                def batch_add(cls, data_list: List[Dict[str, Any]]) -> None:
+                def batch_add(
+                    cls,
+                    data_list: Iterable[Dict[str, Any]],
+                    batch_size: int = 5000,
+                    commit_per_batch: bool = False,
+                    on_progress: Optional[Callable[[int], Any]] = None,
+                ) -> int:
                     """批量新增行 (暂不支持更新)
 
+                    按批次流式消费行数据, 每批次通过 executemany 写入, 内存占用与批次大小相关
+
                     Args:
-                    :param data_list: 行数据列表
+                    :param data_list: 行数据可迭代对象 (支持生成器)
+                    :param batch_size: 每批次写入的行数
+                    :param commit_per_batch: 是否每批次提交一次 (默认全部写入后统一提交)
+                    :param on_progress: 进度回调, 每批次写入后以累计行数调用
+
+                    Returns:
+                    :return: 写入的行数
                     """
 
-                    for data in data_list:
-                        for k, v in data.items():
-                            if isinstance(v, (dict, list)):
-                                data[k] = json.dumps(v, ensure_ascii=False)
+                    table = cls.__table__  # type: ignore
+                    db = orm.get_sqa_db()
+                    count = 0
+                    with orm._session_guard(db):
+                        try:
+                            for chunk in _iter_insert_batches(
+                                data_list,
+                                batch_size,
+                                cls.__mio_columns__.json_columns,
+                            ):
+                                for rows in _group_by_keys(chunk):
+                                    db.execute(insert(table), _column_rows(cls, rows))
+                                if commit_per_batch:
+                                    orm._commit(db)
+                                _invalidate_rows(model_cache, chunk, primary_key)
+                                count += len(chunk)
+                                if on_progress:
+                                    on_progress(count)
+                            orm._commit(db)
+                        except Exception:
+                            orm._rollback(db)
+                            raise
+                    return count
+
+                @classmethod
+                def batch_upsert(
+                    cls,
+                    data_list: List[Dict[str, Any]],
+                    conflict_keys: Optional[
+                        List[Union[str, InstrumentedAttribute]]
+                    ] = None,
+                    update_fields: Optional[
+                        List[Union[str, InstrumentedAttribute]]
+                    ] = None,
+                    batch_size: int = 1000,
+                ) -> int:
+                    """批量插入或更新行 (每批次一条 INSERT ... ON CONFLICT 语句)
+
+                    Args:
+                    :param data_list: 行数据列表 (各行字段需一致)
+                    :param conflict_keys: 冲突判定字段 (默认主键, MySQL 下由表上的唯一索引决定)
+                    :param update_fields: 冲突时更新的字段 (默认除冲突字段外的所有传入字段, 传入空列表则忽略冲突行)
+                    :param batch_size: 每条语句最多包含的行数
+
+                    Returns:
+                    :return: 处理的行数
+                    """
 
-                    try:
-                        db.bulk_insert_mappings(cls, data_list)
-                        db.commit()
-                    except Exception:
-                        db.rollback()
-                        raise
+                    db = orm.get_sqa_db()
+                    with orm._session_guard(db):
+                        try:
+                            for stmt in orm._iter_upsert_statements(
+                                cls.__table__,  # type: ignore
+                                data_list,
+                                conflict_keys or [primary_key],
+                                update_fields,
+                                batch_size,
+                                cls.__mio_columns__.json_columns,
+                                cls.__mio_columns__.column_keys,
+                            ):
+                                db.execute(stmt)
+                            orm._commit(db)
+                        except Exception:
+                            orm._rollback(db)
+                            raise
+                    _invalidate_rows(model_cache, data_list, primary_key, strict=True)
+                    return len(data_list)
 
                 @classmethod
                 def get_by_pk(
@@ -302,11 +1656,75 @@ class MioOrm:
                     :return: 行对象 (不存在则返回 None)
                     """
 
-                    return (
-                        (db.query(cls, *fields) if fields else db.query(cls))
-                        .filter(getattr(cls, primary_key) == pk_value)
-                        .first()
-                    )
+                    with orm.use_read_session() as db:
+                        if model_cache is not None and not fields:
+                            row = model_cache.get_row(pk_value)
+                            if row is not None:
+                                return _merge_snapshot(db, cls, row)
+
+                        stmt, params = _prepare_select(
+                            cls,
+                            {primary_key: pk_value},
+                            fields,
+                        )
+                        res = db.execute(stmt, params)
+                        if fields:
+                            return res.first()
+                        item = res.scalars().first()
+                    if model_cache is not None and item is not None:
+                        model_cache.set_row(pk_value, _row_snapshot(item))
+                    return item
+
+                @classmethod
+                def get_many_by_pk(
+                    cls: Type[T],
+                    pk_values: Iterable[Any],
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    chunk_size: Optional[int] = None,
+                ) -> Dict[Any, T]:
+                    """根据主键批量查询行
+
+                    主键按数据库绑定参数上限分批拼接为 `IN (...)` 查询, N 次查询减少为 ceil(N / chunk_size) 次
+
+                    Args:
+                    :param pk_values: 主键值列表
+                    :param fields: 额外返回字段
+                    :param chunk_size: 每批次查询的主键数量 (默认取数据库绑定参数上限)
+
+                    Returns:
+                    :return: 以主键为键的行对象字典 (不存在的主键不包含在结果中)
+                    """
+
+                    result: Dict[Any, T] = {}
+                    pending = list(dict.fromkeys(pk_values))
+                    chunk_size = chunk_size or orm._max_bind_params()
+                    with orm.use_read_session() as db:
+                        if model_cache is not None and not fields:
+                            missing = []
+                            for pk_value in pending:
+                                row = model_cache.get_row(pk_value)
+                                if row is None:
+                                    missing.append(pk_value)
+                                else:
+                                    result[pk_value] = _merge_snapshot(db, cls, row)
+                            pending = missing
+
+                        for chunk in _chunked(pending, chunk_size):
+                            stmt, params = _prepare_select(
+                                cls,
+                                {f"{primary_key}__in": chunk},
+                                fields,
+                            )
+                            res = db.execute(stmt, params)
+                            for item in res.all() if fields else res.scalars().all():
+                                entity = item[0] if fields else item
+                                result[getattr(entity, primary_key)] = item
+                                if model_cache is not None and not fields:
+                                    model_cache.set_row(
+                                        getattr(entity, primary_key),
+                                        _row_snapshot(entity),
+                                    )
+                    return result
 
                 @classmethod
                 def get_by_field(
@@ -318,12 +1736,29 @@ class MioOrm:
                 ) -> Optional[T]:
                     """根据字段查询行"""
 
-                    obj = db.query(cls, *fields) if fields else db.query(cls)
-                    if not hasattr(cls, field.key):
-                        raise ValueError(f"Invalid field: {field}")
-                    res = obj.filter(getattr(cls, field.key) == value).limit(2).all()
+                    use_cache = model_cache is not None and not fields
+                    with orm.use_read_session() as db:
+                        if use_cache:
+                            row = model_cache.get_row_by_field(field.key, value)  # type: ignore
+                            if row is not None:
+                                return _merge_snapshot(db, cls, row)
+
+                        stmt, params = _prepare_select(
+                            cls,
+                            {field.key: value},
+                            fields,
+                            limit=2,
+                        )
+                        res = db.execute(stmt, params)
+                        res = res.all() if fields else res.scalars().all()
                     if not allow_multiple and len(res) > 1:
                         raise ValueError(f"Multiple results found for {field}: {value}")
+                    if use_cache and len(res) == 1:
+                        model_cache.set_row(  # type: ignore
+                            getattr(res[0], primary_key),
+                            _row_snapshot(res[0]),
+                            field=field.key,
+                        )
                     return res[0] if res else None
 
                 @classmethod
@@ -341,23 +1776,20 @@ class MioOrm:
                 ) -> List[T]:
                     """筛选数据行"""
 
-                    merged_conditions = _merge_dict(
-                        conditions,
-                        kwarg,
+                    merged_conditions = merge_conditions(conditions, kwarg)
+
+                    stmt, params = _prepare_select(
                         cls,
+                        merged_conditions,
+                        fields,
                         convert_json=convert_json,
+                        order_by=order_by,
+                        limit=limit,
+                        offset=offset,
                     )
-
-                    obj = db.query(cls, *fields) if fields else db.query(cls)
-                    for k, v in merged_conditions.items():
-                        if not hasattr(cls, k):
-                            raise ValueError(f"Invalid field: {k}")
-                        obj = obj.filter(getattr(cls, k) == v)
-                    if order_by:
-                        obj = obj.order_by(*order_by)
-                    obj = obj.limit(limit) if limit else obj
-                    obj = obj.offset(offset) if offset else obj
-                    return obj.all()
+                    with orm.use_read_session() as db:
+                        res = db.execute(stmt, params)
+                        return list(res.all() if fields else res.scalars().all())
 
                 @classmethod
                 def filter_to_dict(
@@ -372,32 +1804,64 @@ class MioOrm:
                     convert_json: bool = True,
                     **kwarg,
                 ) -> List[Dict[str, Any]]:
-                    """筛选数据行"""
+                    """筛选数据行 (返回字典)
 
-                    merged_conditions = _merge_dict(
-                        conditions,
-                        kwarg,
+                    直接从游标读取指定列, 不构建 ORM 对象, 适用于只读的报表类查询
+
+                    Args:
+                    :param fields: 返回字段 (默认为所有列)
+
+                    Returns:
+                    :return: 行数据字典列表
+                    """
+
+                    merged_conditions = merge_conditions(conditions, kwarg)
+
+                    stmt, params = _prepare_select(
                         cls,
+                        merged_conditions,
+                        fields,
                         convert_json=convert_json,
+                        order_by=order_by,
+                        limit=limit,
+                        offset=offset,
+                        columns_only=True,
                     )
+                    with orm.use_read_session() as db:
+                        rows = [dict(row) for row in db.execute(stmt, params).mappings()]
+                    return _decode_json_rows(cls, rows)
+
+                @classmethod
+                def filter_to_tuple(
+                    cls: Type[T],
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    order_by: Optional[List[UnaryExpression]] = None,
+                    limit: Optional[int] = None,
+                    offset: Optional[int] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> List[Tuple[Any, ...]]:
+                    """筛选数据行 (返回元组, 字段顺序与 fields 一致, 默认为所有列)"""
 
-                    obj = db.query(cls, *fields) if fields else db.query(cls)
-                    for k, v in merged_conditions.items():
-                        if not hasattr(cls, k):
-                            raise ValueError(f"Invalid field: {k}")
-                        obj = obj.filter(getattr(cls, k) == v)
-                    if order_by:
-                        obj = obj.order_by(*order_by)
-                    obj = obj.limit(limit) if limit else obj
-                    obj = obj.offset(offset) if offset else obj
-                    return [
-                        {
-                            k: v
-                            for k, v in d._asdict().items()  # type: ignore
-                            if not isinstance(v, ModelClass)
-                        }
-                        for d in obj.all()
-                    ]
+                    merged_conditions = merge_conditions(conditions, kwarg)
+                    stmt, params = _prepare_select(
+                        cls,
+                        merged_conditions,
+                        fields,
+                        convert_json=convert_json,
+                        order_by=order_by,
+                        limit=limit,
+                        offset=offset,
+                        columns_only=True,
+                    )
+                    with orm.use_read_session() as db:
+                        res = db.execute(stmt, params)
+                        if not cls.__mio_columns__.json_columns:
+                            return [tuple(row) for row in res]
+                        return [tuple(decode_json(v) for v in row) for row in res]
 
                 @classmethod
                 def get_all(
@@ -406,7 +1870,116 @@ class MioOrm:
                 ) -> List[T]:
                     """查询所有行"""
 
-                    return (db.query(cls, *fields) if fields else db.query(cls)).all()
+                    stmt, params = _prepare_select(cls, {}, fields)
+                    with orm.use_read_session() as db:
+                        res = db.execute(stmt, params)
+                        return list(res.all() if fields else res.scalars().all())
+
+                @classmethod
+                def iter_filter(
+                    cls: Type[T],
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    order_by: Optional[List[UnaryExpression]] = None,
+                    limit: Optional[int] = None,
+                    offset: Optional[int] = None,
+                    convert_json: bool = True,
+                    batch_size: int = 1000,
+                    **kwarg,
+                ) -> Iterator[T]:
+                    """流式筛选数据行
+
+                    使用服务端游标 (PostgreSQL / MySQL) 按批次拉取结果, 内存占用与批次大小相关
+
+                    Args:
+                    :param batch_size: 每批次拉取的行数
+
+                    Returns:
+                    :return: 数据行生成器
+                    """
+
+                    merged_conditions = merge_conditions(conditions, kwarg)
+                    stmt, params = _prepare_select(
+                        cls,
+                        merged_conditions,
+                        fields,
+                        convert_json=convert_json,
+                        order_by=order_by,
+                        limit=limit,
+                        offset=offset,
+                    )
+                    with orm.use_read_session() as db:
+                        res = db.execute(
+                            stmt,
+                            params,
+                            execution_options={"yield_per": batch_size},
+                        )
+                        try:
+                            yield from (res if fields else res.scalars())
+                        finally:
+                            res.close()
+
+                @classmethod
+                def iter_all(
+                    cls: Type[T],
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    batch_size: int = 1000,
+                ) -> Iterator[T]:
+                    """流式查询所有行
+
+                    Args:
+                    :param batch_size: 每批次拉取的行数
+
+                    Returns:
+                    :return: 数据行生成器
+                    """
+
+                    return cls.iter_filter(fields=fields, batch_size=batch_size)
+
+                @classmethod
+                def paginate_after(
+                    cls: Type[T],
+                    cursor: Optional[str] = None,
+                    order_by: Optional[
+                        List[Union[InstrumentedAttribute, UnaryExpression]]
+                    ] = None,
+                    page_size: int = 20,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> Tuple[List[T], Optional[str]]:
+                    """游标 (Keyset) 分页查询
+
+                    根据上一页最后一行的排序键定位下一页, 查询开销与页码深度无关
+
+                    Args:
+                    :param cursor: 上一页返回的游标 (为空则查询第一页)
+                    :param order_by: 排序字段 (支持 asc / desc, 自动追加主键保证顺序唯一)
+                    :param page_size: 每页行数
+                    :param conditions: 筛选条件
+
+                    Returns:
+                    :return: (当前页数据行, 下一页游标 (无下一页则为 None))
+                    """
+
+                    merged_conditions = merge_conditions(conditions, kwarg)
+                    stmt, order_cols = _build_keyset_select(
+                        cls,
+                        merged_conditions,
+                        cursor,
+                        order_by,
+                        page_size,
+                        primary_key,
+                        convert_json=convert_json,
+                        nulls_low=orm._database_type not in _NULLS_LAST_DATABASES,
+                    )
+                    with orm.use_read_session() as db:
+                        rows = list(db.execute(stmt).scalars().all())
+                    return _keyset_page(rows, order_cols, page_size)
 
                 def update(
                     self,
@@ -422,66 +1995,1046 @@ class MioOrm:
                         cls,
                         convert_json=convert_json,
                     )
-                    for k, v in merged_data.items():
-                        setattr(self, k, v)
-                    db.commit()
+                    pk_value = getattr(self, primary_key)
+                    db = orm.get_sqa_db()
+                    with orm._session_guard(db):
+                        try:
+                            for k, v in merged_data.items():
+                                setattr(self, k, v)
+                            _attach(db, self)
+                            orm._commit(db)
+                        except Exception:
+                            orm._rollback(db)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate(pk_value)
                     return self
 
                 def delete(self) -> None:
                     """删除行"""
 
-                    try:
-                        db.delete(self)
-                        db.commit()
-                        del self
-                    except Exception:
-                        db.rollback()
-                        raise
-
-                def to_dict(self) -> Dict[str, Any]:
-                    """转换为字典"""
-
-                    ret_dict = {}
-                    for key in list(self.__dict__.keys()):
-                        if isinstance(getattr(self, key), (InstanceState, Query)):
-                            continue
-                        if key.startswith("_sa_"):
-                            continue
-                        ret_dict[key] = getattr(self, key)
-                    return ret_dict
+                    db = orm.get_sqa_db()
+                    pk_value = getattr(self, primary_key)
+                    with orm._session_guard(db):
+                        try:
+                            db.delete(_attach(db, self))
+                            orm._commit(db)
+                            del self
+                        except Exception:
+                            orm._rollback(db)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate(pk_value)
 
                 @classmethod
-                def auto_insert(
-                    cls: Type[T],
-                    data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
-                    **kwargs,
-                ) -> T:
-                    """自动插入行 (不存在则新增)
+                def update_where(
+                    cls,
+                    conditions: Dict[Union[str, InstrumentedAttribute], Any],
+                    values: Dict[Union[str, InstrumentedAttribute], Any],
+                    convert_json: bool = True,
+                ) -> int:
+                    """按条件批量更新行 (单条 UPDATE ... WHERE 语句)
 
                     Args:
-                    :param kwargs: 行数据
+                    :param conditions: 筛选条件 (不允许为空)
+                    :param values: 更新的字段值
+                    :param convert_json: 是否将字典 / 列表值序列化为 JSON 字符串
 
                     Returns:
-                    :return: 行对象
+                    :return: 受影响的行数
                     """
 
-                    merged_data = _merge_dict(data, kwargs, cls, convert_json=True)
-                    if primary_key in merged_data:
-                        item = cls.get_by_pk(merged_data[primary_key])
-                        if item:
-                            return item.update(**merged_data)
-                    return cls.add(**merged_data)
+                    stmt = _build_update(cls, conditions, values, convert_json)
+                    db = orm.get_sqa_db()
+                    with orm._session_guard(db):
+                        try:
+                            res = db.execute(stmt)
+                            orm._commit(db)
+                        except Exception:
+                            orm._rollback(db)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate_all()
+                    return res.rowcount  # type: ignore
 
                 @classmethod
-                def auto_insert_by_field(
-                    cls: Type[T],
-                    field: InstrumentedAttribute,
-                    value: str,
-                    data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+                def delete_where(
+                    cls,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
                     convert_json: bool = True,
-                    **kwargs,
-                ) -> T:
-                    """根据字段自动插入行 (不存在则新增)
+                    **kwarg,
+                ) -> int:
+                    """按条件批量删除行 (单条 DELETE ... WHERE 语句)
+
+                    Args:
+                    :param conditions: 筛选条件 (不允许为空)
+
+                    Returns:
+                    :return: 受影响的行数
+                    """
+
+                    stmt = _build_delete(cls, conditions, kwarg, convert_json)
+                    db = orm.get_sqa_db()
+                    with orm._session_guard(db):
+                        try:
+                            res = db.execute(stmt)
+                            orm._commit(db)
+                        except Exception:
+                            orm._rollback(db)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate_all()
+                    return res.rowcount  # type: ignore
+
+                @classmethod
+                def count(
+                    cls,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> int:
+                    """统计满足条件的行数 (SELECT COUNT(*), 条件处理同 filter)
+
+                    Args:
+                    :param conditions: 筛选条件
+                    :param convert_json: 是否将字典 / 列表值序列化为 JSON 字符串
+                    :param kwarg: 筛选条件
+
+                    Returns:
+                    :return: 行数
+                    """
+
+                    stmt, params = _prepare_count(
+                        cls,
+                        merge_conditions(conditions, kwarg),
+                        convert_json,
+                        exists=False,
+                    )
+                    with orm.use_read_session() as db:
+                        return db.execute(stmt, params).scalar_one()
+
+                @classmethod
+                def exists(
+                    cls,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> bool:
+                    """判断是否存在满足条件的行 (SELECT 1 ... LIMIT 1, 条件处理同 filter)
+
+                    Args:
+                    :param conditions: 筛选条件
+                    :param convert_json: 是否将字典 / 列表值序列化为 JSON 字符串
+                    :param kwarg: 筛选条件
+
+                    Returns:
+                    :return: 是否存在
+                    """
+
+                    stmt, params = _prepare_count(
+                        cls,
+                        merge_conditions(conditions, kwarg),
+                        convert_json,
+                        exists=True,
+                    )
+                    with orm.use_read_session() as db:
+                        return db.execute(stmt, params).first() is not None
+
+                @classmethod
+                def aggregate(
+                    cls,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    group_by: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+                    sum: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+                    avg: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+                    min: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+                    max: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+                    count: bool = False,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> List[Dict[str, Any]]:
+                    """按条件分组聚合 (单条 SELECT ... GROUP BY 语句, 条件处理同 filter)
+
+                    Args:
+                    :param conditions: 筛选条件
+                    :param group_by: 分组字段
+                    :param sum: 求和字段 (结果键为 sum_<字段名>)
+                    :param avg: 求平均值字段 (结果键为 avg_<字段名>)
+                    :param min: 求最小值字段 (结果键为 min_<字段名>)
+                    :param max: 求最大值字段 (结果键为 max_<字段名>)
+                    :param count: 是否统计各分组行数 (结果键为 count)
+                    :param convert_json: 是否将字典 / 列表值序列化为 JSON 字符串
+                    :param kwarg: 筛选条件
+
+                    Returns:
+                    :return: 各分组的结果字典列表 (按分组字段排序, 无分组字段时为单个元素)
+                    """
+
+                    stmt = _build_aggregate(
+                        cls,
+                        merge_conditions(conditions, kwarg),
+                        group_by,
+                        {"sum": sum, "avg": avg, "min": min, "max": max},
+                        count,
+                        convert_json,
+                    )
+                    with orm.use_read_session() as db:
+                        return [dict(row) for row in db.execute(stmt).mappings()]
+
+                def to_dict(
+                    self,
+                    fields: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+                    decode_json: bool = True,
+                ) -> Dict[str, Any]:
+                    """转换为字典 (包含所有列, 未加载的列在访问时加载)
+
+                    Args:
+                    :param fields: 转换的字段 (默认全部列)
+                    :param decode_json: 是否解码 JSON 列中尚未解码的 JSON 文本
+
+                    Returns:
+                    :return: 行数据字典
+                    """
+
+                    return _serializer(type(self), _field_names(fields), decode_json)(
+                        self,
+                    )
+
+                @classmethod
+                def to_dicts(
+                    cls: Type[T],
+                    rows: Iterable[T],
+                    fields: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+                    decode_json: bool = True,
+                ) -> List[Dict[str, Any]]:
+                    """批量转换为字典
+
+                    Args:
+                    :param rows: 行对象列表
+                    :param fields: 转换的字段 (默认全部列)
+                    :param decode_json: 是否解码 JSON 列中尚未解码的 JSON 文本
+
+                    Returns:
+                    :return: 行数据字典列表
+                    """
+
+                    serialize = _serializer(cls, _field_names(fields), decode_json)
+                    return [serialize(row) for row in rows]
+
+                @classmethod
+                def to_json(
+                    cls: Type[T],
+                    rows: Iterable[T],
+                    fields: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+                ) -> bytes:
+                    """批量序列化为 JSON 字节串 (优先使用 orjson, 其次 ujson)
+
+                    Args:
+                    :param rows: 行对象列表
+                    :param fields: 序列化的字段 (默认全部列)
+
+                    Returns:
+                    :return: UTF-8 JSON 字节串 (行数据字典数组)
+                    """
+
+                    return json_dumps_bytes(cls.to_dicts(rows, fields))
+
+                @classmethod
+                def auto_insert(
+                    cls: Type[T],
+                    data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+                    **kwargs,
+                ) -> T:
+                    """自动插入行 (不存在则新增)
+
+                    Args:
+                    :param kwargs: 行数据
+
+                    Returns:
+                    :return: 行对象
+                    """
+
+                    merged_data = _merge_dict(data, kwargs, cls, convert_json=True)
+                    if primary_key in merged_data:
+                        item = cls.get_by_pk(merged_data[primary_key])
+                        if item:
+                            return item.update(**merged_data)
+                    return cls.add(**merged_data)
+
+                @classmethod
+                def auto_insert_by_field(
+                    cls: Type[T],
+                    field: InstrumentedAttribute,
+                    value: str,
+                    data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+                    convert_json: bool = True,
+                    **kwargs,
+                ) -> T:
+                    """根据字段自动插入行 (不存在则新增)
+
+                    Args:
+                    :param field: 字段名
+                    :param value: 字段值
+                    :param kwargs: 行数据
+
+                    Returns:
+                    :return: 行对象
+                    """
+
+                    merged_data = _merge_dict(
+                        data,
+                        kwargs,
+                        cls,
+                        convert_json=convert_json,
+                    )
+                    item = cls.get_by_field(field, value)
+                    if item:
+                        return item.update(**merged_data)
+                    return cls.add(**merged_data)
+
+                @classmethod
+                def sqa_query(cls: Type[T]) -> Query[T]:
+                    """获取 SQLAlchemy 查询对象0
+
+                    Returns:
+                    :return: SQLAlchemy 查询对象
+
+                    Examples:
+                    >>> 基础分页查询: query = ModelClass.sqa_query().filter(ModelClass.id > 0).order_by(ModelClass.id.desc()).limit(10)
+                    """
+                    return orm.get_sqa_db().query(cls)
+
+                @classmethod
+                def cache_stats(cls) -> Dict[str, Any]:
+                    """获取行缓存统计信息
+
+                    Returns:
+                    :return: 命中数 / 未命中数 / 命中率 / 缓存条目数 (未启用缓存时返回空字典)
+                    """
+                    return model_cache.stats() if model_cache is not None else {}
+
+                @classmethod
+                def cache_clear(cls) -> None:
+                    """清空行缓存"""
+                    if model_cache is not None:
+                        model_cache.clear()
+
+                @classmethod
+                def buffered(
+                    cls,
+                    max_size: int = 500,
+                    flush_interval: float = 1.0,
+                    max_pending: int = 10000,
+                    put_timeout: Optional[float] = None,
+                    on_error: Optional[
+                        Callable[[BaseException, List[Dict[str, Any]]], Any]
+                    ] = None,
+                ) -> WriteBuffer:
+                    """获取模型的写入缓冲队列 (首次调用时创建, 之后返回同一队列并忽略参数)
+
+                    写入方调用 `put()` / `aput()` 后立即返回, 后台线程在缓冲达到 max_size 行或每隔 flush_interval 秒
+                    通过独立连接批量插入, 关闭数据库连接或进程退出时写入剩余数据
+
+                    Args:
+                    :param max_size: 触发写入的缓冲行数
+                    :param flush_interval: 触发写入的时间间隔 (秒)
+                    :param max_pending: 缓冲区最大行数, 超过时写入方阻塞等待 (背压)
+                    :param put_timeout: 缓冲区已满时的最长等待时间 (秒), 超时抛出 TimeoutError
+                    :param on_error: 后台写入失败回调, 未设置时异常在下一次 `flush()` / `close()` 时抛出
+
+                    Returns:
+                    :return: 写入缓冲队列
+                    """
+
+                    buffer = orm._write_buffers.get(cls)
+                    if buffer is not None:
+                        return buffer
+                    table = cls.__table__  # type: ignore
+
+                    def write_rows(rows: List[Dict[str, Any]]) -> None:
+                        with orm._engine.begin() as conn:
+                            for group in _group_by_keys(rows):
+                                conn.execute(insert(table), _column_rows(cls, group))
+                        _invalidate_rows(model_cache, rows, primary_key)
+
+                    buffer = orm._write_buffers.setdefault(
+                        cls,
+                        WriteBuffer(
+                            write_rows,
+                            prepare=lambda data, kwarg: _merge_dict(data, kwarg, cls),
+                            max_size=max_size,
+                            flush_interval=flush_interval,
+                            max_pending=max_pending,
+                            put_timeout=put_timeout,
+                            on_error=on_error,
+                        ),
+                    )
+                    atexit.register(buffer.close)
+                    return buffer
+
+                @classmethod
+                async def aadd(
+                    cls: Type[T],
+                    data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> T:
+                    """新增行 (异步)
+
+                    Args:
+                    :param kwarg: 行数据
+
+                    Returns:
+                    :return: 行对象
+                    """
+
+                    model_data = cls(
+                        **_merge_dict(
+                            data,
+                            kwarg,
+                            cls,
+                            convert_json=convert_json,
+                        ),
+                    )
+                    async with orm.use_async_session() as adb:
+                        try:
+                            adb.add(model_data)
+                            await orm._acommit(adb)
+                        except Exception:
+                            await orm._arollback(adb)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate(getattr(model_data, primary_key))
+
+                    return model_data
+
+                @classmethod
+                async def abatch_add(
+                    cls,
+                    data_list: Iterable[Dict[str, Any]],
+                    batch_size: int = 5000,
+                    commit_per_batch: bool = False,
+                    on_progress: Optional[Callable[[int], Any]] = None,
+                ) -> int:
+                    """批量新增行 (异步, 暂不支持更新)
+
+                    Args:
+                    :param data_list: 行数据可迭代对象 (支持生成器)
+                    :param batch_size: 每批次写入的行数
+                    :param commit_per_batch: 是否每批次提交一次 (默认全部写入后统一提交)
+                    :param on_progress: 进度回调, 每批次写入后以累计行数调用
+
+                    Returns:
+                    :return: 写入的行数
+                    """
+
+                    table = cls.__table__  # type: ignore
+                    count = 0
+                    async with orm.use_async_session() as adb:
+                        try:
+                            for chunk in _iter_insert_batches(
+                                data_list,
+                                batch_size,
+                                cls.__mio_columns__.json_columns,
+                            ):
+                                for rows in _group_by_keys(chunk):
+                                    await adb.execute(
+                                        insert(table),
+                                        _column_rows(cls, rows),
+                                    )
+                                if commit_per_batch:
+                                    await orm._acommit(adb)
+                                _invalidate_rows(model_cache, chunk, primary_key)
+                                count += len(chunk)
+                                if on_progress:
+                                    on_progress(count)
+                            await orm._acommit(adb)
+                        except Exception:
+                            await orm._arollback(adb)
+                            raise
+                    return count
+
+                @classmethod
+                async def abatch_upsert(
+                    cls,
+                    data_list: List[Dict[str, Any]],
+                    conflict_keys: Optional[
+                        List[Union[str, InstrumentedAttribute]]
+                    ] = None,
+                    update_fields: Optional[
+                        List[Union[str, InstrumentedAttribute]]
+                    ] = None,
+                    batch_size: int = 1000,
+                ) -> int:
+                    """批量插入或更新行 (异步)
+
+                    Args:
+                    :param data_list: 行数据列表 (各行字段需一致)
+                    :param conflict_keys: 冲突判定字段 (默认主键)
+                    :param update_fields: 冲突时更新的字段 (默认除冲突字段外的所有传入字段)
+                    :param batch_size: 每条语句最多包含的行数
+
+                    Returns:
+                    :return: 处理的行数
+                    """
+
+                    async with orm.use_async_session() as adb:
+                        try:
+                            for stmt in orm._iter_upsert_statements(
+                                cls.__table__,  # type: ignore
+                                data_list,
+                                conflict_keys or [primary_key],
+                                update_fields,
+                                batch_size,
+                                cls.__mio_columns__.json_columns,
+                                cls.__mio_columns__.column_keys,
+                            ):
+                                await adb.execute(stmt)
+                            await orm._acommit(adb)
+                        except Exception:
+                            await orm._arollback(adb)
+                            raise
+                    _invalidate_rows(model_cache, data_list, primary_key, strict=True)
+                    return len(data_list)
+
+                @classmethod
+                async def aget_by_pk(
+                    cls,
+                    pk_value: Any,
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                ):
+                    """根据主键查询行 (异步)
+
+                    Args:
+                    :param pk_value: 行主键值
+
+                    Returns:
+                    :return: 行对象 (不存在则返回 None)
+                    """
+
+                    use_cache = model_cache is not None and not fields
+                    stmt, params = _prepare_select(
+                        cls,
+                        {primary_key: pk_value},
+                        fields,
+                    )
+                    async with orm.use_async_read_session() as adb:
+                        if use_cache:
+                            row = model_cache.get_row(pk_value)  # type: ignore
+                            if row is not None:
+                                return await _amerge_snapshot(adb, cls, row)
+                        res = await adb.execute(stmt, params)
+                        if fields:
+                            return res.first()
+                        item = res.scalars().first()
+                    if use_cache and item is not None:
+                        model_cache.set_row(pk_value, _row_snapshot(item))  # type: ignore
+                    return item
+
+                @classmethod
+                async def aget_many_by_pk(
+                    cls: Type[T],
+                    pk_values: Iterable[Any],
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    chunk_size: Optional[int] = None,
+                ) -> Dict[Any, T]:
+                    """根据主键批量查询行 (异步)
+
+                    Args:
+                    :param pk_values: 主键值列表
+                    :param fields: 额外返回字段
+                    :param chunk_size: 每批次查询的主键数量 (默认取数据库绑定参数上限)
+
+                    Returns:
+                    :return: 以主键为键的行对象字典 (不存在的主键不包含在结果中)
+                    """
+
+                    result: Dict[Any, T] = {}
+                    pending = list(dict.fromkeys(pk_values))
+                    async with orm.use_async_read_session() as adb:
+                        if model_cache is not None and not fields:
+                            missing = []
+                            for pk_value in pending:
+                                row = model_cache.get_row(pk_value)
+                                if row is None:
+                                    missing.append(pk_value)
+                                else:
+                                    result[pk_value] = await _amerge_snapshot(adb, cls, row)
+                            pending = missing
+
+                        for chunk in _chunked(
+                            pending,
+                            chunk_size or orm._max_bind_params(),
+                        ):
+                            stmt, params = _prepare_select(
+                                cls,
+                                {f"{primary_key}__in": chunk},
+                                fields,
+                            )
+                            res = await adb.execute(stmt, params)
+                            for item in res.all() if fields else res.scalars().all():
+                                entity = item[0] if fields else item
+                                result[getattr(entity, primary_key)] = item
+                                if model_cache is not None and not fields:
+                                    model_cache.set_row(
+                                        getattr(entity, primary_key),
+                                        _row_snapshot(entity),
+                                    )
+                    return result
+
+                @classmethod
+                async def aget_by_field(
+                    cls: Type[T],
+                    field: InstrumentedAttribute,
+                    value: str,
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    allow_multiple=False,
+                ) -> Optional[T]:
+                    """根据字段查询行 (异步)"""
+
+                    use_cache = model_cache is not None and not fields
+                    stmt, params = _prepare_select(
+                        cls,
+                        {field.key: value},
+                        fields,
+                        limit=2,
+                    )
+                    async with orm.use_async_read_session() as adb:
+                        if use_cache:
+                            row = model_cache.get_row_by_field(field.key, value)  # type: ignore
+                            if row is not None:
+                                return await _amerge_snapshot(adb, cls, row)
+                        res = await adb.execute(stmt, params)
+                        rows = res.all() if fields else res.scalars().all()
+                    if not allow_multiple and len(rows) > 1:
+                        raise ValueError(f"Multiple results found for {field}: {value}")
+                    if use_cache and len(rows) == 1:
+                        model_cache.set_row(  # type: ignore
+                            getattr(rows[0], primary_key),
+                            _row_snapshot(rows[0]),
+                            field=field.key,
+                        )
+                    return rows[0] if rows else None  # type: ignore
+
+                @classmethod
+                async def afilter(
+                    cls: Type[T],
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    order_by: Optional[List[UnaryExpression]] = None,
+                    limit: Optional[int] = None,
+                    offset: Optional[int] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> List[T]:
+                    """筛选数据行 (异步)"""
+
+                    merged_conditions = merge_conditions(conditions, kwarg)
+                    stmt, params = _prepare_select(
+                        cls,
+                        merged_conditions,
+                        fields,
+                        convert_json=convert_json,
+                        order_by=order_by,
+                        limit=limit,
+                        offset=offset,
+                    )
+                    async with orm.use_async_read_session() as adb:
+                        res = await adb.execute(stmt, params)
+                        return list(res.all() if fields else res.scalars().all())
+
+                @classmethod
+                async def afilter_to_dict(
+                    cls: Type[T],
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    order_by: Optional[List[UnaryExpression]] = None,
+                    limit: Optional[int] = None,
+                    offset: Optional[int] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> List[Dict[str, Any]]:
+                    """筛选数据行 (异步)"""
+
+                    merged_conditions = merge_conditions(conditions, kwarg)
+                    stmt, params = _prepare_select(
+                        cls,
+                        merged_conditions,
+                        fields,
+                        convert_json=convert_json,
+                        order_by=order_by,
+                        limit=limit,
+                        offset=offset,
+                        columns_only=True,
+                    )
+                    async with orm.use_async_read_session() as adb:
+                        res = await adb.execute(stmt, params)
+                        rows = [dict(row) for row in res.mappings()]
+                    return _decode_json_rows(cls, rows)
+
+                @classmethod
+                async def aget_all(
+                    cls: Type[T],
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                ) -> List[T]:
+                    """查询所有行 (异步)"""
+
+                    stmt, params = _prepare_select(cls, {}, fields)
+                    async with orm.use_async_read_session() as adb:
+                        res = await adb.execute(stmt, params)
+                        return list(res.all() if fields else res.scalars().all())
+
+                @classmethod
+                async def aiter_filter(
+                    cls: Type[T],
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    order_by: Optional[List[UnaryExpression]] = None,
+                    limit: Optional[int] = None,
+                    offset: Optional[int] = None,
+                    convert_json: bool = True,
+                    batch_size: int = 1000,
+                    **kwarg,
+                ) -> AsyncGenerator[T, None]:
+                    """流式筛选数据行 (异步)
+
+                    Args:
+                    :param batch_size: 每批次拉取的行数
+
+                    Returns:
+                    :return: 数据行异步生成器
+                    """
+
+                    merged_conditions = merge_conditions(conditions, kwarg)
+                    stmt, params = _prepare_select(
+                        cls,
+                        merged_conditions,
+                        fields,
+                        convert_json=convert_json,
+                        order_by=order_by,
+                        limit=limit,
+                        offset=offset,
+                    )
+                    async with orm.use_async_read_session() as adb:
+                        res = await adb.stream(
+                            stmt,
+                            params,
+                            execution_options={"yield_per": batch_size},
+                        )
+                        try:
+                            async for row in res if fields else res.scalars():
+                                yield row
+                        finally:
+                            await res.close()
+
+                @classmethod
+                def aiter_all(
+                    cls: Type[T],
+                    fields: Optional[List[InstrumentedAttribute]] = None,
+                    batch_size: int = 1000,
+                ) -> AsyncIterator[T]:
+                    """流式查询所有行 (异步)
+
+                    Args:
+                    :param batch_size: 每批次拉取的行数
+
+                    Returns:
+                    :return: 数据行异步生成器
+                    """
+
+                    return cls.aiter_filter(fields=fields, batch_size=batch_size)
+
+                @classmethod
+                async def apaginate_after(
+                    cls: Type[T],
+                    cursor: Optional[str] = None,
+                    order_by: Optional[
+                        List[Union[InstrumentedAttribute, UnaryExpression]]
+                    ] = None,
+                    page_size: int = 20,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> Tuple[List[T], Optional[str]]:
+                    """游标 (Keyset) 分页查询 (异步)
+
+                    Args:
+                    :param cursor: 上一页返回的游标 (为空则查询第一页)
+                    :param order_by: 排序字段 (支持 asc / desc, 自动追加主键保证顺序唯一)
+                    :param page_size: 每页行数
+                    :param conditions: 筛选条件
+
+                    Returns:
+                    :return: (当前页数据行, 下一页游标 (无下一页则为 None))
+                    """
+
+                    merged_conditions = merge_conditions(conditions, kwarg)
+                    stmt, order_cols = _build_keyset_select(
+                        cls,
+                        merged_conditions,
+                        cursor,
+                        order_by,
+                        page_size,
+                        primary_key,
+                        convert_json=convert_json,
+                        nulls_low=orm._database_type not in _NULLS_LAST_DATABASES,
+                    )
+                    async with orm.use_async_read_session() as adb:
+                        res = await adb.execute(stmt)
+                        rows = list(res.scalars().all())
+                    return _keyset_page(rows, order_cols, page_size)
+
+                async def aupdate(
+                    self,
+                    data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ):
+                    """更新行 (异步)"""
+
+                    merged_data = _merge_dict(
+                        data,
+                        kwarg,
+                        cls,
+                        convert_json=convert_json,
+                    )
+                    pk_value = getattr(self, primary_key)
+                    async with orm.use_async_session() as adb:
+                        try:
+                            for k, v in merged_data.items():
+                                setattr(self, k, v)
+                            await _aattach(adb, self)
+                            await orm._acommit(adb)
+                        except Exception:
+                            await orm._arollback(adb)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate(pk_value)
+                    return self
+
+                async def adelete(self) -> None:
+                    """删除行 (异步)"""
+
+                    pk_value = getattr(self, primary_key)
+                    async with orm.use_async_session() as adb:
+                        try:
+                            await adb.delete(await _aattach(adb, self))
+                            await orm._acommit(adb)
+                        except Exception:
+                            await orm._arollback(adb)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate(pk_value)
+
+                @classmethod
+                async def aupdate_where(
+                    cls,
+                    conditions: Dict[Union[str, InstrumentedAttribute], Any],
+                    values: Dict[Union[str, InstrumentedAttribute], Any],
+                    convert_json: bool = True,
+                ) -> int:
+                    """按条件批量更新行 (异步)
+
+                    Args:
+                    :param conditions: 筛选条件 (不允许为空)
+                    :param values: 更新的字段值
+                    :param convert_json: 是否将字典 / 列表值序列化为 JSON 字符串
+
+                    Returns:
+                    :return: 受影响的行数
+                    """
+
+                    stmt = _build_update(cls, conditions, values, convert_json)
+                    async with orm.use_async_session() as adb:
+                        try:
+                            res = await adb.execute(stmt)
+                            await orm._acommit(adb)
+                        except Exception:
+                            await orm._arollback(adb)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate_all()
+                    return res.rowcount  # type: ignore
+
+                @classmethod
+                async def adelete_where(
+                    cls,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> int:
+                    """按条件批量删除行 (异步)
+
+                    Args:
+                    :param conditions: 筛选条件 (不允许为空)
+
+                    Returns:
+                    :return: 受影响的行数
+                    """
+
+                    stmt = _build_delete(cls, conditions, kwarg, convert_json)
+                    async with orm.use_async_session() as adb:
+                        try:
+                            res = await adb.execute(stmt)
+                            await orm._acommit(adb)
+                        except Exception:
+                            await orm._arollback(adb)
+                            raise
+                    if model_cache is not None:
+                        model_cache.invalidate_all()
+                    return res.rowcount  # type: ignore
+
+                @classmethod
+                async def acount(
+                    cls,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> int:
+                    """统计满足条件的行数 (异步)
+
+                    Args:
+                    :param conditions: 筛选条件
+                    :param convert_json: 是否将字典 / 列表值序列化为 JSON 字符串
+                    :param kwarg: 筛选条件
+
+                    Returns:
+                    :return: 行数
+                    """
+
+                    stmt, params = _prepare_count(
+                        cls,
+                        merge_conditions(conditions, kwarg),
+                        convert_json,
+                        exists=False,
+                    )
+                    async with orm.use_async_read_session() as adb:
+                        return (await adb.execute(stmt, params)).scalar_one()
+
+                @classmethod
+                async def aexists(
+                    cls,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> bool:
+                    """判断是否存在满足条件的行 (异步)
+
+                    Args:
+                    :param conditions: 筛选条件
+                    :param convert_json: 是否将字典 / 列表值序列化为 JSON 字符串
+                    :param kwarg: 筛选条件
+
+                    Returns:
+                    :return: 是否存在
+                    """
+
+                    stmt, params = _prepare_count(
+                        cls,
+                        merge_conditions(conditions, kwarg),
+                        convert_json,
+                        exists=True,
+                    )
+                    async with orm.use_async_read_session() as adb:
+                        return (await adb.execute(stmt, params)).first() is not None
+
+                @classmethod
+                async def aaggregate(
+                    cls,
+                    conditions: Optional[
+                        Dict[Union[str, InstrumentedAttribute], Any]
+                    ] = None,
+                    group_by: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+                    sum: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+                    avg: Optional[List[Union[str, InstrumentedAttribute]]] = None,
+                    min: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+                    max: Optional[List[Union[str, InstrumentedAttribute]]] = None,  # noqa: A002
+                    count: bool = False,
+                    convert_json: bool = True,
+                    **kwarg,
+                ) -> List[Dict[str, Any]]:
+                    """按条件分组聚合 (异步)
+
+                    Args:
+                    :param conditions: 筛选条件
+                    :param group_by: 分组字段
+                    :param sum: 求和字段 (结果键为 sum_<字段名>)
+                    :param avg: 求平均值字段 (结果键为 avg_<字段名>)
+                    :param min: 求最小值字段 (结果键为 min_<字段名>)
+                    :param max: 求最大值字段 (结果键为 max_<字段名>)
+                    :param count: 是否统计各分组行数 (结果键为 count)
+                    :param convert_json: 是否将字典 / 列表值序列化为 JSON 字符串
+                    :param kwarg: 筛选条件
+
+                    Returns:
+                    :return: 各分组的结果字典列表 (按分组字段排序, 无分组字段时为单个元素)
+                    """
+
+                    stmt = _build_aggregate(
+                        cls,
+                        merge_conditions(conditions, kwarg),
+                        group_by,
+                        {"sum": sum, "avg": avg, "min": min, "max": max},
+                        count,
+                        convert_json,
+                    )
+                    async with orm.use_async_read_session() as adb:
+                        return [dict(row) for row in (await adb.execute(stmt)).mappings()]
+
+                @classmethod
+                async def aauto_insert(
+                    cls: Type[T],
+                    data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+                    **kwargs,
+                ) -> T:
+                    """自动插入行 (异步, 不存在则新增)
+
+                    Args:
+                    :param kwargs: 行数据
+
+                    Returns:
+                    :return: 行对象
+                    """
+
+                    merged_data = _merge_dict(data, kwargs, cls, convert_json=True)
+                    if primary_key in merged_data:
+                        item = await cls.aget_by_pk(merged_data[primary_key])
+                        if item:
+                            return await item.aupdate(**merged_data)
+                    return await cls.aadd(**merged_data)
+
+                @classmethod
+                async def aauto_insert_by_field(
+                    cls: Type[T],
+                    field: InstrumentedAttribute,
+                    value: str,
+                    data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+                    convert_json: bool = True,
+                    **kwargs,
+                ) -> T:
+                    """根据字段自动插入行 (异步, 不存在则新增)
 
                     Args:
                     :param field: 字段名
@@ -498,23 +3051,34 @@ class MioOrm:
                         cls,
                         convert_json=convert_json,
                     )
-                    item = cls.get_by_field(field, value)
+                    item = await cls.aget_by_field(field, value)
                     if item:
-                        return item.update(**merged_data)
-                    return cls.add(**merged_data)
-
-                @classmethod
-                def sqa_query(cls: Type[T]) -> Query[T]:
-                    """获取 SQLAlchemy 查询对象0
-
-                    Returns:
-                    :return: SQLAlchemy 查询对象
-
-                    Examples:
-                    >>> 基础分页查询: query = ModelClass.sqa_query().filter(ModelClass.id > 0).order_by(ModelClass.id.desc()).limit(10)
-                    """
-                    return db.query(cls)
-
+                        return await item.aupdate(**merged_data)
+                    return await cls.aadd(**merged_data)
+
+            ModelClass.__mio_columns__ = build_model_columns(ModelClass)
+            ModelClass.__mio_advisor__ = orm._advisor
+            install_lazy_json(ModelClass, ModelClass.__mio_columns__.json_columns)
+            if orm._metrics is not None or orm._profiler is not None:
+                for name in INSTRUMENTED_METHODS:
+                    method = ModelClass.__dict__.get(name)
+                    if isinstance(method, classmethod):
+                        method = classmethod(
+                            instrument_method(
+                                method.__func__,
+                                f"{cls.__name__}.{name}",
+                                orm._metrics,
+                            ),
+                        )
+                    elif method is not None:
+                        method = instrument_method(
+                            method,
+                            f"{cls.__name__}.{name}",
+                            orm._metrics,
+                        )
+                    else:
+                        continue
+                    setattr(ModelClass, name, method)
             return ModelClass
 
         return modal_class_wrapper
@@ -528,47 +3092,759 @@ def _merge_dict(
 ) -> Dict[str, Any]:
     """合并字典
 
+    字段校验使用注册时预计算的字段元数据, 非列属性回退为逐个检查
+
     Args:
     :param base_dict: 基础字典
     :param new_dict: 新字典
     :param model_class: 数据模型类
-    :param convert_json: 是否将字典中的 Python 对象转换为 JSON 字符串
+    :param convert_json: 是否将字典中的 Python 对象转换为 JSON 字符串 (原生 JSON 列除外)
 
     Returns:
     :return: 合并后的字典
     """
 
-    base_dict = base_dict or {}
-    new_dict = new_dict or {}
+    columns: Optional[ModelColumns] = getattr(model_class, "__mio_columns__", None)
+    attrs = columns.attrs if columns else {}
+    names = columns.names if columns else frozenset()
+    json_columns = columns.json_columns if columns else frozenset()
 
-    d1: Dict[str, Any] = {}
-    d2: Dict[str, Any] = {}
+    merged: Dict[str, Any] = {}
+    for d in (base_dict, new_dict):
+        if d:
+            for key, value in d.items():
+                if not isinstance(key, str):
+                    key = attrs.get(key) or key.key
+                merged[key] = value
 
-    for key in base_dict:
-        if isinstance(key, InstrumentedAttribute):
-            key_str: str = key.key
-            d1[key_str] = base_dict[key]
-        else:
-            d1[key] = base_dict[key]
+    for key, value in merged.items():
+        if key not in names:
+            if not hasattr(model_class, key):
+                raise ValueError(f"Invalid field: {key}")
+            if isinstance(getattr(model_class, key), Callable):
+                raise TypeError(f"Invalid field: {key} is a function")
+        if isinstance(value, (dict, list)) and key not in json_columns:
+            if not convert_json:
+                raise ValueError(f"Invalid value type: {type(value)}")
+            merged[key] = json_dumps(value)
 
-    for key in new_dict:
-        if isinstance(key, InstrumentedAttribute):
-            key_str = key.key
-            d2[key_str] = new_dict[key]
-        else:
-            d2[key] = new_dict[key]
+    return merged
+
+
+def _field_name(field: Union[str, InstrumentedAttribute]) -> str:
+    """获取字段名"""
+    return field.key if isinstance(field, InstrumentedAttribute) else field
+
+
+def _field_names(
+    fields: Optional[List[Union[str, InstrumentedAttribute]]],
+) -> Optional[Tuple[str, ...]]:
+    """获取字段名元组 (用作序列化函数缓存键)"""
+    return None if fields is None else tuple(_field_name(field) for field in fields)
+
+
+@lru_cache(maxsize=256)
+def _serializer(
+    model_class: Type[MioModel],
+    fields: Optional[Tuple[str, ...]],
+    decode: bool,
+) -> Callable[[Any], Dict[str, Any]]:
+    """获取数据模型的行对象序列化函数 (按模型类, 字段与是否解码 JSON 缓存)"""
+    return build_serializer(model_class.__mio_columns__, fields, decode)
+
+
+def _convert_json_values(
+    data: Dict[str, Any],
+    json_columns: Collection[str] = (),
+) -> Dict[str, Any]:
+    """将行数据中的字典 / 列表值序列化为 JSON 字符串 (返回新字典, JSON 类型列除外)"""
+    converted: Dict[str, Any] = {}
+    for k, v in data.items():
+        key = _field_name(k)
+        if isinstance(v, (dict, list)) and key not in json_columns:
+            v = json_dumps(v)
+        converted[key] = v
+    return converted
+
+
+def _decode_json_rows(
+    model_class: Type[MioModel],
+    rows: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """解码行数据字典中尚未解码的 JSON 文本 (原地修改)"""
+
+    json_columns = model_class.__mio_columns__.json_columns
+    if json_columns:
+        for row in rows:
+            for key in json_columns.intersection(row):
+                row[key] = decode_json(row[key])
+    return rows
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """将可迭代对象按固定大小分批"""
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _attach(db: Session, obj: T) -> T:
+    """将游离态行对象挂载到会话 (会话中已有相同标识的实例时合并到该实例)
+
+    Args:
+    :param db: 数据库会话
+    :param obj: 行对象 (例如从只读副本或已关闭的会话中读取)
+
+    Returns:
+    :return: 会话中的行对象
+    """
+    if object_session(obj) is not None:
+        return obj
+    key = sqa_inspect(obj).key
+    if key is not None and key in db.identity_map:
+        return db.merge(obj)
+    db.add(obj)
+    return obj
+
+
+async def _aattach(adb: AsyncSession, obj: T) -> T:
+    """将游离态行对象挂载到异步会话 (会话中已有相同标识的实例时合并到该实例)"""
+    if object_session(obj) is adb.sync_session:
+        return obj
+    key = sqa_inspect(obj).key
+    if key is not None and key in adb.identity_map:
+        return await adb.merge(obj)
+    adb.add(obj)
+    return obj
+
+
+def _row_snapshot(obj: Any) -> Dict[str, Any]:
+    """获取行对象的列数据快照 (用于缓存)"""
+    return {key: getattr(obj, key) for key in type(obj).__mio_columns__.columns}
+
+
+def _load_snapshot(model_class: Type[T], row: Dict[str, Any]) -> T:
+    """根据列数据快照构建游离态行对象 (可通过 Session.merge(load=False) 免查询挂载)"""
+    obj = model_class(**row)
+    make_transient_to_detached(obj)
+    return obj
+
+
+def _merge_snapshot(db: Session, model_class: Type[T], row: Dict[str, Any]) -> T:
+    """将缓存的列数据快照免查询挂载到会话
+
+    会话中已有相同标识的实例时直接返回该实例, 不以快照覆盖其尚未刷新的修改
+    """
+    obj = _load_snapshot(model_class, row)
+    existing = db.identity_map.get(sqa_inspect(obj).key)
+    if existing is not None:
+        return existing
+    return db.merge(obj, load=False)
+
+
+async def _amerge_snapshot(
+    adb: AsyncSession,
+    model_class: Type[T],
+    row: Dict[str, Any],
+) -> T:
+    """将缓存的列数据快照免查询挂载到异步会话 (会话中已有相同标识的实例时直接返回该实例)"""
+    obj = _load_snapshot(model_class, row)
+    existing = adb.identity_map.get(sqa_inspect(obj).key)
+    if existing is not None:
+        return existing
+    return await adb.merge(obj, load=False)
+
+
+def _invalidate_rows(
+    model_cache: Optional[ModelCache],
+    rows: Iterable[Dict[str, Any]],
+    primary_key: str,
+    strict: bool = False,
+) -> None:
+    """使写入行对应的缓存失效
+
+    Args:
+    :param model_cache: 行缓存
+    :param rows: 写入的行数据
+    :param primary_key: 主键字段名
+    :param strict: 行数据缺少主键时是否使所有缓存失效 (写入可能更新已有行时使用)
+    """
+
+    if model_cache is None:
+        return
+    for row in rows:
+        pk_value = row.get(primary_key)
+        if pk_value is not None:
+            model_cache.invalidate(pk_value)
+        elif strict:
+            model_cache.invalidate_all()
+            return
+
+
+def _iter_insert_batches(
+    data_list: Iterable[Dict[str, Any]],
+    batch_size: int,
+    json_columns: Collection[str] = (),
+) -> Iterator[List[Dict[str, Any]]]:
+    """流式序列化行数据并按批次分组
+
+    Args:
+    :param data_list: 行数据可迭代对象
+    :param batch_size: 每批次行数
+    :param json_columns: JSON 类型列 (值由列类型负责序列化)
+
+    Returns:
+    :return: 批次迭代器
+    """
+
+    if batch_size < 1:
+        raise ValueError(f"Invalid batch size: {batch_size}")
+    return _chunked(
+        (_convert_json_values(data, json_columns) for data in data_list),
+        batch_size,
+    )
+
+
+def _column_rows(
+    model_class: Type[MioModel],
+    rows: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """将字段一致的行数据的键由列属性名转换为数据表列键 (用于 Core insert, 无重命名列时原样返回)"""
+    column_keys = model_class.__mio_columns__.column_keys
+    if not rows or column_keys.keys().isdisjoint(rows[0]):
+        return rows
+    return [{column_keys.get(k, k): v for k, v in row.items()} for row in rows]
+
+
+def _group_by_keys(rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """按字段集合对行数据分组 (executemany 要求同批参数字段一致)"""
+
+    groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(frozenset(row), []).append(row)
+    return list(groups.values())
+
+
+def _build_select(
+    model_class: Type[MioModel],
+    conditions: Dict[str, Any],
+    fields: Optional[List[InstrumentedAttribute]] = None,
+    convert_json: bool = True,
+    order_by: Optional[List[UnaryExpression]] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    columns_only: bool = False,
+) -> Select:
+    """构建 2.0 风格的查询语句
+
+    Args:
+    :param model_class: 数据模型类
+    :param conditions: 筛选条件 (已合并的字段名字典, 支持操作符后缀与 OR 条件组)
+    :param fields: 额外返回字段
+    :param convert_json: 是否将等值条件中的字典 / 列表值序列化为 JSON 字符串
+    :param order_by: 排序
+    :param limit: 限制返回条数
+    :param offset: 偏移量
+    :param columns_only: 是否只查询数据列 (不构建 ORM 对象, fields 为空时查询所有列)
+
+    Returns:
+    :return: 查询语句
+    """
+
+    if columns_only:
+        stmt = select(*_select_columns(model_class, fields))
+    else:
+        stmt = select(model_class, *fields) if fields else select(model_class)
+    stmt = stmt.where(*compile_conditions(model_class, conditions, convert_json))
+    if order_by:
+        stmt = stmt.order_by(*order_by)
+    stmt = stmt.limit(limit) if limit else stmt
+    return stmt.offset(offset) if offset else stmt
+
+
+def _prepare_select(
+    model_class: Type[MioModel],
+    conditions: Dict[str, Any],
+    fields: Optional[List[InstrumentedAttribute]] = None,
+    convert_json: bool = True,
+    order_by: Optional[List[UnaryExpression]] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    columns_only: bool = False,
+) -> Tuple[Select, Dict[str, Any]]:
+    """构建查询语句模板与绑定参数
+
+    相同结构 (模型, 返回字段, 条件键与操作符, 排序, 是否分页) 的查询复用同一语句对象,
+    每次调用只需提取参数值, 跳过语句构建与 SQLAlchemy 编译缓存键计算;
+    无法模板化的查询 (OR 条件组, startswith 等需转义的操作符, 自定义排序表达式) 回退为逐次构建;
+    启用索引建议器时同时记录查询结构
+
+    Args:
+    :param model_class: 数据模型类
+    :param conditions: 筛选条件 (已合并的字段名字典)
+    (其余参数同 `_build_select`)
+
+    Returns:
+    :return: (查询语句, 执行时传入的绑定参数)
+    """
+
+    bound = condition_params(model_class, conditions, convert_json)
+    field_keys = _field_keys(model_class, fields)
+    order_keys = _order_by_keys(model_class, order_by)
+    if bound is None or field_keys is None or order_keys is None:
+        stmt = _build_select(
+            model_class,
+            conditions,
+            fields,
+            convert_json=convert_json,
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+            columns_only=columns_only,
+        )
+        if model_class.__mio_advisor__ is not None:
+            model_class.__mio_advisor__.record(model_class, conditions, order_keys, stmt, {})
+        return stmt, {}
+
+    shape, params = bound
+    if limit:
+        params["_limit"] = limit
+    if offset:
+        params["_offset"] = offset
+    stmt = _select_template(
+        model_class,
+        shape,
+        field_keys,
+        order_keys,
+        bool(limit),
+        bool(offset),
+        columns_only,
+    )
+    if model_class.__mio_advisor__ is not None:
+        model_class.__mio_advisor__.record(model_class, conditions, order_keys, stmt, params)
+    return stmt, params
+
+
+@lru_cache(maxsize=1024)
+def _select_template(
+    model_class: Type[MioModel],
+    shape: ConditionShape,
+    field_keys: Tuple[str, ...],
+    order_keys: Tuple[Tuple[str, Optional[bool]], ...],
+    has_limit: bool,
+    has_offset: bool,
+    columns_only: bool,
+) -> Select:
+    """按查询结构构建并缓存带绑定参数的查询语句模板"""
+
+    fields = [getattr(model_class, key) for key in field_keys]
+    if columns_only:
+        stmt = select(*_select_columns(model_class, fields))
+    else:
+        stmt = select(model_class, *fields) if fields else select(model_class)
+    stmt = stmt.where(*compile_condition_template(model_class, shape))
+    if order_keys:
+        order_by = []
+        for key, is_desc in order_keys:
+            attr = getattr(model_class, key)
+            if is_desc is not None:
+                attr = attr.desc() if is_desc else attr.asc()
+            order_by.append(attr)
+        stmt = stmt.order_by(*order_by)
+    if has_limit:
+        stmt = stmt.limit(bindparam("_limit", type_=Integer))
+    if has_offset:
+        stmt = stmt.offset(bindparam("_offset", type_=Integer))
+    return stmt
+
+
+def _field_keys(
+    model_class: Type[MioModel],
+    fields: Optional[List[InstrumentedAttribute]],
+) -> Optional[Tuple[str, ...]]:
+    """获取返回字段的属性名元组 (包含非本模型字段时返回 None)"""
+
+    keys: List[str] = []
+    for field in fields or []:
+        if not isinstance(field, InstrumentedAttribute):
+            return None
+        if field.class_ is not model_class:
+            return None
+        keys.append(field.key)
+    return tuple(keys)
+
+
+def _order_by_keys(
+    model_class: Type[MioModel],
+    order_by: Optional[List[Any]],
+) -> Optional[Tuple[Tuple[str, Optional[bool]], ...]]:
+    """获取排序字段的 (属性名, 是否降序) 元组 (包含自定义排序表达式时返回 None)"""
+
+    keys: List[Tuple[str, Optional[bool]]] = []
+    for expr in order_by or []:
+        if isinstance(expr, InstrumentedAttribute) and expr.class_ is model_class:
+            keys.append((expr.key, None))
+            continue
+        if not isinstance(expr, UnaryExpression) or expr.modifier not in (
+            operators.asc_op,
+            operators.desc_op,
+        ):
+            return None
+        column = expr.element
+        if getattr(column, "table", None) is not model_class.__table__:  # type: ignore
+            return None
+        if not isinstance(getattr(model_class, column.key, None), InstrumentedAttribute):  # type: ignore
+            return None
+        keys.append((column.key, expr.modifier is operators.desc_op))  # type: ignore
+    return tuple(keys)
+
+
+def _build_update(
+    model_class: Type[MioModel],
+    conditions: Dict[Union[str, InstrumentedAttribute], Any],
+    values: Dict[Union[str, InstrumentedAttribute], Any],
+    convert_json: bool = True,
+) -> Update:
+    """构建按条件批量更新语句 (不允许无条件更新)"""
+
+    merged_values = _merge_dict(values, None, model_class, convert_json=convert_json)
+    if not merged_values:
+        raise ValueError("No values to update")
+    merged_conditions = merge_conditions(conditions, None)
+    if not merged_conditions:
+        raise ValueError("Conditions are required for update_where")
+    return (
+        update(model_class)
+        .where(*compile_conditions(model_class, merged_conditions, convert_json))
+        .values(**merged_values)
+    )
+
+
+def _build_delete(
+    model_class: Type[MioModel],
+    conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]],
+    kwarg: Dict[str, Any],
+    convert_json: bool = True,
+) -> Delete:
+    """构建按条件批量删除语句 (不允许无条件删除)"""
+
+    merged_conditions = merge_conditions(conditions, kwarg)
+    if not merged_conditions:
+        raise ValueError("Conditions are required for delete_where")
+    return delete(model_class).where(
+        *compile_conditions(model_class, merged_conditions, convert_json),
+    )
+
+
+def _prepare_count(
+    model_class: Type[MioModel],
+    conditions: Dict[str, Any],
+    convert_json: bool,
+    exists: bool,
+) -> Tuple[Select, Dict[str, Any]]:
+    """构建计数 / 存在性查询语句与绑定参数 (条件处理与模板缓存同 `_prepare_select`)
+
+    Args:
+    :param model_class: 数据模型类
+    :param conditions: 筛选条件 (已合并的字段名字典)
+    :param convert_json: 是否将等值条件中的字典 / 列表值序列化为 JSON 字符串
+    :param exists: 是否为存在性查询 (SELECT 1 ... LIMIT 1), 否则为 SELECT COUNT(*)
+
+    Returns:
+    :return: (查询语句, 执行时传入的绑定参数)
+    """
+
+    bound = condition_params(model_class, conditions, convert_json)
+    if bound is None:
+        stmt = _count_select(model_class, exists).where(
+            *compile_conditions(model_class, conditions, convert_json),
+        )
+        params: Dict[str, Any] = {}
+    else:
+        shape, params = bound
+        stmt = _count_template(model_class, shape, exists)
+    if model_class.__mio_advisor__ is not None:
+        model_class.__mio_advisor__.record(model_class, conditions, (), stmt, params)
+    return stmt, params
+
+
+def _count_select(model_class: Type[MioModel], exists: bool) -> Select:
+    """构建不含条件的计数 / 存在性查询语句"""
+    if exists:
+        return select(literal(1)).select_from(model_class).limit(1)
+    return select(func.count()).select_from(model_class)
+
+
+@lru_cache(maxsize=1024)
+def _count_template(
+    model_class: Type[MioModel],
+    shape: ConditionShape,
+    exists: bool,
+) -> Select:
+    """按条件结构构建并缓存计数 / 存在性查询语句模板"""
+    return _count_select(model_class, exists).where(
+        *compile_condition_template(model_class, shape),
+    )
+
+
+def _build_aggregate(
+    model_class: Type[MioModel],
+    conditions: Dict[str, Any],
+    group_by: Optional[List[Union[str, InstrumentedAttribute]]],
+    aggregates: Dict[str, Optional[List[Union[str, InstrumentedAttribute]]]],
+    count: bool,
+    convert_json: bool = True,
+) -> Select:
+    """构建分组聚合语句
+
+    Args:
+    :param model_class: 数据模型类
+    :param conditions: 筛选条件 (已合并的字段名字典)
+    :param group_by: 分组字段
+    :param aggregates: 聚合函数名 (sum / avg / min / max) -> 字段列表
+    :param count: 是否统计各分组行数
+    :param convert_json: 是否将等值条件中的字典 / 列表值序列化为 JSON 字符串
+
+    Returns:
+    :return: 查询语句 (结果键为分组字段名与 <函数名>_<字段名>)
+    """
 
-    d1.update(d2)
+    names = model_class.__mio_columns__.names
 
-    for key in list(d1.keys()):
-        if isinstance(getattr(model_class, key), Callable):
-            raise TypeError(f"Invalid field: {key} is a function")
-        if not hasattr(model_class, key):
+    def column_attr(field: Union[str, InstrumentedAttribute]) -> InstrumentedAttribute:
+        key = _field_name(field)
+        if key not in names:
             raise ValueError(f"Invalid field: {key}")
-        if isinstance(d1[key], (dict, list)):
-            if convert_json:
-                d1[key] = json.dumps(d1[key], ensure_ascii=False)
-            else:
-                raise ValueError(f"Invalid value type: {type(d1[key])}")
+        return getattr(model_class, key)
+
+    group_attrs = [column_attr(field) for field in group_by or []]
+    columns = _select_columns(model_class, group_attrs) if group_attrs else []
+    for name, fields in aggregates.items():
+        for field in fields or []:
+            attr = column_attr(field)
+            columns.append(getattr(func, name)(attr).label(f"{name}_{attr.key}"))
+    if count:
+        columns.append(func.count().label("count"))
+    if len(columns) == len(group_attrs):
+        raise ValueError("No aggregate functions specified")
+
+    stmt = (
+        select(*columns)
+        .select_from(model_class)
+        .where(*compile_conditions(model_class, conditions, convert_json))
+    )
+    if group_attrs:
+        stmt = stmt.group_by(*group_attrs).order_by(*group_attrs)
+    return stmt
+
+
+def _select_columns(
+    model_class: Type[MioModel],
+    fields: Optional[List[InstrumentedAttribute]] = None,
+) -> List[ColumnElement]:
+    """获取数据表列 (以模型属性名作为结果键)"""
+
+    attrs = fields or [
+        getattr(model_class, key) for key in model_class.__mio_columns__.columns
+    ]
+    columns: List[ColumnElement] = []
+    for attr in attrs:
+        column = attr.property.columns[0]
+        columns.append(column if column.key == attr.key else column.label(attr.key))
+    return columns
+
+
+def _normalize_order_by(
+    model_class: Type[MioModel],
+    order_by: Optional[List[Union[InstrumentedAttribute, UnaryExpression]]],
+    primary_key: str,
+) -> List[Tuple[Any, bool]]:
+    """将排序条件规范化为 (字段, 是否降序) 列表, 并追加主键保证顺序唯一"""
+
+    order_cols: List[Tuple[Any, bool]] = []
+    for expr in order_by or []:
+        if isinstance(expr, UnaryExpression):
+            if expr.modifier not in (operators.asc_op, operators.desc_op):
+                raise ValueError(f"Invalid order by: {expr}")
+            order_cols.append(
+                (
+                    _column_attr(model_class, expr.element),
+                    expr.modifier is operators.desc_op,
+                ),
+            )
+        else:
+            order_cols.append((expr, False))
+    if primary_key not in {col.key for col, _ in order_cols}:
+        order_cols.append((getattr(model_class, primary_key), False))
+    return order_cols
+
+
+def _column_attr(model_class: Type[MioModel], column: Any) -> InstrumentedAttribute:
+    """获取数据表列对应的模型字段属性 (列名可能与属性名不同)"""
+
+    try:
+        prop = sqa_inspect(model_class).get_property_by_column(column)
+    except UnmappedColumnError as e:
+        raise ValueError(f"Invalid order by: {column}") from e
+    return getattr(model_class, prop.key)
+
+
+def _encode_cursor(values: List[Any]) -> str:
+    """将排序键值编码为不透明游标"""
+
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, (date, time)) else v for v in values],
+        ensure_ascii=False,
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, order_cols: List[Tuple[Any, bool]]) -> List[Any]:
+    """将不透明游标解码为排序键值"""
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list) or len(values) != len(order_cols):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    decoded: List[Any] = []
+    for (col, _), value in zip(order_cols, values):
+        python_type = getattr(col.type, "python_type", None)
+        if value is not None and python_type in (datetime, date, time):
+            value = python_type.fromisoformat(value)
+        decoded.append(value)
+    return decoded
+
+
+def _build_keyset_select(
+    model_class: Type[MioModel],
+    conditions: Dict[str, Any],
+    cursor: Optional[str],
+    order_by: Optional[List[Union[InstrumentedAttribute, UnaryExpression]]],
+    page_size: int,
+    primary_key: str,
+    convert_json: bool = True,
+    nulls_low: bool = True,
+) -> Tuple[Select, List[Tuple[Any, bool]]]:
+    """构建游标分页查询语句
+
+    Args:
+    :param model_class: 数据模型类
+    :param conditions: 筛选条件
+    :param cursor: 上一页游标
+    :param order_by: 排序条件
+    :param page_size: 每页行数
+    :param primary_key: 主键字段名
+    :param convert_json: 是否将等值条件中的字典 / 列表值序列化为 JSON 字符串
+    :param nulls_low: 数据库升序排序时 NULL 是否排在最前 (SQLite / MySQL 为 True, PostgreSQL 为 False)
+
+    Returns:
+    :return: (查询语句, 规范化后的排序字段)
+    """
+
+    if page_size < 1:
+        raise ValueError(f"Invalid page size: {page_size}")
+    order_cols = _normalize_order_by(model_class, order_by, primary_key)
+    stmt = _build_select(model_class, conditions, convert_json=convert_json)
+
+    if cursor:
+        # (a, b, c) > (va, vb, vc) 展开为
+        # a > va OR (a = va AND b > vb) OR (a = va AND b = vb AND c > vc)
+        # 可为空的排序字段按数据库的 NULL 排序位置展开 IS NULL / IS NOT NULL 分支
+        values = _decode_cursor(cursor, order_cols)
+        clauses: List[ColumnElement] = []
+        for i, (col, is_desc) in enumerate(order_cols):
+            clauses.append(
+                and_(
+                    *[
+                        c.is_(None) if v is None else c == v
+                        for (c, _), v in zip(order_cols[:i], values)
+                    ],
+                    _keyset_seek(col, values[i], is_desc, nulls_low),
+                ),
+            )
+        stmt = stmt.where(or_(*clauses))
+
+    return (
+        stmt.order_by(
+            *[col.desc() if is_desc else col.asc() for col, is_desc in order_cols],
+        ).limit(page_size + 1),
+        order_cols,
+    )
+
+
+def _keyset_seek(
+    col: Any,
+    value: Any,
+    is_desc: bool,
+    nulls_low: bool,
+) -> ColumnElement:
+    """构建排序字段位于游标值之后的条件 (处理 NULL 值)"""
+
+    nulls_first = nulls_low != is_desc
+    if value is None:
+        # NULL 分组排在最前时其后为所有非 NULL 值, 排在最后时其后没有值
+        return col.is_not(None) if nulls_first else false()
+    seek = col < value if is_desc else col > value
+    if nulls_first or not getattr(col.expression, "nullable", True):
+        return seek
+    return or_(seek, col.is_(None))
+
+
+def _keyset_page(
+    rows: List[Any],
+    order_cols: List[Tuple[Any, bool]],
+    page_size: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """截取当前页并根据最后一行生成下一页游标"""
+
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, _encode_cursor([getattr(rows[-1], col.key) for col, _ in order_cols])
+
+
+def _context_owner() -> Any:
+    """获取 context 会话模式下会话的所属者 (当前 asyncio 任务, 不在任务中时为当前线程)"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task if task is not None else get_ident()
+
+
+def _warmup_count(pool: Pool, n: int) -> int:
+    """计算连接池可预先建立并保留的连接数"""
+
+    if isinstance(pool, QueuePool):
+        return max(0, min(n, pool.size()))
+    if isinstance(pool, NullPool):
+        return 0
+    # SingletonThreadPool / StaticPool 等每个线程或全局只保留一个连接
+    return min(n, 1)
+
+
+def _to_async_db_url(db_url: str) -> str:
+    """根据同步数据库连接 URL 推导异步驱动 URL
+
+    Args:
+    :param db_url: 数据库连接 URL
+
+    Returns:
+    :return: 异步数据库连接 URL (无法推导时原样返回)
+    """
 
-    return d1
+    scheme, sep, rest = db_url.partition("://")
+    if not sep:
+        return db_url
+    dialect, _, driver = scheme.partition("+")
+    if dialect not in _ASYNC_DRIVERS or driver in _ASYNC_DRIVERS.values():
+        return db_url
+    return f"{dialect}+{_ASYNC_DRIVERS[dialect]}://{rest}"
@@ -0,0 +1,207 @@
+import re
+from threading import Lock
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .metrics import current_method
+
+try:
+    from miose_toolkit_logger import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger("miose_toolkit_db")  # type: ignore
+
+# 语句归一化规则 (占位符 / 字面量统一为 ?, 展开的 IN 列表合并为单个占位符)
+_NORMALIZE_RULES = (
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+"), "?"),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?)"),
+    (re.compile(r"\s+"), " "),
+)
+
+# 可执行 EXPLAIN 的语句类型
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+def normalize_statement(statement: str) -> str:
+    """归一化 SQL 语句 (忽略参数值与 IN 列表长度的差异)
+
+    Args:
+    :param statement: SQL 语句
+
+    Returns:
+    :return: 归一化后的语句
+    """
+    for pattern, repl in _NORMALIZE_RULES:
+        statement = pattern.sub(repl, statement)
+    return statement.strip()
+
+
+class _StatementStat:
+    """单条归一化语句的统计"""
+
+    __slots__ = ("count", "max", "methods", "sample", "total")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.methods: Dict[Optional[str], int] = {}
+        # 最慢一次 (同步引擎) 执行的原始语句与参数, 用于 EXPLAIN
+        self.sample: Optional[Tuple[str, Any]] = None
+
+
+class QueryProfiler:
+    """语句级性能分析器
+
+    通过 before_cursor_execute / after_cursor_execute 事件按归一化语句与调用的模型方法汇总耗时,
+    超过阈值的慢查询通过 miose_toolkit_logger (未安装时使用标准库 logging) 记录
+    """
+
+    def __init__(self, slow_threshold: Optional[float] = None) -> None:
+        """初始化性能分析器
+
+        Args:
+        :param slow_threshold: 慢查询阈值 (秒), 为 None 时不记录慢查询日志
+        """
+        self._slow_threshold = slow_threshold
+        self._lock = Lock()
+        self._statements: Dict[str, _StatementStat] = {}
+        self._methods: Dict[Optional[str], List[float]] = {}
+
+    def attach_engine(self, engine: Union[Engine, AsyncEngine]) -> None:
+        """注册引擎的语句执行事件
+
+        Args:
+        :param engine: 数据库引擎
+        """
+
+        engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        is_async = engine.dialect.is_async
+
+        def before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+            conn.info["mio_profile_start"] = perf_counter()
+
+        def after_cursor_execute(conn, _cursor, statement, parameters, _context, executemany):
+            start = conn.info.pop("mio_profile_start", None)
+            if start is None:
+                return
+            self._observe(
+                statement,
+                None if executemany or is_async else parameters,
+                perf_counter() - start,
+            )
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+    def _observe(self, statement: str, parameters: Any, cost: float) -> None:
+        """记录一次语句执行"""
+        method = current_method()
+        key = normalize_statement(statement)
+        with self._lock:
+            stat = self._statements.get(key)
+            if stat is None:
+                stat = self._statements[key] = _StatementStat()
+            stat.count += 1
+            stat.total += cost
+            stat.methods[method] = stat.methods.get(method, 0) + 1
+            if cost >= stat.max:
+                stat.max = cost
+                if parameters is not None:
+                    stat.sample = (statement, parameters)
+            method_stat = self._methods.get(method)
+            if method_stat is None:
+                method_stat = self._methods[method] = [0, 0.0, 0.0]
+            method_stat[0] += 1
+            method_stat[1] += cost
+            method_stat[2] = max(method_stat[2], cost)
+        if self._slow_threshold is not None and cost >= self._slow_threshold:
+            logger.warning(
+                f"Slow query ({cost * 1000:.1f}ms) in {method or '<raw>'}: {key}",
+            )
+
+    def report(self, limit: int = 10) -> Dict[str, Any]:
+        """获取性能分析报告
+
+        Args:
+        :param limit: 返回的语句数量 (按总耗时降序)
+
+        Returns:
+        :return: 报告字典
+            - statements: 归一化语句的执行次数, 总 / 平均 / 最大耗时与调用方法分布
+            - methods: 各模型方法执行语句的次数与总 / 最大耗时 (不在模型方法内执行的语句归入 None)
+        """
+        with self._lock:
+            statements = sorted(
+                self._statements.items(),
+                key=lambda item: item[1].total,
+                reverse=True,
+            )[:limit]
+            return {
+                "statements": [
+                    {
+                        "statement": key,
+                        "count": stat.count,
+                        "total": stat.total,
+                        "avg": stat.total / stat.count,
+                        "max": stat.max,
+                        "methods": dict(stat.methods),
+                    }
+                    for key, stat in statements
+                ],
+                "methods": {
+                    method: {"count": count, "total": total, "max": max_cost}
+                    for method, (count, total, max_cost) in self._methods.items()
+                },
+            }
+
+    def explain(self, engine: Engine, limit: int = 3) -> List[Dict[str, Any]]:
+        """对总耗时最高的语句执行 EXPLAIN
+
+        仅同步引擎上执行过的 SELECT / UPDATE / DELETE 语句保留参数样本, 其余语句跳过
+
+        Args:
+        :param engine: 执行 EXPLAIN 的同步引擎
+        :param limit: 分析的语句数量
+
+        Returns:
+        :return: 分析结果列表 (statement / total / plan)
+        """
+        prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+        with self._lock:
+            candidates = sorted(
+                (
+                    (key, stat.total, stat.sample)
+                    for key, stat in self._statements.items()
+                    if stat.sample is not None
+                    and key.lstrip("(").upper().startswith(_EXPLAINABLE)
+                ),
+                key=lambda item: item[1],
+                reverse=True,
+            )[:limit]
+
+        results = []
+        with engine.connect() as conn:
+            for key, total, (statement, parameters) in candidates:  # type: ignore
+                rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+                results.append(
+                    {
+                        "statement": key,
+                        "total": total,
+                        "plan": [tuple(row) for row in rows],
+                    },
+                )
+        return results
+
+    def reset(self) -> None:
+        """清空已收集的统计"""
+        with self._lock:
+            self._statements.clear()
+            self._methods.clear()
@@ -0,0 +1,81 @@
+import time
+from itertools import count
+from typing import Any, Generic, List, TypeVar, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# 可选的副本选择策略
+REPLICA_STRATEGIES = ("round_robin", "least_latency")
+
+# 延迟指数移动平均的平滑系数
+_LATENCY_ALPHA = 0.2
+
+S = TypeVar("S")
+
+
+class ReplicaSet(Generic[S]):
+    """只读副本集合 (按轮询或最低延迟选择副本)
+
+    最低延迟策略根据各副本引擎的语句执行耗时 (指数移动平均) 选择当前最快的副本,
+    尚未执行过语句的副本优先被选中
+    """
+
+    def __init__(
+        self,
+        engines: List[Union[Engine, AsyncEngine]],
+        session_makers: List[Any],
+        strategy: str = "round_robin",
+    ) -> None:
+        """初始化副本集合
+
+        Args:
+        :param engines: 副本引擎列表
+        :param session_makers: 与引擎一一对应的会话工厂列表
+        :param strategy: 副本选择策略 (round_robin / least_latency)
+        """
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Invalid replica strategy: {strategy}")
+        self.engines = engines
+        self._session_makers = session_makers
+        self._strategy = strategy
+        self._counter = count()
+        self.latencies: List[float] = [0.0] * len(engines)
+        for i, engine in enumerate(engines):
+            self._listen(engine, i)
+
+    def _listen(self, engine: Union[Engine, AsyncEngine], index: int) -> None:
+        """注册语句执行耗时统计事件"""
+
+        target = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+        def before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+            conn.info["mio_replica_start"] = time.perf_counter()
+
+        def after_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+            start = conn.info.pop("mio_replica_start", None)
+            if start is None:
+                return
+            cost = time.perf_counter() - start
+            last = self.latencies[index]
+            self.latencies[index] = (
+                cost if not last else last + _LATENCY_ALPHA * (cost - last)
+            )
+
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+        event.listen(target, "after_cursor_execute", after_cursor_execute)
+
+    def pick(self) -> int:
+        """选择一个副本
+
+        Returns:
+        :return: 副本序号
+        """
+        if self._strategy == "least_latency":
+            return min(range(len(self.latencies)), key=self.latencies.__getitem__)
+        return next(self._counter) % len(self._session_makers)
+
+    def session(self) -> S:
+        """创建一个绑定到选中副本的会话 (需由调用方关闭)"""
+        return self._session_makers[self.pick()]()
@@ -0,0 +1,509 @@
+import operator
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from sqlalchemy import UnaryExpression
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.sql import operators
+
+from .conditions import merge_conditions
+from .orm import MioModel, MioOrm
+
+T = TypeVar("T", bound=MioModel)
+R = TypeVar("R")
+
+
+def default_shard_key(value: Any) -> int:
+    """默认分片函数: 对分片键的字符串形式计算 CRC32 (跨进程稳定)"""
+    return zlib.crc32(str(value).encode())
+
+
+class ShardedMioOrm:
+    """水平分片数据库
+
+    同一数据模型注册到所有分片, 写入与主键查询按分片键路由到单个分片, 筛选查询并行扇出到所有分片后合并排序与分页
+    """
+
+    def __init__(
+        self,
+        db_urls: List[str],
+        shard_key: Callable[[Any], int] = default_shard_key,
+        max_workers: Optional[int] = None,
+        **kwarg,
+    ) -> None:
+        """初始化分片数据库
+
+        Args:
+        :param db_urls: 各分片数据库连接 URL (顺序决定分片序号, 扩容需迁移数据)
+        :param shard_key: 分片函数, 以分片键值调用, 返回值对分片数取模得到分片序号
+        :param max_workers: 扇出查询的最大并发线程数 (默认为分片数)
+        :param kwarg: 传递给各分片 MioOrm 的参数
+        """
+        if not db_urls:
+            raise ValueError("At least one shard is required")
+        self.shards = [MioOrm(url, **kwarg) for url in db_urls]
+        self._shard_key = shard_key
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(self.shards),
+            thread_name_prefix="mio-shard",
+        )
+
+    def shard_index(self, value: Any) -> int:
+        """计算分片键对应的分片序号"""
+        return self._shard_key(value) % len(self.shards)
+
+    def fan_out(self, func: Callable[[int], R]) -> List[R]:
+        """在所有分片上并行执行函数
+
+        Args:
+        :param func: 以分片序号调用的函数
+
+        Returns:
+        :return: 按分片序号排列的结果列表
+        """
+        if len(self.shards) == 1:
+            return [func(0)]
+        return list(self._executor.map(func, range(len(self.shards))))
+
+    def fan_out_write(self, func: Callable[[int], R]) -> List[R]:
+        """在所有分片上执行写入函数
+
+        调用方处于任一分片的事务 / 工作单元中时在当前线程依次执行, 使写入加入调用方上下文中各分片的事务
+        (后台线程不继承调用方的上下文, 会在事务之外各自提交), 否则并行执行.
+        跨分片写入不是原子的: 各分片独立提交, 部分分片失败时其它分片已提交的写入不会回滚
+
+        Args:
+        :param func: 以分片序号调用的函数
+
+        Returns:
+        :return: 按分片序号排列的结果列表
+        """
+        if any(shard.in_transaction() for shard in self.shards):
+            return [func(i) for i in range(len(self.shards))]
+        return self.fan_out(func)
+
+    def create_all(self) -> None:
+        """在所有分片上创建数据表"""
+        for shard in self.shards:
+            shard.create_all()
+
+    def close_db_connection(self) -> None:
+        """关闭所有分片的数据库连接"""
+        self._executor.shutdown(wait=True)
+        for shard in self.shards:
+            shard.close_db_connection()
+
+    def reg_predefine_data_model(
+        self,
+        table_name: str = "",
+        primary_key: str = "id",
+        shard_field: Optional[str] = None,
+    ) -> Callable[[Type[T]], "ShardedModel[T]"]:
+        """注册分片数据模型装饰器构建器
+
+        Args:
+        :param table_name: 表名
+        :param primary_key: 主键字段名
+        :param shard_field: 分片键字段名 (默认为主键)
+
+        Returns:
+        :return: 装饰器, 返回分片数据模型
+        """
+
+        def modal_class_wrapper(cls: Type[T]) -> "ShardedModel[T]":
+            models = [
+                shard.reg_predefine_data_model(
+                    table_name=table_name,
+                    primary_key=primary_key,
+                )(cls)
+                for shard in self.shards
+            ]
+            return ShardedModel(self, models, primary_key, shard_field or primary_key)
+
+        return modal_class_wrapper
+
+
+class ShardedModel(Generic[T]):
+    """分片数据模型
+
+    `add` / `batch_add` / `auto_insert` 及按分片键的 `get_by_pk` 路由到单个分片;
+    `filter` / `filter_to_dict` / `get_by_field` / `get_all` / `count` / `exists`
+    在各分片的独立会话中并行执行后合并结果, `update_where` / `delete_where` 在各分片上执行后汇总行数.
+    返回的行对象属于对应分片的模型类, 可直接调用 update / delete.
+    字段属性 (例如 `Model.name`) 代理到首个分片的模型类, 可用于条件与排序;
+    其它模型方法需通过 `model_for(key)` / `models` 在指定分片上调用
+    """
+
+    def __init__(
+        self,
+        orm: ShardedMioOrm,
+        models: List[Type[T]],
+        primary_key: str,
+        shard_field: str,
+    ) -> None:
+        self._orm = orm
+        self.models = models
+        self._primary_key = primary_key
+        self._shard_field = shard_field
+        columns = models[0].__mio_columns__
+        if shard_field not in columns.names:
+            raise ValueError(f"Invalid shard field: {shard_field}")
+        # 列名 -> 属性名 (用于解析排序表达式)
+        self._column_keys = {
+            attr.property.columns[0].name: key for attr, key in columns.attrs.items()
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        # 只代理字段属性; 其它模型方法没有分片语义, 不能静默地只作用于首个分片
+        attr = getattr(self.models[0], name)
+        if isinstance(attr, InstrumentedAttribute):
+            return attr
+        raise AttributeError(
+            f"ShardedModel does not support {name!r}, "
+            "use model_for(key) or models to call it on a specific shard",
+        )
+
+    def model_for(self, value: Any) -> Type[T]:
+        """获取分片键对应分片的模型类"""
+        return self.models[self._orm.shard_index(value)]
+
+    def _route(
+        self,
+        data: Optional[Dict[Union[str, InstrumentedAttribute], Any]],
+        kwarg: Dict[str, Any],
+    ) -> Type[T]:
+        """根据行数据中的分片键选择分片模型类"""
+        merged = merge_conditions(data, kwarg)
+        if self._shard_field not in merged:
+            raise ValueError(f"Missing shard key: {self._shard_field}")
+        return self.model_for(merged[self._shard_field])
+
+    def add(
+        self,
+        data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        **kwarg,
+    ) -> T:
+        """新增行 (按分片键路由)"""
+        return self._route(data, kwarg).add(data, **kwarg)
+
+    def auto_insert(
+        self,
+        data: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        **kwarg,
+    ) -> T:
+        """自动插入数据 (按分片键路由)"""
+        return self._route(data, kwarg).auto_insert(data, **kwarg)
+
+    def batch_add(self, data_list: Iterable[Dict[str, Any]], batch_size: int = 5000) -> int:
+        """批量新增行 (按分片键分组后并行写入各分片)
+
+        Args:
+        :param data_list: 行数据可迭代对象
+        :param batch_size: 每批次写入的行数
+
+        Returns:
+        :return: 写入的行数
+        """
+        groups: List[List[Dict[str, Any]]] = [[] for _ in self.models]
+        for data in data_list:
+            merged = merge_conditions(data, None)
+            if self._shard_field not in merged:
+                raise ValueError(f"Missing shard key: {self._shard_field}")
+            groups[self._orm.shard_index(merged[self._shard_field])].append(data)
+        counts = self._orm.fan_out_write(
+            lambda i: self.models[i].batch_add(groups[i], batch_size) if groups[i] else 0,
+        )
+        return sum(counts)
+
+    def get_by_pk(self, pk: Any) -> Optional[T]:
+        """根据主键查询行 (分片键为主键时路由到单个分片, 否则并行查询所有分片)"""
+        if self._shard_field == self._primary_key:
+            return self.model_for(pk).get_by_pk(pk)
+        for item in self._fan_out_read(lambda model: model.get_by_pk(pk)):
+            if item is not None:
+                return item
+        return None
+
+    def filter(
+        self,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        order_by: Optional[List[Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> List[T]:
+        """筛选数据行 (条件中包含分片键等值条件时只查询对应分片, 否则并行查询所有分片后合并)
+
+        Args:
+        :param conditions: 筛选条件
+        :param order_by: 排序 (仅支持字段或字段的 asc / desc)
+        :param limit: 限制返回条数
+        :param offset: 偏移量
+        :param convert_json: 是否将字典 / 列表值转换为 JSON 字符串
+        :param kwarg: 筛选条件
+
+        Returns:
+        :return: 行对象列表
+        """
+        order_keys = self._order_keys(order_by)
+        merged = merge_conditions(conditions, kwarg)
+        return self._read_merged(
+            lambda model, limit, offset: model.filter(
+                merged,
+                order_by=self._order_by(model, order_keys),
+                limit=limit,
+                offset=offset,
+                convert_json=convert_json,
+            ),
+            merged,
+            order_keys,
+            limit,
+            offset,
+            getattr,
+        )
+
+    def filter_to_dict(
+        self,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        order_by: Optional[List[Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> List[Dict[str, Any]]:
+        """筛选数据行并返回字典 (路由与合并规则同 filter)
+
+        Args:
+        :param fields: 返回字段 (默认为所有列, 需包含排序字段)
+
+        Returns:
+        :return: 行数据字典列表
+        """
+        order_keys = self._order_keys(order_by)
+        if fields and not {key for key, _ in order_keys} <= {field.key for field in fields}:
+            raise ValueError("order_by fields must be included in fields")
+        merged = merge_conditions(conditions, kwarg)
+        return self._read_merged(
+            lambda model, limit, offset: model.filter_to_dict(
+                merged,
+                fields=self._fields(model, fields),
+                order_by=self._order_by(model, order_keys),
+                limit=limit,
+                offset=offset,
+                convert_json=convert_json,
+            ),
+            merged,
+            order_keys,
+            limit,
+            offset,
+            operator.getitem,
+        )
+
+    def get_by_field(
+        self,
+        field: InstrumentedAttribute,
+        value: Any,
+        fields: Optional[List[InstrumentedAttribute]] = None,
+        allow_multiple: bool = False,
+    ) -> Optional[T]:
+        """根据字段查询行 (字段为分片键时路由到单个分片, 否则并行查询所有分片)"""
+        if field.key == self._shard_field:
+            model = self.model_for(value)
+            return model.get_by_field(
+                getattr(model, field.key),
+                value,
+                self._fields(model, fields),
+                allow_multiple,
+            )
+        items = [
+            item
+            for item in self._fan_out_read(
+                lambda model: model.get_by_field(
+                    getattr(model, field.key),
+                    value,
+                    self._fields(model, fields),
+                    allow_multiple,
+                ),
+            )
+            if item is not None
+        ]
+        if not allow_multiple and len(items) > 1:
+            raise ValueError(f"Multiple results found for {field}: {value}")
+        return items[0] if items else None
+
+    def update_where(
+        self,
+        conditions: Dict[Union[str, InstrumentedAttribute], Any],
+        values: Dict[Union[str, InstrumentedAttribute], Any],
+        convert_json: bool = True,
+    ) -> int:
+        """按条件批量更新行 (条件中包含分片键等值条件时只更新对应分片, 否则更新所有分片)
+
+        不支持更新分片键 (行需要迁移到其它分片)
+
+        Returns:
+        :return: 更新的行数
+        """
+        if self._shard_field in merge_conditions(values, None):
+            raise ValueError(f"Cannot update shard key: {self._shard_field}")
+        merged = merge_conditions(conditions, None)
+        if self._shard_field in merged:
+            return self.model_for(merged[self._shard_field]).update_where(
+                merged,
+                values,
+                convert_json,
+            )
+        return sum(
+            self._orm.fan_out_write(
+                lambda i: self.models[i].update_where(merged, values, convert_json),
+            ),
+        )
+
+    def delete_where(
+        self,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> int:
+        """按条件批量删除行 (条件中包含分片键等值条件时只删除对应分片, 否则删除所有分片)
+
+        Returns:
+        :return: 删除的行数
+        """
+        merged = merge_conditions(conditions, kwarg)
+        if self._shard_field in merged:
+            return self.model_for(merged[self._shard_field]).delete_where(
+                merged,
+                convert_json,
+            )
+        return sum(
+            self._orm.fan_out_write(
+                lambda i: self.models[i].delete_where(merged, convert_json),
+            ),
+        )
+
+    def count(
+        self,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> int:
+        """统计满足条件的行数 (条件中包含分片键等值条件时只查询对应分片, 否则汇总所有分片)"""
+        merged = merge_conditions(conditions, kwarg)
+        if self._shard_field in merged:
+            return self.model_for(merged[self._shard_field]).count(merged, convert_json)
+        return sum(self._fan_out_read(lambda model: model.count(merged, convert_json)))
+
+    def exists(
+        self,
+        conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+        convert_json: bool = True,
+        **kwarg,
+    ) -> bool:
+        """判断是否存在满足条件的行 (条件中包含分片键等值条件时只查询对应分片, 否则查询所有分片)"""
+        merged = merge_conditions(conditions, kwarg)
+        if self._shard_field in merged:
+            return self.model_for(merged[self._shard_field]).exists(merged, convert_json)
+        return any(self._fan_out_read(lambda model: model.exists(merged, convert_json)))
+
+    def get_all(self) -> List[T]:
+        """查询所有分片的所有行"""
+        return self.filter()
+
+    def _fan_out_read(self, func: Callable[[Type[T]], R]) -> List[R]:
+        """在所有分片的独立会话中并行执行读取"""
+
+        def run(i: int) -> R:
+            with self._orm.shards[i].detached_session():
+                return func(self.models[i])
+
+        return self._orm.fan_out(run)
+
+    def _read_merged(
+        self,
+        read: Callable[[Type[T], Optional[int], Optional[int]], List[R]],
+        merged: Dict[str, Any],
+        order_keys: List[Tuple[str, bool]],
+        limit: Optional[int],
+        offset: Optional[int],
+        get_value: Callable[[R, str], Any],
+    ) -> List[R]:
+        """按分片键路由读取, 或并行读取所有分片后合并排序与分页
+
+        Args:
+        :param read: 以 (分片模型类, limit, offset) 调用的读取函数
+        :param merged: 已合并的筛选条件
+        :param order_keys: 排序 (属性名, 是否降序) 列表
+        :param limit: 限制返回条数
+        :param offset: 偏移量
+        :param get_value: 从结果行中取排序字段值的函数
+
+        Returns:
+        :return: 结果行列表
+        """
+        if self._shard_field in merged:
+            return read(self.model_for(merged[self._shard_field]), limit, offset)
+
+        # 各分片取前 offset + limit 行, 合并后统一排序与分页
+        shard_limit = (limit + (offset or 0)) if limit is not None else None
+        results = self._fan_out_read(lambda model: read(model, shard_limit, None))
+        rows = [row for result in results for row in result]
+        # 各分片结果已有序, 稳定排序对已排序片段的合并接近线性
+        for key, is_desc in reversed(order_keys):
+            rows.sort(key=lambda row: _sort_value(get_value(row, key)), reverse=is_desc)
+        start = offset or 0
+        return rows[start : start + limit] if limit is not None else rows[start:]
+
+    @staticmethod
+    def _fields(
+        model: Type[T],
+        fields: Optional[List[InstrumentedAttribute]],
+    ) -> Optional[List[InstrumentedAttribute]]:
+        """将返回字段映射为分片模型类的字段属性"""
+        return [getattr(model, field.key) for field in fields] if fields else None
+
+    def _order_keys(self, order_by: Optional[List[Any]]) -> List[Tuple[str, bool]]:
+        """解析排序为 (属性名, 是否降序) 列表"""
+        keys: List[Tuple[str, bool]] = []
+        for expr in order_by or []:
+            if isinstance(expr, InstrumentedAttribute):
+                keys.append((expr.key, False))
+                continue
+            if isinstance(expr, UnaryExpression) and expr.modifier in (
+                operators.asc_op,
+                operators.desc_op,
+            ):
+                key = self._column_keys.get(getattr(expr.element, "name", None))  # type: ignore
+                if key is not None:
+                    keys.append((key, expr.modifier is operators.desc_op))
+                    continue
+            raise ValueError(f"Unsupported order_by expression: {expr}")
+        return keys
+
+    @staticmethod
+    def _order_by(model: Type[T], order_keys: List[Tuple[str, bool]]) -> List[Any]:
+        """构建分片模型类的排序表达式"""
+        return [
+            getattr(model, key).desc() if is_desc else getattr(model, key).asc()
+            for key, is_desc in order_keys
+        ]
+
+
+def _sort_value(value: Any) -> Tuple[bool, Any]:
+    """合并排序键 (None 排在最前, 与 SQLite / MySQL 升序行为一致)"""
+    return (value is not None, value)
@@ -0,0 +1,110 @@
+from threading import Condition, RLock, local
+from time import monotonic
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+
+class _Waiter:
+    """组提交中单个调用方的提交结果"""
+
+    __slots__ = ("done", "error")
+
+    def __init__(self) -> None:
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class GroupCommitter:
+    """组提交: 将时间窗口内多个调用方的提交合并为一次提交
+
+    首个调用方作为提交者等待一个时间窗口后统一提交, 窗口内的其它调用方只刷新写入并等待该次提交完成.
+    调用方需在持有 `lock` 时完成写入与 `commit` (暂存与刷新不与其它调用方交错);
+    任一调用方的写入失败时回滚共享会话, 已刷新写入被一并丢弃的调用方 (包括提交者) 均抛出该异常,
+    提交失败时所有等待的调用方均抛出异常
+    """
+
+    def __init__(self, window: float) -> None:
+        """初始化组提交器
+
+        Args:
+        :param window: 合并提交的时间窗口 (秒)
+        """
+        if window <= 0:
+            raise ValueError(f"Invalid group commit window: {window}")
+        self._window = window
+        # 共享会话保护锁: 共享会话的读写操作需持有该锁, 避免与其它调用方的刷新 / 提交交错
+        self.lock = RLock()
+        self._cond = Condition(self.lock)
+        self._committing = False
+        # 已刷新写入, 等待本轮提交的调用方
+        self._waiters: List[_Waiter] = []
+        # 当前线程最近一次由组提交器回滚后抛出的异常
+        self._handled = local()
+
+    def commit(self, session: Session) -> None:
+        """刷新写入并等待包含本次写入的提交完成
+
+        Args:
+        :param session: 数据库会话
+        """
+
+        with self._cond:
+            session.flush()
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+            if self._committing:
+                while not waiter.done:
+                    self._cond.wait()
+            else:
+                self._committing = True
+                # 等待时释放锁 (包括调用方重入持有的层级), 其它调用方可在窗口内刷新写入
+                deadline = monotonic() + self._window
+                remaining = self._window
+                while remaining > 0:
+                    self._cond.wait(remaining)
+                    remaining = deadline - monotonic()
+                waiters, self._waiters = self._waiters, []
+                try:
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    self._finish(waiters, e)
+                else:
+                    self._finish(waiters, None)
+                finally:
+                    self._committing = False
+            if waiter.error is not None:
+                self._handled.error = waiter.error
+                raise waiter.error
+
+    def rollback(self, session: Session, error: Optional[BaseException]) -> None:
+        """回滚调用方失败的写入
+
+        回滚会丢弃共享会话中其它调用方已刷新的写入, 这些调用方的提交均失败;
+        异常由组提交器抛出时共享会话已回滚, 不再重复回滚
+
+        Args:
+        :param session: 数据库会话
+        :param error: 调用方写入失败的异常
+        """
+
+        with self._cond:
+            handled = getattr(self._handled, "error", None)
+            self._handled.error = None
+            if error is not None and error is handled:
+                return
+            session.rollback()
+            waiters, self._waiters = self._waiters, []
+            if waiters:
+                rolled_back = RuntimeError("Group commit rolled back by a failed write")
+                rolled_back.__cause__ = error
+                self._finish(waiters, rolled_back)
+
+    def _finish(self, waiters: List[_Waiter], error: Optional[BaseException]) -> None:
+        """设置调用方的提交结果并唤醒等待的调用方"""
+        for waiter in waiters:
+            if not waiter.done:
+                waiter.done = True
+                waiter.error = error
+        self._cond.notify_all()
@@ -0,0 +1,139 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from miose_toolkit_db import (
+    Mapped,
+    MappedColumn,
+    MioModel,
+    MioOrm,
+    WriteBuffer,
+    gen_sqlite_db_url,
+)
+from sqlalchemy import JSON, Integer, String
+
+
+def test_write_buffer():
+    batches = []
+    buffer = WriteBuffer(batches.append, max_size=3, flush_interval=60)
+
+    # 达到批次大小时由后台线程写入
+    for i in range(3):
+        buffer.put(id=i)
+    deadline = time.monotonic() + 5
+    while not batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batches == [[{"id": 0}, {"id": 1}, {"id": 2}]]
+
+    buffer.put({"id": 3})
+    assert buffer.pending == 1
+    assert buffer.flush() == 1
+    assert buffer.flushed == 4
+
+    # 缓冲区已满时写入方阻塞 (背压)
+    release = threading.Event()
+    blocked = WriteBuffer(
+        lambda _rows: release.wait(),
+        max_size=1,
+        flush_interval=60,
+        max_pending=1,
+        put_timeout=0.05,
+    )
+    blocked.put(id=1)
+    blocked.put(id=2)
+    with pytest.raises(TimeoutError):
+        blocked.put(id=3)
+    release.set()
+    blocked.close()
+    assert blocked.flushed == 2
+    with pytest.raises(RuntimeError):
+        blocked.put(id=4)
+
+    # 后台写入失败时异常在下一次 flush 时抛出
+    def fail(_rows):
+        raise ValueError("write failed")
+
+    failing = WriteBuffer(fail, max_size=1, flush_interval=60)
+    failing.put(id=1)
+    deadline = time.monotonic() + 5
+    while not failing.failed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with pytest.raises(ValueError):
+        failing.flush()
+    failing.close()
+
+
+@pytest.mark.asyncio
+async def test_write_buffer_aput():
+    # 缓冲区已满时异步写入在线程池中等待, 不阻塞事件循环
+    release = threading.Event()
+    buffer = WriteBuffer(
+        lambda _rows: release.wait(),
+        max_size=1,
+        flush_interval=60,
+        max_pending=1,
+    )
+    await buffer.aput(id=1)
+    buffer.put(id=2)
+    task = asyncio.ensure_future(buffer.aput(id=3))
+    await asyncio.sleep(0.05)
+    assert not task.done()
+    release.set()
+    await asyncio.wait_for(task, 5)
+    buffer.close()
+    assert buffer.flushed == 3
+
+
+@pytest.mark.asyncio
+async def test_model_buffered():
+    Path("test14.temp.db").unlink(True)
+
+    db = MioOrm(gen_sqlite_db_url("test14.temp.db"))
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBBuffered(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), default="none")
+        tags: Mapped[list] = MappedColumn(JSON, nullable=True)
+
+    db.create_all()
+    buffer = DBBuffered.buffered(max_size=50, flush_interval=0.05)
+    assert DBBuffered.buffered() is buffer
+
+    # 多线程 / 协程写入
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda i: buffer.put(id=i, tags=[i]), range(100)))
+    await buffer.aput({DBBuffered.id: 100, "name": "async"})
+    with pytest.raises(ValueError):
+        buffer.put(unknown=1)
+
+    buffer.flush()
+    assert len(DBBuffered.get_all()) == 101
+    item = DBBuffered.get_by_pk(1)
+    assert item and item.name == "none" and item.tags == [1]
+
+    # 数据表列名与属性名不同的字段
+    @db.reg_predefine_data_model(table_name="renamed", primary_key="id")
+    class DBBufferedR(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        user_name: Mapped[str] = MappedColumn("uname", String(length=128))
+
+    db.create_all()
+    renamed = DBBufferedR.buffered(flush_interval=60)
+    renamed.put(id=1, user_name="y")
+    renamed.flush()
+    item = DBBufferedR.get_by_pk(1)
+    assert item and item.user_name == "y"
+
+    # 关闭数据库连接时写入剩余数据
+    buffer = DBBuffered.buffered(flush_interval=60)
+    buffer.put(id=101)
+    db.close_db_connection()
+
+    with sqlite3.connect("test14.temp.db") as conn:
+        assert conn.execute("SELECT MAX(id), COUNT(*) FROM test").fetchone() == (101, 102)
+    Path("test14.temp.db").unlink(True)
@@ -0,0 +1,130 @@
+import time
+from pathlib import Path
+
+from miose_toolkit_db import (
+    LRUCache,
+    Mapped,
+    MappedColumn,
+    MioModel,
+    MioOrm,
+    gen_sqlite_db_url,
+)
+from sqlalchemy import String
+
+
+def test_lru_cache():
+    cache = LRUCache(max_size=2, ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # 超出容量时淘汰最久未使用的条目
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+    cache.delete("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
+
+    # 过期条目视为不存在
+    cache = LRUCache(max_size=2, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_model_cache():
+    Path("test_cache.temp.db").unlink(True)
+
+    db = MioOrm(gen_sqlite_db_url("test_cache.temp.db"))
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id", cache=LRUCache())
+    class DBCache(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    db.create_all()
+    DBCache.add(id="1", name="Name1")
+
+    # 首次查询未命中, 再次查询命中
+    item = DBCache.get_by_pk("1")
+    assert item and item.name == "Name1"
+    item = DBCache.get_by_pk("1")
+    assert item and item.name == "Name1"
+    assert DBCache.cache_stats()["hits"] == 1
+    assert DBCache.cache_stats()["misses"] == 1
+
+    # 字段查询复用行缓存
+    assert DBCache.get_by_field(field=DBCache.name, value="Name1") is not None
+    assert DBCache.get_by_field(field=DBCache.name, value="Name1") is not None
+    assert DBCache.cache_stats()["hits"] == 2
+
+    # 更新后缓存失效
+    item.update(name="Name2")
+    item = DBCache.get_by_pk("1")
+    assert item and item.name == "Name2"
+    assert DBCache.get_by_field(field=DBCache.name, value="Name1") is None
+    assert DBCache.cache_stats()["hits"] == 2
+
+    # 批量插入或更新后缓存失效
+    DBCache.get_by_pk("1")
+    DBCache.batch_upsert([{"id": "1", "name": "Name3"}])
+    item = DBCache.get_by_pk("1")
+    assert item and item.name == "Name3"
+
+    # 批量主键查询读取并写入缓存
+    DBCache.add(id="2", name="Name4")
+    items = DBCache.get_many_by_pk(["1", "2"])
+    assert items["1"].name == "Name3" and items["2"].name == "Name4"
+    hits = DBCache.cache_stats()["hits"]
+    DBCache.get_many_by_pk(["1", "2"])
+    assert DBCache.cache_stats()["hits"] == hits + 2
+
+    # 按条件批量更新后缓存失效
+    DBCache.update_where({DBCache.id: "2"}, {DBCache.name: "Name5"})
+    item2 = DBCache.get_by_pk("2")
+    assert item2 and item2.name == "Name5"
+
+    # 命中缓存时不覆盖会话中已有实例尚未刷新的修改
+    item2.name = "Pending"
+    hits = DBCache.cache_stats()["hits"]
+    assert DBCache.get_by_pk("2") is item2
+    assert DBCache.get_many_by_pk(["2"])["2"] is item2
+    assert DBCache.cache_stats()["hits"] == hits + 2
+    assert item2.name == "Pending"
+    item2.update()
+    assert DBCache.filter_to_dict(id="2") == [{"id": "2", "name": "Pending"}]
+
+    # 删除后缓存失效
+    item.delete()
+    assert DBCache.get_by_pk("1") is None
+
+    DBCache.cache_clear()
+    assert DBCache.cache_stats()["hits"] == 0
+
+    # 多个模型共用同一缓存后端时缓存键互不冲突
+    shared = LRUCache()
+
+    @db.reg_predefine_data_model(table_name="test_a", primary_key="id", cache=shared)
+    class DBCacheA(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    @db.reg_predefine_data_model(table_name="test_b", primary_key="id", cache=shared)
+    class DBCacheB(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        title: Mapped[str] = MappedColumn(String(length=128), comment="标题")
+
+    db.create_all()
+    DBCacheA.add(id="1", name="A1")
+    DBCacheB.add(id="1", title="B1")
+    assert DBCacheA.get_by_pk("1").name == "A1"  # type: ignore
+    assert DBCacheB.get_by_pk("1").title == "B1"  # type: ignore
+    assert DBCacheB.get_by_pk("1").title == "B1"  # type: ignore
+    assert DBCacheB.cache_stats()["hits"] == 1
+
+    db.close_db_connection()
+    Path("test_cache.temp.db").unlink(True)
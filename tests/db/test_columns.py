@@ -0,0 +1,119 @@
+import json
+from datetime import datetime
+
+import pytest
+from miose_toolkit_db import Mapped, MappedColumn, MioJSON, MioModel, MioOrm
+from miose_toolkit_db.orm import _merge_dict
+from sqlalchemy import JSON, DateTime, Integer, String, select
+
+
+def test_model_columns():
+    db = MioOrm("sqlite://")
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBColumns(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        name: Mapped[str] = MappedColumn("nm", String(length=128), default="none")
+        tags: Mapped[list] = MappedColumn(JSON, nullable=True)
+        extra: Mapped[str] = MappedColumn(String(length=128), nullable=True)
+
+    columns = DBColumns.__mio_columns__
+    assert columns.columns == ("id", "name", "tags", "extra")
+    assert columns.attrs[DBColumns.name] == "name"
+    assert columns.json_columns == {"tags"}
+    assert columns.nullable == {"tags", "extra"}
+    assert dict(columns.defaults) == {"name": "none"}
+
+    # 原生 JSON 列保留 Python 对象, 其余列序列化为 JSON 字符串
+    merged = _merge_dict({DBColumns.tags: [1]}, {"extra": {"a": 1}}, DBColumns)
+    assert merged["tags"] == [1]
+    assert json.loads(merged["extra"]) == {"a": 1}
+
+    db.create_all()
+    DBColumns.add(id=1, tags=["a", "b"])
+    item = DBColumns.get_by_pk(1)
+    assert item and item.name == "none" and item.tags == ["a", "b"]
+
+    with pytest.raises(ValueError):
+        _merge_dict({"unknown": 1}, None, DBColumns)
+    with pytest.raises(TypeError):
+        _merge_dict({"add": 1}, None, DBColumns)
+
+    db.close_db_connection()
+
+
+def test_mio_json():
+    db = MioOrm("sqlite://")
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBJson(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        info: Mapped[dict] = MappedColumn(MioJSON, nullable=True)
+
+    db.create_all()
+    DBJson.add(id=1, info={"name": "Alice", "tags": ["a"]})
+    DBJson.batch_add([{"id": 2, "info": {"name": "Bob"}}, {"id": 3, "info": None}])
+
+    # 读取时保留原始文本, 首次访问属性时解码且不标记为已修改
+    db.get_sqa_db().expire_all()
+    item = DBJson.get_by_pk(1)
+    assert item is not None
+    assert isinstance(item.__dict__["info"], str)
+    assert item.info == {"name": "Alice", "tags": ["a"]}
+    assert isinstance(item.__dict__["info"], dict)
+    assert not db.get_sqa_db().dirty
+    # 仅 JSON 列的属性负责解码, 不拦截其它属性访问
+    assert "__getattribute__" not in vars(DBJson)
+    assert DBJson.__mio_columns__.attrs[DBJson.info] == "info"
+
+    assert [d.id for d in DBJson.filter(info={"name": "Bob"})] == [2]
+    assert DBJson.filter_to_dict(id=2) == [{"id": 2, "info": {"name": "Bob"}}]
+    assert DBJson.filter_to_tuple(id=3) == [(3, None)]
+
+    # 可使用数据库 JSON 操作符
+    stmt = select(DBJson.id).where(DBJson.info["name"].as_string() == "Alice")
+    assert db.get_sqa_db().execute(stmt).scalars().all() == [1]
+
+    db.close_db_connection()
+
+
+def test_serializer():
+    db = MioOrm("sqlite://")
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBSerialize(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128))
+        created: Mapped[datetime] = MappedColumn(DateTime, nullable=True)
+        info: Mapped[dict] = MappedColumn(MioJSON, nullable=True)
+
+    db.create_all()
+    created = datetime(2024, 1, 2, 3, 4, 5)
+    DBSerialize.add(id=1, name="Alice", created=created, info={"a": 1})
+    DBSerialize.add(id=2, name="Bob", info=None)
+
+    # 提交后过期的列在访问时加载
+    items = DBSerialize.get_all()
+    db.get_sqa_db().expire(items[0])
+    assert items[0].to_dict() == {
+        "id": 1,
+        "name": "Alice",
+        "created": created,
+        "info": {"a": 1},
+    }
+    assert items[0].to_dict(fields=[DBSerialize.name, "info"]) == {
+        "name": "Alice",
+        "info": {"a": 1},
+    }
+    db.get_sqa_db().refresh(items[0])
+    assert items[0].to_dict(fields=["info"], decode_json=False) == {"info": '{"a": 1}'}
+
+    assert DBSerialize.to_dicts(items, fields=["id"]) == [{"id": 1}, {"id": 2}]
+    assert json.loads(DBSerialize.to_json(items)) == [
+        {"id": 1, "name": "Alice", "created": created.isoformat(), "info": {"a": 1}},
+        {"id": 2, "name": "Bob", "created": None, "info": None},
+    ]
+    with pytest.raises(ValueError):
+        items[0].to_dict(fields=["unknown"])
+
+    db.close_db_connection()
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import pytest
+from miose_toolkit_db import (
+    Mapped,
+    MappedColumn,
+    MioModel,
+    MioOrm,
+    any_of,
+    asc,
+    gen_sqlite_db_url,
+)
+from miose_toolkit_db.conditions import compile_condition_shape
+from miose_toolkit_db.orm import _select_template
+from sqlalchemy import Integer, String
+
+
+def test_conditions():
+    Path("test_conditions.temp.db").unlink(True)
+
+    db = MioOrm(gen_sqlite_db_url("test_conditions.temp.db"))
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBCond(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+        age: Mapped[int] = MappedColumn(Integer, comment="年龄", nullable=True)
+
+    db.create_all()
+    DBCond.batch_add(
+        [
+            {"id": 1, "name": "Alice", "age": 17},
+            {"id": 2, "name": "Bob", "age": 25},
+            {"id": 3, "name": "Carol", "age": 31},
+            {"id": 4, "name": "Dave_1", "age": None},
+        ],
+    )
+
+    def ids(**kwarg):
+        return [d.id for d in DBCond.filter(order_by=[asc(DBCond.id)], **kwarg)]
+
+    # 操作符后缀
+    assert ids(age__gte=25) == [2, 3]
+    assert ids(age__lt=25, age__gt=10) == [1]
+    assert ids(id__in=[1, 3]) == [1, 3]
+    assert ids(id__not_in=[1, 3]) == [2, 4]
+    assert ids(name__like="%o%") == [2, 3]
+    assert ids(name__startswith="Da") == [4]
+    assert ids(name__contains="_") == [4]
+    assert ids(age__between=(18, 30)) == [2]
+    assert ids(age__is_null=True) == [4]
+    assert ids(name__ne="Bob", age__is_null=False) == [1, 3]
+    assert ids(conditions={DBCond.name: "Bob"}) == [2]
+
+    # OR 条件组
+    assert ids(conditions=any_of({"age__lt": 18}, {DBCond.name: "Carol"})) == [1, 3]
+    assert ids(conditions={"age__gte": 18, **any_of({"id": 2}, {"id": 4})}) == [2]
+    both = {**any_of({"id": 2}, {"id": 3}), **any_of({"age__lt": 30}, {"id": 4})}
+    assert ids(conditions=both) == [2]
+    assert ids(**any_of({"id": 2}, {"id": 3}), **any_of({"age__lt": 30}, {"id": 4})) == [2]
+
+    # 其它方法共享条件语法
+    assert len(DBCond.filter_to_dict(age__gte=25)) == 2
+    assert DBCond.update_where({"age__lt": 18}, {"age": 18}) == 1
+    assert DBCond.delete_where(age__is_null=True) == 1
+
+    # 相同结构的条件复用解析结果
+    compile_condition_shape.cache_clear()
+    ids(age__gte=1)
+    ids(age__gte=2)
+    assert compile_condition_shape.cache_info().hits == 1
+
+    # 相同结构的查询复用语句模板, 仅绑定参数不同
+    _select_template.cache_clear()
+    assert ids(id__in=[1, 2]) == [1, 2]
+    assert ids(id__in=[3]) == [3]
+    assert ids(age__is_null=False) == [1, 2, 3]
+    assert _select_template.cache_info().hits == 1
+    assert DBCond.get_by_pk(2).name == "Bob"
+    assert DBCond.get_by_pk(3).name == "Carol"
+    assert DBCond.get_by_field(DBCond.age, None) is None
+    assert _select_template.cache_info().hits == 2
+
+    with pytest.raises(ValueError):
+        ids(age__unknown=1)
+    with pytest.raises(ValueError):
+        ids(unknown__gte=1)
+
+    db.close_db_connection()
+    Path("test_conditions.temp.db").unlink(True)
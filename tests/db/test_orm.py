@@ -1,5 +1,11 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
+import pytest
 from miose_toolkit_db import (
     Mapped,
     MappedColumn,
@@ -9,7 +15,9 @@ from miose_toolkit_db import (
     desc,
     gen_sqlite_db_url,
 )
-from sqlalchemy import String
+from sqlalchemy import Integer, String, create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 
 def test_orm():
@@ -146,6 +154,28 @@ def test_orm():
     dic = filtered_data2[0]
     assert dic["name"] == "AutoInsertName" and "id" not in dic
 
+    # 测试筛选结果字典 (默认返回所有列)
+    filtered_data2 = DBTest2.filter_to_dict(name="AutoInsertName")
+    assert filtered_data2 == [
+        {
+            "id": "2",
+            "name": "AutoInsertName",
+            "url": "http://example.com/auto",
+            "extra_info": filtered_data2[0]["extra_info"],
+        },
+    ]
+
+    # 测试筛选结果元组
+    filtered_data3 = DBTest2.filter_to_tuple(
+        fields=[DBTest2.id, DBTest2.name],
+        order_by=[asc(DBTest2.id)],
+    )
+    assert filtered_data3 == [
+        ("2", "AutoInsertName"),
+        ("3", "BatchInsertName"),
+        ("4", "BatchInsertName"),
+    ]
+
     # 关闭数据库连接
     db1.close_db_connection()
     db2.close_db_connection()
@@ -155,5 +185,875 @@ def test_orm():
     Path("test2.temp.db").unlink(True)
 
 
+@pytest.mark.asyncio
+async def test_async_orm():
+    Path("test3.temp.db").unlink(True)
+
+    # 创建异步模式数据库连接 (自动推导为 sqlite+aiosqlite)
+    db = MioOrm(gen_sqlite_db_url("test3.temp.db"), async_mode=True)
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest3(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+        extra_info: Mapped[str] = MappedColumn(String(length=1024), comment="额外信息")
+
+    await db.acreate_all()
+
+    # 测试异步新增与查询
+    await DBTest3.aadd(id="1", name="AsyncName1", extra_info={"key": "value1"})
+    item = await DBTest3.aget_by_pk("1")
+    assert item and item.name == "AsyncName1"
+    assert json.loads(item.extra_info) == {"key": "value1"}
+
+    item = await DBTest3.aget_by_field(field=DBTest3.name, value="AsyncName1")
+    assert item and item.id == "1"
+
+    # 测试异步更新
+    await item.aupdate(name="AsyncName2")
+    item = await DBTest3.aget_by_pk("1")
+    assert item and item.name == "AsyncName2"
+
+    # 测试异步批量插入与自动插入
+    await DBTest3.abatch_add(
+        [
+            {"id": "2", "name": "BatchName", "extra_info": {"key": "batch"}},
+            {"id": "3", "name": "BatchName", "extra_info": {"key": "batch"}},
+        ],
+    )
+    await DBTest3.aauto_insert(id="3", name="AutoName", extra_info="")
+    assert len(await DBTest3.aget_all()) == 3
+
+    # 测试异步筛选
+    filtered_data = await DBTest3.afilter(
+        conditions={DBTest3.name: "BatchName"},
+        order_by=[desc(DBTest3.id)],
+    )
+    assert [d.id for d in filtered_data] == ["2"]
+
+    dicts = await DBTest3.afilter_to_dict(
+        fields=[DBTest3.name],
+        order_by=[asc(DBTest3.id)],
+    )
+    assert [d["name"] for d in dicts] == ["AsyncName2", "BatchName", "AutoName"]
+
+    # 测试异步流式查询
+    ids = [d.id async for d in DBTest3.aiter_all(batch_size=2)]
+    assert sorted(ids) == ["1", "2", "3"]
+    names = [
+        r.name
+        async for r in DBTest3.aiter_filter(
+            conditions={DBTest3.id: "3"},
+            fields=[DBTest3.name],
+        )
+    ]
+    assert names == ["AutoName"]
+
+    # 测试异步按主键批量查询
+    items = await DBTest3.aget_many_by_pk(["1", "3", "missing"])
+    assert sorted(items) == ["1", "3"]
+
+    # 测试异步游标分页
+    items, cursor = await DBTest3.apaginate_after(page_size=2)
+    assert [d.id for d in items] == ["1", "2"] and cursor
+    items, cursor = await DBTest3.apaginate_after(cursor, page_size=2)
+    assert [d.id for d in items] == ["3"] and cursor is None
+
+    # 测试异步按条件批量更新与删除
+    assert await DBTest3.aupdate_where({DBTest3.id: "3"}, {DBTest3.name: "Where"}) == 1
+    assert await DBTest3.adelete_where(name="Where") == 1
+    await DBTest3.aadd(id="3", name="AutoName", extra_info="")
+
+    # 测试异步工作单元
+    async with db.asession():
+        item = await DBTest3.aget_by_pk("1")
+        assert item
+        await item.aupdate(name="AsyncUnitOfWork")
+    item = await DBTest3.aget_by_pk("1")
+    assert item and item.name == "AsyncUnitOfWork"
+
+    # 测试异步删除
+    await filtered_data[0].adelete()
+    assert await DBTest3.aget_by_pk("2") is None
+
+    await db.aclose_db_connection()
+    Path("test3.temp.db").unlink(True)
+
+
+def test_orm_session_scope():
+    Path("test4.temp.db").unlink(True)
+
+    # 线程本地会话模式
+    db = MioOrm(gen_sqlite_db_url("test4.temp.db"), session_mode="thread")
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest4(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    db.create_all()
+
+    def worker(i: int) -> str:
+        DBTest4.add(id=str(i), name=f"Name{i}")
+        item = DBTest4.get_by_pk(str(i))
+        assert item
+        name = item.name
+        db.remove_session()
+        return name
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(worker, range(20)))
+    assert sorted(results) == sorted(f"Name{i}" for i in range(20))
+    assert len(DBTest4.get_all()) == 20
+
+    # 工作单元: 块内共享独立会话, 正常退出提交
+    with db.session() as session:
+        assert db.get_sqa_db() is session
+        item = DBTest4.get_by_pk("1")
+        assert item
+        item.update(name="UnitOfWork")
+    assert db.get_sqa_db() is not session
+    item = DBTest4.get_by_pk("1")
+    assert item and item.name == "UnitOfWork"
+
+    # 工作单元: 异常时回滚
+    try:
+        with db.session():
+            DBTest4.add(id="1", name="Duplicated")
+    except Exception:
+        pass
+    else:
+        raise Exception("Failed to rollback unit of work")
+    assert len(DBTest4.get_all()) == 20
+
+    # 非法会话模式
+    with pytest.raises(ValueError):
+        MioOrm(gen_sqlite_db_url("test4.temp.db"), session_mode="invalid")
+
+    db.close_db_connection()
+    Path("test4.temp.db").unlink(True)
+
+
+@pytest.mark.asyncio
+async def test_orm_context_session():
+    db = MioOrm("sqlite://", session_mode="context")
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest4C(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    db.create_all()
+    parent = db.get_sqa_db()
+
+    async def worker(i: int) -> Session:
+        session = db.get_sqa_db()
+        DBTest4C.add(id=str(i), name=f"Name{i}")
+        await asyncio.sleep(0)
+        # 同一任务内会话保持不变
+        assert db.get_sqa_db() is session
+        item = DBTest4C.get_by_pk(str(i))
+        assert item and item.name == f"Name{i}"
+        db.remove_session()
+        return session
+
+    # 子任务复制父上下文, 但不继承父任务已创建的会话
+    sessions = await asyncio.gather(*(worker(i) for i in range(5)))
+    assert len({id(session) for session in sessions}) == 5
+    assert all(session is not parent for session in sessions)
+    assert db.get_sqa_db() is parent
+    assert len(DBTest4C.get_all()) == 5
+    db.close_db_connection()
+
+
+def test_orm_batch_upsert():
+    Path("test5.temp.db").unlink(True)
+
+    db = MioOrm(gen_sqlite_db_url("test5.temp.db"))
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest5(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+        extra_info: Mapped[str] = MappedColumn(String(length=1024), comment="额外信息")
+
+    db.create_all()
+
+    DBTest5.batch_add([{"id": "1", "name": "Old", "extra_info": ""}])
+
+    # 已存在的主键更新, 不存在的主键新增
+    count = DBTest5.batch_upsert(
+        [
+            {"id": str(i), "name": f"New{i}", "extra_info": {"key": i}}
+            for i in range(1, 11)
+        ],
+        batch_size=3,
+    )
+    assert count == 10
+    assert len(DBTest5.get_all()) == 10
+    item = DBTest5.get_by_pk("1")
+    assert item and item.name == "New1"
+    assert json.loads(item.extra_info) == {"key": 1}
+
+    # 仅更新指定字段
+    DBTest5.batch_upsert(
+        [{"id": "1", "name": "Newer", "extra_info": "ignored"}],
+        conflict_keys=[DBTest5.id],
+        update_fields=[DBTest5.name],
+    )
+    item = DBTest5.get_by_pk("1")
+    assert item and item.name == "Newer"
+    assert json.loads(item.extra_info) == {"key": 1}
+
+    # 更新字段为空时忽略冲突行
+    DBTest5.batch_upsert(
+        [{"id": "1", "name": "Ignored", "extra_info": ""}],
+        update_fields=[],
+    )
+    item = DBTest5.get_by_pk("1")
+    assert item and item.name == "Newer"
+
+    with pytest.raises(ValueError):
+        DBTest5.batch_upsert([{"id": "1", "unknown": "value"}])
+
+    # 数据表列名与属性名不同的字段
+    @db.reg_predefine_data_model(table_name="renamed", primary_key="id")
+    class DBTest5R(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        user_name: Mapped[str] = MappedColumn("uname", String(length=128))
+
+    db.create_all()
+    DBTest5R.batch_upsert([{"id": "a", "user_name": "x"}])
+    DBTest5R.batch_upsert(
+        [{"id": "a", "user_name": "y"}, {"id": "b", "user_name": "z"}],
+        update_fields=[DBTest5R.user_name],
+    )
+    assert {d.id: d.user_name for d in DBTest5R.get_all()} == {"a": "y", "b": "z"}
+
+    db.close_db_connection()
+    Path("test5.temp.db").unlink(True)
+
+
+def test_orm_batch_add_stream():
+    Path("test6.temp.db").unlink(True)
+
+    db = MioOrm(gen_sqlite_db_url("test6.temp.db"))
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest6(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+        extra_info: Mapped[str] = MappedColumn(String(length=1024), comment="额外信息")
+
+    db.create_all()
+
+    # 使用生成器分批写入并上报进度
+    progress = []
+    count = DBTest6.batch_add(
+        ({"id": str(i), "name": f"Name{i}", "extra_info": {"i": i}} for i in range(25)),
+        batch_size=10,
+        commit_per_batch=True,
+        on_progress=progress.append,
+    )
+    assert count == 25
+    assert progress == [10, 20, 25]
+    assert len(DBTest6.get_all()) == 25
+
+    # 流式查询
+    rows = DBTest6.iter_filter(order_by=[asc(DBTest6.id)], batch_size=7)
+    names = [d.name for d in rows]
+    assert len(names) == 25 and names[0] == "Name0"
+    assert sum(1 for _ in DBTest6.iter_all(batch_size=4)) == 25
+    rows = DBTest6.iter_filter(id="3", fields=[DBTest6.name])
+    assert [r.name for r in rows] == ["Name3"]
+    item = DBTest6.get_by_pk("24")
+    assert item and json.loads(item.extra_info) == {"i": 24}
+
+    # 按主键批量查询
+    items = DBTest6.get_many_by_pk(["0", "5", "24", "5", "missing"], chunk_size=2)
+    assert sorted(items) == ["0", "24", "5"]
+    assert items["5"].name == "Name5"
+    rows = DBTest6.get_many_by_pk(["1", "2"], fields=[DBTest6.name])
+    assert rows["2"].name == "Name2"
+
+    # 按条件批量更新与删除
+    count = DBTest6.update_where(
+        conditions={DBTest6.name: "Name1"},
+        values={DBTest6.extra_info: {"u": 1}},
+    )
+    assert count == 1
+    item = DBTest6.get_by_pk("1")
+    assert item and json.loads(item.extra_info) == {"u": 1}
+    with pytest.raises(ValueError):
+        DBTest6.update_where({}, {"name": "Same"})
+    assert DBTest6.update_where({"id__is_null": False}, {"name": "Same"}) == 25
+    assert DBTest6.delete_where(name="Same") == 25
+    assert DBTest6.get_all() == []
+    with pytest.raises(ValueError):
+        DBTest6.delete_where()
+
+    # 不修改传入数据
+    rows = [{"id": "a", "name": "A", "extra_info": ["a"]}]
+    assert DBTest6.batch_add(rows) == 1
+    assert rows[0]["extra_info"] == ["a"]
+
+    with pytest.raises(ValueError):
+        DBTest6.batch_add([], batch_size=0)
+
+    # 数据表列名与属性名不同的字段
+    @db.reg_predefine_data_model(table_name="renamed", primary_key="id")
+    class DBTest6R(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        user_name: Mapped[str] = MappedColumn("uname", String(length=128))
+
+    db.create_all()
+    rows = [{"id": "b", "user_name": "y"}, {DBTest6R.id: "c", DBTest6R.user_name: "z"}]
+    assert DBTest6R.batch_add(rows) == 2
+    item = DBTest6R.get_by_pk("b")
+    assert item and item.user_name == "y"
+    assert [d.user_name for d in DBTest6R.filter(user_name="z")] == ["z"]
+
+    db.close_db_connection()
+    Path("test6.temp.db").unlink(True)
+
+
+def test_orm_paginate_after():
+    Path("test7.temp.db").unlink(True)
+
+    db = MioOrm(gen_sqlite_db_url("test7.temp.db"))
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest7(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+        score: Mapped[int] = MappedColumn(Integer, nullable=True)
+        label: Mapped[str] = MappedColumn("label_text", String(length=16))
+
+    db.create_all()
+    DBTest7.batch_add(
+        {
+            "id": f"{i:02d}",
+            "name": "Even" if i % 2 == 0 else "Odd",
+            "score": None if i % 3 == 0 else i % 4,
+            "label": f"L{i % 5}",
+        }
+        for i in range(11)
+    )
+
+    # 按名称降序 + 主键升序遍历所有页
+    ids = []
+    cursor = None
+    pages = 0
+    while True:
+        items, cursor = DBTest7.paginate_after(
+            cursor,
+            order_by=[desc(DBTest7.name)],
+            page_size=4,
+        )
+        ids.extend(item.id for item in items)
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3
+    assert ids == [f"{i:02d}" for i in range(1, 11, 2)] + [
+        f"{i:02d}" for i in range(0, 11, 2)
+    ]
+
+    # 可为空的排序字段: 游标值为 NULL 时按数据库的 NULL 排序位置继续翻页
+    for order in (asc(DBTest7.score), desc(DBTest7.score)):
+        ids = []
+        cursor = None
+        while True:
+            items, cursor = DBTest7.paginate_after(cursor, order_by=[order], page_size=2)
+            ids.extend(item.id for item in items)
+            if cursor is None:
+                break
+        expected = DBTest7.filter(order_by=[order, asc(DBTest7.id)])
+        assert ids == [item.id for item in expected]
+
+    # 数据库列名与属性名不同的排序字段
+    ids = []
+    cursor = None
+    while True:
+        items, cursor = DBTest7.paginate_after(
+            cursor,
+            order_by=[desc(DBTest7.label)],
+            page_size=3,
+        )
+        ids.extend(item.id for item in items)
+        if cursor is None:
+            break
+    expected = DBTest7.filter(order_by=[desc(DBTest7.label), asc(DBTest7.id)])
+    assert ids == [item.id for item in expected]
+
+    # 带筛选条件
+    items, cursor = DBTest7.paginate_after(name="Even", page_size=10)
+    assert len(items) == 6 and cursor is None
+
+    with pytest.raises(ValueError):
+        DBTest7.paginate_after("invalid-cursor")
+
+    db.close_db_connection()
+    Path("test7.temp.db").unlink(True)
+
+
 if __name__ == "__main__":
     test_orm()
+
+
+@pytest.mark.asyncio
+async def test_orm_transaction():
+    Path("test8.temp.db").unlink(True)
+
+    db = MioOrm(gen_sqlite_db_url("test8.temp.db"), async_mode=True)
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest8(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    await db.acreate_all()
+    commits = []
+    event.listen(db.get_sqa_db().get_bind(), "commit", commits.append)
+
+    # 事务: 块内写入只刷新, 退出时提交一次
+    with db.transaction():
+        for i in range(5):
+            DBTest8.add(id=str(i), name=f"Name{i}")
+        item = DBTest8.get_by_pk("0")
+        assert item
+        item.update(name="Updated")
+        item.delete()
+    assert len(commits) == 1
+    assert len(DBTest8.get_all()) == 4
+
+    # 事务: 异常时整体回滚
+    with pytest.raises(RuntimeError), db.transaction():
+        DBTest8.add(id="10", name="Name10")
+        DBTest8.update_where({"id": "1"}, {"name": "Rollback"})
+        raise RuntimeError
+    assert DBTest8.get_by_pk("10") is None
+    assert DBTest8.get_by_pk("1").name == "Name1"  # type: ignore
+
+    # 事务: 共享会话模式下其它线程的写入等待事务块结束, 不会提交块内未完成的写入
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(RuntimeError), db.transaction():
+            DBTest8.add(id="11", name="Name11")
+            future = executor.submit(DBTest8.add, id="12", name="Name12")
+            time.sleep(0.1)
+            assert not future.done()
+            raise RuntimeError
+        future.result()
+    assert DBTest8.get_by_pk("11") is None
+    assert DBTest8.get_by_pk("12")
+
+    # 异步事务
+    async with db.atransaction():
+        await DBTest8.aadd(id="20", name="Name20")
+        await DBTest8.aupdate_where({"id": "20"}, {"name": "Async"})
+    item = await DBTest8.aget_by_pk("20")
+    assert item and item.name == "Async"
+    with pytest.raises(RuntimeError):
+        async with db.atransaction():
+            await DBTest8.aadd(id="21", name="Name21")
+            raise RuntimeError
+    assert await DBTest8.aget_by_pk("21") is None
+
+    await db.aclose_db_connection()
+    db.close_db_connection()
+
+    # 组提交: 窗口内并发写入合并提交
+    db = MioOrm(gen_sqlite_db_url("test8.temp.db"), group_commit_window=0.05)
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest8G(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    commits = []
+    event.listen(db.get_sqa_db().get_bind(), "commit", commits.append)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(
+            executor.map(
+                lambda i: DBTest8G.add(id=f"g{i}", name=f"Name{i}"),
+                range(8),
+            ),
+        )
+    assert len(DBTest8G.filter(id__startswith="g")) == 8
+    assert len(commits) < 8
+
+    with pytest.raises(ValueError):
+        MioOrm(
+            gen_sqlite_db_url("test8.temp.db"),
+            session_mode="thread",
+            group_commit_window=0.05,
+        )
+
+    # 组提交: 窗口内一个调用方写入失败时, 写入被一并回滚的调用方均失败, 之后刷新的写入正常提交
+    db.close_db_connection()
+    db = MioOrm(gen_sqlite_db_url("test8.temp.db"), group_commit_window=0.3)
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest8F(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    def add_later(delay: float, pk: str) -> Optional[BaseException]:
+        time.sleep(delay)
+        try:
+            DBTest8F.add(id=pk, name=pk)
+        except Exception as e:
+            return e
+        return None
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(
+            executor.map(add_later, [0, 0.1, 0.2], ["f1", "g0", "f2"]),
+        )
+    assert isinstance(results[0], RuntimeError)
+    assert isinstance(results[1], IntegrityError)
+    assert results[2] is None
+    assert DBTest8F.get_by_pk("f1") is None
+    assert DBTest8F.get_by_pk("f2")
+
+    db.close_db_connection()
+
+    # 组提交: 并发读取与其它调用方的刷新 / 提交互斥
+    db = MioOrm(gen_sqlite_db_url("test8.temp.db"), group_commit_window=0.005)
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest8R(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    def write_and_read(i: int) -> None:
+        DBTest8R.add(id=f"r{i}", name=f"Name{i}")
+        item = DBTest8R.get_by_pk(f"r{i}")
+        assert item and item.name == f"Name{i}"
+        assert [d.id for d in DBTest8R.filter(id=f"r{i}")] == [f"r{i}"]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(write_and_read, range(800)))
+    assert len(DBTest8R.filter(id__startswith="r")) == 800
+
+    db.close_db_connection()
+    Path("test8.temp.db").unlink(True)
+
+
+@pytest.mark.asyncio
+async def test_orm_sqlite_profile():
+    Path("test9.temp.db").unlink(True)
+
+    db = MioOrm(
+        gen_sqlite_db_url("test9.temp.db"),
+        async_mode=True,
+        sqlite_profile="fast",
+    )
+    conn = db.get_sqa_db().connection()
+    assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+    assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+    assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2
+    assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+    async with db.get_async_session() as adb:
+        res = await (await adb.connection()).exec_driver_sql("PRAGMA synchronous")
+        assert res.scalar() == 1
+    await db.aclose_db_connection()
+    db.close_db_connection()
+
+    db = MioOrm(gen_sqlite_db_url("test9.temp.db"), sqlite_profile="safe")
+    conn = db.get_sqa_db().connection()
+    assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 2
+    db.close_db_connection()
+
+    with pytest.raises(ValueError):
+        MioOrm(gen_sqlite_db_url("test9.temp.db"), sqlite_profile="invalid")
+
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"test9.temp.db{suffix}").unlink(True)
+
+
+@pytest.mark.asyncio
+async def test_orm_replicas():
+    files = ["test10.temp.db", "test10_r1.temp.db", "test10_r2.temp.db"]
+    for file in files:
+        Path(file).unlink(True)
+
+    db = MioOrm(
+        gen_sqlite_db_url(files[0]),
+        async_mode=True,
+        replicas=[gen_sqlite_db_url(files[1]), gen_sqlite_db_url(files[2])],
+    )
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest10(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    # 模拟副本数据 (各副本内容不同以便区分路由)
+    db.create_all()
+    for i, file in enumerate(files[1:]):
+        engine = create_engine(gen_sqlite_db_url(file))
+        db.get_sqa_Base().metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                DBTest10.__table__.insert(),  # type: ignore
+                {"id": "1", "name": f"R{i + 1}"},
+            )
+        engine.dispose()
+
+    # 写入主库, 读取轮询路由到副本
+    kept = DBTest10.add(id="1", name="Primary")
+    names = [DBTest10.get_by_pk("1").name for _ in range(4)]  # type: ignore
+    assert names == ["R1", "R2", "R1", "R2"]
+    assert [d["name"] for d in DBTest10.filter_to_dict(id="1")] == ["R1"]
+    item = await DBTest10.aget_by_pk("1")
+    assert item and item.name in ("R1", "R2")
+
+    # 副本读取的行对象可直接写回主库 (主库会话中已有相同主键的实例时合并到该实例)
+    item = DBTest10.get_by_pk("1")
+    assert item
+    item.update(name="Updated")
+    assert item.name == kept.name == "Updated"
+    kept = DBTest10.add(id="2", name="Primary2")
+    item = DBTest10(id="2", name="Primary2")
+    make_transient_to_detached(item)
+    item.delete()
+
+    # 事务内读取主库
+    with db.transaction():
+        item = DBTest10.get_by_pk("1")
+        assert item and item.name == "Updated"
+        assert DBTest10.get_by_pk("2") is None
+
+    await db.aclose_db_connection()
+
+    # 写后读窗口内读取主库
+    db = MioOrm(
+        gen_sqlite_db_url(files[0]),
+        replicas=[gen_sqlite_db_url(files[1])],
+        replica_strategy="least_latency",
+        read_your_writes=60,
+    )
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest10B(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    assert DBTest10B.get_by_pk("1").name == "R1"  # type: ignore
+    DBTest10B.add(id="2", name="Primary2")
+    assert DBTest10B.get_by_pk("1").name == "Updated"  # type: ignore
+    assert DBTest10B.get_by_pk("2").name == "Primary2"  # type: ignore
+
+    with pytest.raises(ValueError):
+        MioOrm(gen_sqlite_db_url(files[0]), replica_strategy="invalid")
+
+    db.close_db_connection()
+    for file in files:
+        Path(file).unlink(True)
+
+
+@pytest.mark.asyncio
+async def test_orm_metrics():
+    Path("test11.temp.db").unlink(True)
+
+    pushed = []
+    db = MioOrm(
+        gen_sqlite_db_url("test11.temp.db"),
+        async_mode=True,
+        metrics_callback=pushed.append,
+        metrics_interval=0,
+    )
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest11(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    db.create_all()
+    DBTest11.add(id="1", name="Alice")
+    assert DBTest11.get_by_pk("1")
+    assert len(list(DBTest11.iter_filter())) == 1
+    assert await DBTest11.aget_by_pk("1")
+    with pytest.raises(ValueError):
+        DBTest11.filter(unknown="1")
+
+    metrics = db.metrics()
+    methods = metrics["methods"]
+    assert methods["DBTest11.add"]["count"] == 1
+    assert methods["DBTest11.get_by_pk"]["queries"] == 1
+    assert methods["DBTest11.iter_filter"]["count"] == 1
+    assert methods["DBTest11.aget_by_pk"]["queries"] == 1
+    assert methods["DBTest11.filter"]["errors"] == 1
+    assert metrics["queries"]["count"] >= 3
+
+    primary = metrics["pools"]["primary"]
+    assert primary["checkouts"] >= 1 and primary["connects"] >= 1
+    wait = primary["checkout_wait"]
+    assert sum(wait["buckets"].values()) == wait["count"]
+    assert metrics["pools"]["async"]["checkouts"] >= 1
+    assert pushed and pushed[-1]["methods"].keys() == methods.keys()
+
+    # 引擎 dispose 重建连接池后继续统计连接获取等待时间
+    assert wait["count"] >= 1
+    db.get_sqa_db().commit()
+    db.get_sqa_db().get_bind().dispose()
+    assert DBTest11.get_by_pk("1")
+    assert db.metrics()["pools"]["primary"]["checkout_wait"]["count"] > wait["count"]
+
+    await db.aclose_db_connection()
+    lifetime = db.metrics()["pools"]["primary"]["connection_lifetime"]
+    assert lifetime["count"] >= 1
+    with pytest.raises(RuntimeError):
+        MioOrm("sqlite://").metrics()
+    Path("test11.temp.db").unlink(True)
+
+
+def test_orm_profiler(monkeypatch):
+    from miose_toolkit_db import profiler
+
+    slow_logs = []
+    monkeypatch.setattr(profiler.logger, "warning", slow_logs.append)
+    assert (
+        profiler.normalize_statement("SELECT * FROM t WHERE id IN (?, ?, ?)  AND n = 'a'")
+        == "SELECT * FROM t WHERE id IN (?) AND n = ?"
+    )
+
+    db = MioOrm("sqlite://", slow_query_threshold=0)
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest12(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+
+    db.create_all()
+    DBTest12.batch_add([{"id": str(i), "name": f"N{i}"} for i in range(5)])
+    DBTest12.get_many_by_pk(["1", "2"])
+    DBTest12.get_many_by_pk(["1", "2", "3"])
+    assert len(list(DBTest12.iter_filter(name="N1"))) == 1
+
+    report = db.profile_report()
+    statements = {s["statement"]: s for s in report["statements"]}
+    in_query = next(s for key, s in statements.items() if " IN (?)" in key)
+    assert in_query["count"] == 2
+    assert in_query["methods"] == {"DBTest12.get_many_by_pk": 2}
+    assert report["methods"]["DBTest12.iter_filter"]["count"] == 1
+    assert any("DBTest12.batch_add" in log for log in slow_logs)
+
+    plans = db.explain_slow_queries()
+    assert plans and all(plan["plan"] for plan in plans)
+
+    with pytest.raises(RuntimeError):
+        MioOrm("sqlite://").profile_report()
+    db.close_db_connection()
+
+
+@pytest.mark.asyncio
+async def test_orm_warmup():
+    Path("test13.temp.db").unlink(True)
+
+    db = MioOrm(
+        gen_sqlite_db_url("test13.temp.db"),
+        async_mode=True,
+        metrics=True,
+        pool_size=3,
+    )
+
+    # 初始化时不建立连接
+    pools = db.metrics()["pools"]
+    assert pools["primary"]["connects"] == 0 and pools["async"]["connects"] == 0
+
+    assert db.warmup(5) == 3
+    assert await db.awarmup(2) == 2
+    pools = db.metrics()["pools"]
+    assert pools["primary"]["connects"] == 3 and pools["primary"]["checked_out"] == 0
+    assert pools["async"]["connects"] == 2
+
+    # 预先建立的连接被复用
+    db.create_all()
+    assert db.metrics()["pools"]["primary"]["connects"] == 3
+
+    await db.aclose_db_connection()
+    Path("test13.temp.db").unlink(True)
+
+
+def test_orm_index_advisor():
+    db = MioOrm("sqlite://", index_advisor=True)
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest15(MioModel):
+        id: Mapped[str] = MappedColumn(String(length=28), primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128), comment="名称")
+        age: Mapped[int] = MappedColumn(Integer, default=0)
+
+    db.create_all()
+    DBTest15.batch_add([{"id": str(i), "name": f"N{i % 3}", "age": i} for i in range(20)])
+    for _ in range(3):
+        DBTest15.filter(name="N1", age__gte=5, order_by=[desc(DBTest15.age)])
+    DBTest15.get_by_field(DBTest15.name, "N2", allow_multiple=True)
+    DBTest15.get_by_pk("1")
+
+    report = {tuple(item["where"]): item for item in db.index_report()}
+    item = report[("name", "age")]
+    assert item["count"] == 3 and item["order_by"] == ["age"]
+    assert item["full_scan"] is True
+    assert item["recommended_index"] == ("name", "age")
+    assert report[("name",)]["recommended_index"] == ("name",)
+    assert report[("id",)]["full_scan"] is False
+    assert report[("id",)]["recommended_index"] is None
+
+    assert db.create_recommended_indexes(min_count=3) == ["ix_mio_test_name_age"]
+    report = {tuple(item["where"]): item for item in db.index_report()}
+    assert report[("name", "age")]["full_scan"] is False
+    # 已有索引前缀覆盖时不再建议
+    assert report[("name",)]["recommended_index"] is None
+    assert len(DBTest15.filter(name="N1", age__gte=5)) == 5
+
+    with pytest.raises(RuntimeError):
+        MioOrm("sqlite://").index_report()
+    db.close_db_connection()
+
+
+@pytest.mark.asyncio
+async def test_orm_aggregate():
+    Path("test17.temp.db").unlink(True)
+
+    db = MioOrm(gen_sqlite_db_url("test17.temp.db"), async_mode=True)
+
+    @db.reg_predefine_data_model(table_name="test", primary_key="id")
+    class DBTest17(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        name: Mapped[str] = MappedColumn(String(length=128))
+        age: Mapped[int] = MappedColumn(Integer, default=0)
+
+    db.create_all()
+    DBTest17.batch_add([{"id": i, "name": f"N{i % 3}", "age": i} for i in range(10)])
+
+    assert DBTest17.count() == 10
+    assert DBTest17.count(name="N1") == 3
+    assert DBTest17.count({DBTest17.name: "N1"}, age__gte=5) == 1
+    assert DBTest17.exists(name="N2")
+    assert not DBTest17.exists(name="N3")
+    assert await DBTest17.acount(age__lt=4) == 4
+    assert await DBTest17.aexists(id=9)
+
+    assert DBTest17.aggregate(
+        group_by=[DBTest17.name],
+        sum=["age"],
+        max=[DBTest17.age],
+        count=True,
+    ) == [
+        {"name": "N0", "sum_age": 18, "max_age": 9, "count": 4},
+        {"name": "N1", "sum_age": 12, "max_age": 7, "count": 3},
+        {"name": "N2", "sum_age": 15, "max_age": 8, "count": 3},
+    ]
+    assert await DBTest17.aaggregate(avg=["age"], min=["age"], name="N1") == [
+        {"avg_age": 4.0, "min_age": 1},
+    ]
+    with pytest.raises(ValueError):
+        DBTest17.aggregate(group_by=["name"])
+    with pytest.raises(ValueError):
+        DBTest17.aggregate(sum=["unknown"])
+
+    await db.aclose_db_connection()
+    Path("test17.temp.db").unlink(True)
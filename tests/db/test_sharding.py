@@ -0,0 +1,103 @@
+from contextlib import ExitStack
+from pathlib import Path
+
+import pytest
+from miose_toolkit_db import (
+    Mapped,
+    MappedColumn,
+    MioModel,
+    ShardedMioOrm,
+    desc,
+    gen_sqlite_db_url,
+)
+from sqlalchemy import Integer, String
+
+
+def test_sharded_orm():
+    files = [f"test16_s{i}.temp.db" for i in range(3)]
+    for file in files:
+        Path(file).unlink(True)
+
+    db = ShardedMioOrm(
+        [gen_sqlite_db_url(file) for file in files],
+        shard_key=lambda user_id: user_id,
+    )
+
+    @db.reg_predefine_data_model(
+        table_name="chat",
+        primary_key="id",
+        shard_field="user_id",
+    )
+    class DBChat(MioModel):
+        id: Mapped[int] = MappedColumn(Integer, primary_key=True)
+        user_id: Mapped[int] = MappedColumn(Integer)
+        content: Mapped[str] = MappedColumn(String(length=128))
+
+    db.create_all()
+
+    # 写入按分片键路由
+    DBChat.add(id=1, user_id=0, content="a")
+    DBChat.add({DBChat.id: 2, DBChat.user_id: 1, DBChat.content: "b"})
+    assert DBChat.batch_add(
+        [{"id": i, "user_id": i % 3, "content": f"m{i}"} for i in range(3, 12)],
+    ) == 9
+    assert [len(model.get_all()) for model in DBChat.models] == [4, 4, 3]
+    assert DBChat.model_for(4).get_by_pk(4)
+    with pytest.raises(ValueError):
+        DBChat.add(id=100, content="no shard key")
+
+    # 并行扇出查询, 合并排序与分页
+    assert sorted(c.id for c in DBChat.get_all()) == list(range(1, 12))
+    rows = DBChat.filter(order_by=[desc(DBChat.id)], limit=4, offset=1)
+    assert [c.id for c in rows] == [10, 9, 8, 7]
+    rows = DBChat.filter(id__gte=5, order_by=[DBChat.content])
+    assert [c.content for c in rows] == ["m10", "m11", "m5", "m6", "m7", "m8", "m9"]
+    assert [c.id for c in DBChat.filter(user_id=2, order_by=[DBChat.id])] == [5, 8, 11]
+    assert DBChat.count() == 11
+    assert DBChat.count(user_id=2) == 3
+    assert DBChat.exists(id=11) and not DBChat.exists(user_id=2, id=1)
+
+    # 主键查询需扇出 (分片键不是主键), 返回的行对象可直接写回所属分片
+    item = DBChat.get_by_pk(7)
+    assert item and item.user_id == 1
+    item.update(content="updated")
+    assert DBChat.filter(user_id=1, id=7)[0].content == "updated"
+    assert DBChat.get_by_pk(100) is None
+
+    item = DBChat.auto_insert(id=7, user_id=1, content="again")
+    assert DBChat.model_for(1).get_by_pk(7).content == "again"  # type: ignore
+
+    # 其它方法按分片键路由或扇出到所有分片, 未实现分片语义的方法不会代理到首个分片
+    rows = DBChat.filter_to_dict(fields=[DBChat.id], order_by=[desc(DBChat.id)], limit=3)
+    assert rows == [{"id": 11}, {"id": 10}, {"id": 9}]
+    assert [r["id"] for r in DBChat.filter_to_dict(user_id=2, order_by=[DBChat.id])] == [5, 8, 11]
+    with pytest.raises(ValueError):
+        DBChat.filter_to_dict(fields=[DBChat.id], order_by=[DBChat.content])
+    assert DBChat.get_by_field(DBChat.content, "m8").id == 8  # type: ignore
+    assert DBChat.get_by_field(DBChat.user_id, 2, allow_multiple=True).user_id == 2  # type: ignore
+    DBChat.add(id=12, user_id=0, content="m8")
+    with pytest.raises(ValueError):
+        DBChat.get_by_field(DBChat.content, "m8")
+    assert DBChat.update_where({"id__gte": 9}, {"content": "bulk"}) == 4
+    assert DBChat.count(content="bulk") == 4
+    with pytest.raises(ValueError):
+        DBChat.update_where({"id": 9}, {"user_id": 0})
+    assert DBChat.delete_where(content="bulk") == 4
+    assert DBChat.delete_where(user_id=0, id=1) == 1
+    assert DBChat.count() == 7
+    with pytest.raises(AttributeError):
+        DBChat.aggregate  # noqa: B018
+
+    # 处于分片事务中时扇出写入在当前线程执行, 加入各分片的事务
+    with pytest.raises(RuntimeError), ExitStack() as stack:
+        for shard in db.shards:
+            stack.enter_context(shard.transaction())
+        assert DBChat.update_where({"id__gte": 1}, {"content": "tx"}) == 7
+        assert DBChat.batch_add([{"id": 20, "user_id": 2, "content": "tx"}]) == 1
+        raise RuntimeError
+    assert DBChat.count(content="tx") == 0
+    assert DBChat.count() == 7
+
+    db.close_db_connection()
+    for file in files:
+        Path(file).unlink(True)